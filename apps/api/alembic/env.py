@@ -15,7 +15,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sgp_plus.db.base import Base
-from sgp_plus.db.models import User, Role, Permission, Session, user_roles, role_permissions
+from sgp_plus.db.models import (
+    User,
+    Role,
+    Permission,
+    Session,
+    RbacState,  # noqa: F401
+    AuthEvent,  # noqa: F401
+    user_roles,
+    role_permissions,
+)
 from sgp_plus.core.config import settings
 
 # this is the Alembic Config object
@@ -0,0 +1,56 @@
+"""rbac state (catalog version)
+
+Revision ID: 0002_rbac_state
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_rbac_state'
+down_revision: Union[str, None] = '0001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RBAC_TABLES = ('roles', 'permissions', 'role_permissions')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rbac_state',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.execute("INSERT INTO rbac_state (id, version) VALUES (1, 0)")
+
+    # Qualquer escrita no catálogo incrementa a versão (1x por statement)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_rbac_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE rbac_state SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in RBAC_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_bump_rbac_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_rbac_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in RBAC_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_bump_rbac_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_rbac_version()")
+    op.drop_table('rbac_state')
@@ -0,0 +1,32 @@
+"""partial index on sessions.revoked_at
+
+Revision ID: 0003_sessions_revoked_at
+Revises: 0002_rbac_state
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_sessions_revoked_at'
+down_revision: Union[str, None] = '0002_rbac_state'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sync incremental do filtro de revogação (SESSION_TOKEN_MODE=signed)
+    op.create_index(
+        'ix_sessions_revoked_at',
+        'sessions',
+        ['revoked_at'],
+        postgresql_where=sa.text('revoked_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sessions_revoked_at', table_name='sessions')
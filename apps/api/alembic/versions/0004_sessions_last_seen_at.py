@@ -0,0 +1,27 @@
+"""sessions.last_seen_at
+
+Revision ID: 0004_sessions_last_seen_at
+Revises: 0003_sessions_revoked_at
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_sessions_last_seen_at'
+down_revision: Union[str, None] = '0003_sessions_revoked_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Gravado em lote pelo write-behind de atividade (core/session_activity)
+    op.add_column('sessions', sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sessions', 'last_seen_at')
@@ -0,0 +1,52 @@
+"""users listing indexes
+
+Revision ID: 0005_users_listing_indexes
+Revises: 0004_sessions_last_seen_at
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_users_listing_indexes'
+down_revision: Union[str, None] = '0004_sessions_last_seen_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY: não bloqueia escrita em users/user_roles (fora da transação)
+    with op.get_context().autocommit_block():
+        # GET /users: keyset em (created_at, id), com ou sem filtro de is_active
+        op.create_index(
+            'ix_users_created_at_id', 'users', ['created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_is_active_created_at_id', 'users', ['is_active', 'created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # email LIKE 'prefixo%' usa o índice em qualquer collation
+        op.create_index(
+            'ix_users_email_prefix', 'users', ['email'],
+            postgresql_ops={'email': 'text_pattern_ops'},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Filtro por role: a PK (user_id, role_id) não serve para buscar por role
+        op.create_index(
+            'ix_user_roles_role_id', 'user_roles', ['role_id', 'user_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, name in (
+            ('user_roles', 'ix_user_roles_role_id'),
+            ('users', 'ix_users_email_prefix'),
+            ('users', 'ix_users_is_active_created_at_id'),
+            ('users', 'ix_users_created_at_id'),
+        ):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
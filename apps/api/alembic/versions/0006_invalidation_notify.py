@@ -0,0 +1,114 @@
+"""invalidation NOTIFY triggers
+
+Revision ID: 0006_invalidation_notify
+Revises: 0005_users_listing_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_invalidation_notify'
+down_revision: Union[str, None] = '0005_users_listing_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo canal de core/invalidation.CHANNEL
+CHANNEL = 'sgp_invalidation'
+# ids por mensagem: 200 UUIDs ficam bem abaixo do limite de 8000 bytes do NOTIFY
+USERS_PER_MESSAGE = 200
+
+
+def _notify_users(source: str) -> str:
+    """PL/pgSQL: one 'u:id,id,...' message per USERS_PER_MESSAGE distinct user ids"""
+    return f"""
+            PERFORM pg_notify('{CHANNEL}', 'u:' || string_agg(user_id::text, ','))
+            FROM (
+                SELECT user_id, (row_number() OVER () - 1) / {USERS_PER_MESSAGE} AS chunk
+                FROM (SELECT DISTINCT user_id FROM {source}) AS distinct_users
+            ) AS numbered
+            GROUP BY chunk;
+    """
+
+
+def upgrade() -> None:
+    # Catálogo RBAC: além da versão, avisa os workers (idênticos na mesma
+    # transação são fundidos pelo Postgres)
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION bump_rbac_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE rbac_state SET version = version + 1 WHERE id = 1;
+            PERFORM pg_notify('{CHANNEL}', 'r');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    # Roles de um usuário: 1 NOTIFY por statement com os usuários afetados
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_user_roles_changed() RETURNS trigger AS $$
+        BEGIN
+            {_notify_users('changed')}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Transition tables exigem um trigger por evento
+    for event, table in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_user_roles_{event.lower()}_notify
+            AFTER {event} ON user_roles
+            REFERENCING {table} TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_user_roles_changed()
+            """
+        )
+
+    # Usuário desativado/reativado ou com email trocado: Principal em cache velho
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_users_changed() RETURNS trigger AS $$
+        BEGIN
+            {_notify_users('''(
+                SELECT new_rows.id AS user_id
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE new_rows.is_active IS DISTINCT FROM old_rows.is_active
+                   OR new_rows.email IS DISTINCT FROM old_rows.email
+            ) AS changed''')}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_users_update_notify
+        AFTER UPDATE ON users
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_users_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_users_update_notify ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_users_changed()")
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_user_roles_{event}_notify ON user_roles")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_roles_changed()")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_rbac_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE rbac_state SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
@@ -0,0 +1,45 @@
+"""auth_events (audit trail)
+
+Revision ID: 0007_auth_events
+Revises: 0006_invalidation_notify
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_auth_events'
+down_revision: Union[str, None] = '0006_invalidation_notify'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Gravada em lote pelo core/audit; sem FK (sobrevive à remoção do usuário)
+    op.create_table(
+        'auth_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.Column('kind', sa.String(32), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('email', sa.String(255), nullable=True),
+        sa.Column('ip', sa.String(45), nullable=True),
+        sa.Column('user_agent', sa.String(512), nullable=True),
+        sa.Column('detail', sa.String(255), nullable=True),
+    )
+    op.create_index('ix_auth_events_occurred_at', 'auth_events', ['occurred_at'])
+    op.create_index(
+        'ix_auth_events_user_id_occurred_at', 'auth_events', ['user_id', 'occurred_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auth_events_user_id_occurred_at', table_name='auth_events')
+    op.drop_index('ix_auth_events_occurred_at', table_name='auth_events')
+    op.drop_table('auth_events')
@@ -0,0 +1,49 @@
+"""role_inheritance (role includes other roles)
+
+Revision ID: 0008_role_inheritance
+Revises: 0007_auth_events
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_role_inheritance'
+down_revision: Union[str, None] = '0007_auth_events'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'role_inheritance',
+        sa.Column(
+            'role_id',
+            sa.String(50),
+            sa.ForeignKey('roles.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column(
+            'included_role_id',
+            sa.String(50),
+            sa.ForeignKey('roles.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+    )
+    # Faz parte do catálogo: mesma versão/NOTIFY das demais tabelas RBAC (0002/0006)
+    op.execute(
+        """
+        CREATE TRIGGER trg_role_inheritance_bump_rbac_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON role_inheritance
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_rbac_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_role_inheritance_bump_rbac_version ON role_inheritance")
+    op.drop_table('role_inheritance')
@@ -0,0 +1,87 @@
+"""users.access_changed_at (not-before for signed session tokens)
+
+Revision ID: 0009_users_access_changed_at
+Revises: 0008_role_inheritance
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_users_access_changed_at'
+down_revision: Union[str, None] = '0008_role_inheritance'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo relógio de revoked_at/expires_at (UTC sem fuso)
+_NOW_UTC = "timezone('utc', now())"
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('access_changed_at', sa.DateTime(), nullable=True))
+    # Sync do filtro de revogação: só as linhas que já mudaram
+    op.create_index(
+        'ix_users_access_changed_at', 'users', ['access_changed_at'],
+        postgresql_where=sa.text('access_changed_at IS NOT NULL'),
+    )
+
+    # Desativação/reativação ou troca de email: carimba a própria linha
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION users_touch_access_changed_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.is_active IS DISTINCT FROM OLD.is_active
+               OR NEW.email IS DISTINCT FROM OLD.email THEN
+                NEW.access_changed_at := {_NOW_UTC};
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_users_access_changed_at
+        BEFORE UPDATE ON users
+        FOR EACH ROW EXECUTE FUNCTION users_touch_access_changed_at()
+        """
+    )
+
+    # Roles de um usuário: um UPDATE por statement com os usuários afetados
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION user_roles_touch_access_changed_at() RETURNS trigger AS $$
+        BEGIN
+            UPDATE users SET access_changed_at = {_NOW_UTC}
+            WHERE id IN (SELECT DISTINCT user_id FROM changed);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Transition tables exigem um trigger por evento (como em 0006)
+    for event, table in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_user_roles_{event.lower()}_access_changed_at
+            AFTER {event} ON user_roles
+            REFERENCING {table} TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION user_roles_touch_access_changed_at()
+            """
+        )
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete'):
+        op.execute(
+            f"DROP TRIGGER IF EXISTS trg_user_roles_{event}_access_changed_at ON user_roles"
+        )
+    op.execute("DROP FUNCTION IF EXISTS user_roles_touch_access_changed_at()")
+    op.execute("DROP TRIGGER IF EXISTS trg_users_access_changed_at ON users")
+    op.execute("DROP FUNCTION IF EXISTS users_touch_access_changed_at()")
+    op.drop_index('ix_users_access_changed_at', table_name='users')
+    op.drop_column('users', 'access_changed_at')
@@ -0,0 +1,94 @@
+"""Shared helpers for the benchmark scripts (percentiles, JSON results, comparison)"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(samples: list[float]) -> dict:
+    """p50/p95/p99/mean/max in milliseconds of latency samples in seconds"""
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**extra) -> dict:
+    """Who/what/where of a run, stored next to the numbers"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        **extra,
+    }
+
+
+def save_results(name: str, results: dict, output: str | None = None) -> Path:
+    """Write results as JSON (default: benchmarks/results/<name>-<timestamp>.json)"""
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{name}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def compare(
+    current: dict,
+    baseline_path: str,
+    *,
+    max_regression: float,
+    higher_is_better: tuple[str, ...],
+    lower_is_better: tuple[str, ...],
+) -> list[str]:
+    """Regressions beyond max_regression (fraction) of every scenario vs a baseline file"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    regressions = []
+    for scenario, numbers in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if not before:
+            continue
+        for key in higher_is_better:
+            if before.get(key) and numbers.get(key) is not None:
+                if numbers[key] < before[key] * (1 - max_regression):
+                    regressions.append(f"{scenario}.{key}: {before[key]} → {numbers[key]}")
+        for key in lower_is_better:
+            if before.get(key) and numbers.get(key) is not None:
+                if numbers[key] > before[key] * (1 + max_regression):
+                    regressions.append(f"{scenario}.{key}: {before[key]} → {numbers[key]}")
+    return regressions
@@ -0,0 +1,165 @@
+"""Allocation micro-benchmark for the /auth/login and /auth/me response body.
+
+Compara, sem banco e sem HTTP, o caminho anterior (UserResponse/RoleResponse/
+PermissionResponse + MeResponse + validação e serialização do response_model
+pelo FastAPI) com o caminho rápido (_principal_json: fragmentos JSON
+pré-computados por role no catálogo RBAC + orjson só para o usuário).
+
+Por requisição: pico de bytes alocados durante a montagem do corpo
+(tracemalloc) e tempo médio (medido sem tracemalloc ligado).
+
+    python -m benchmarks.auth_alloc
+    python -m benchmarks.auth_alloc --roles 3 --permissions 40 --baseline benchmarks/results/...
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from benchmarks._common import compare, run_metadata, save_results
+
+
+def _setup(roles: int, permissions: int):
+    """Synthetic catalog (every role holds every permission) and a principal"""
+    from sgp_plus.core.principal import Principal
+    from sgp_plus.core.rbac_engine import rbac_engine
+
+    role_rows = [(f"role_{i}", f"role_{i}", f"Role {i}") for i in range(roles)]
+    permission_rows = [(f"mod.p{i}", f"mod.p{i}", f"Permissão {i}") for i in range(permissions)]
+    grants = [(r[0], p[0]) for r in role_rows for p in permission_rows]
+    rbac_engine.load(role_rows, permission_rows, grants)
+    return Principal(
+        id=uuid4(),
+        email="alloc@bench.local",
+        is_active=True,
+        created_at=datetime(2024, 1, 1, 12, 0, 0, 123456),
+        role_ids=tuple(r[0] for r in role_rows),
+    )
+
+
+def _legacy_body(principal):
+    """Previous path: pydantic models built by hand, then revalidated and dumped by FastAPI"""
+    from sgp_plus.core.rbac_engine import rbac_engine
+    from sgp_plus.features.auth.schemas import (
+        MeResponse,
+        PermissionResponse,
+        RoleResponse,
+        UserResponse,
+    )
+
+    adapter = TypeAdapter(MeResponse)
+
+    def build() -> bytes:
+        _, roles, permissions = rbac_engine.catalog.resolve(principal.role_ids)
+        payload = {
+            "user": UserResponse.model_validate(principal),
+            "roles": [RoleResponse.model_validate(r) for r in roles],
+            "permissions": [PermissionResponse.model_validate(p) for p in permissions],
+        }
+        # serialize_response: valida o retorno contra o response_model e gera JSON
+        return adapter.dump_json(adapter.validate_python(MeResponse(**payload)))
+
+    return build
+
+
+def _fast_body(principal):
+    from sgp_plus.features.auth.router import _principal_json
+
+    def build() -> bytes:
+        # Sem checagem de versão pendente, ensure_fresh não toca no banco
+        coroutine = _principal_json(principal, None)
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return done.value
+        raise RuntimeError("_principal_json suspended: catalog check hit the database")
+
+    return build
+
+
+def measure(build, iterations: int) -> dict:
+    """Mean time and peak allocated bytes (tracemalloc) per call"""
+    build()  # aquece memoização do catálogo e caches do pydantic
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    seconds = (time.perf_counter() - started) / iterations
+
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            build()
+            peak += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "us_per_request": round(seconds * 1e6, 2),
+        "peak_bytes_per_request": round(peak / iterations),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Alocações do corpo de /auth/login e /auth/me")
+    parser.add_argument("--roles", type=int, default=2)
+    parser.add_argument("--permissions", type=int, default=12, help="permissões por role")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="arquivo JSON (padrão: benchmarks/results/)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    principal = _setup(args.roles, args.permissions)
+    legacy, fast = _legacy_body(principal), _fast_body(principal)
+    if legacy() != fast():
+        print("❌ corpos diferentes entre o caminho antigo e o rápido", file=sys.stderr)
+        return 1
+
+    results = {
+        "meta": run_metadata(
+            benchmark="auth_alloc",
+            roles=args.roles,
+            permissions=args.permissions,
+            iterations=args.iterations,
+            body_bytes=len(fast()),
+        ),
+        "scenarios": {
+            "legacy": measure(legacy, args.iterations),
+            "fast": measure(fast, args.iterations),
+        },
+    }
+    for name, numbers in results["scenarios"].items():
+        print(
+            f"{name:>7}: {numbers['us_per_request']:>8} µs  "
+            f"pico alocado {numbers['peak_bytes_per_request']:>7} B"
+        )
+
+    path = save_results("auth_alloc", results, args.output)
+    print(f"resultados: {path}")
+
+    if args.baseline:
+        regressions = compare(
+            results,
+            args.baseline,
+            max_regression=args.max_regression,
+            higher_is_better=(),
+            lower_is_better=("us_per_request", "peak_bytes_per_request"),
+        )
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
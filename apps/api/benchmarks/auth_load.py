@@ -0,0 +1,257 @@
+"""Load benchmark for the auth/RBAC hot paths.
+
+Dirige /auth/login, /auth/me, /auth/logout e /admin/ping com concorrência
+configurável e grava p50/p95/p99, req/s e queries por requisição em JSON.
+
+Uso (de apps/api, banco migrado com `alembic upgrade head`):
+
+    python -m benchmarks.auth_load                      # app in-process (httpx ASGI)
+    python -m benchmarks.auth_load --base-url http://localhost:8000   # LOGIN_THROTTLE_ENABLED=false
+    python -m benchmarks.auth_load --baseline benchmarks/results/auth_load-....json
+
+Queries por requisição vêm de /metrics (sgp_http_request_db_statements) e
+ficam null com METRICS_ENABLED=false. Com --baseline, sai com código 1 se
+req/s cair ou p95 subir mais que --max-regression.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks._common import compare, latency_summary, run_metadata, save_results
+
+BENCH_PASSWORD = "bench-password-123"
+BENCH_ROLE = "bench_admin"
+SCENARIOS = ("login", "me", "logout", "admin_ping")
+ROUTES = {
+    "login": "/auth/login",
+    "me": "/auth/me",
+    "logout": "/auth/logout",
+    "admin_ping": "/admin/ping",
+}
+
+
+def bench_email(i: int) -> str:
+    return f"bench-{i}@bench.local"
+
+
+def seed_users(count: int) -> None:
+    """Idempotently create `count` bench users with a role holding rbac.manage"""
+    from sgp_plus.core.security import hash_password
+    from sgp_plus.db.models.permission import Permission
+    from sgp_plus.db.models.role import Role
+    from sgp_plus.db.models.user import User
+    from sgp_plus.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        permission = db.get(Permission, "rbac.manage") or Permission(
+            id="rbac.manage", code="rbac.manage", name="Manage RBAC"
+        )
+        role = db.get(Role, BENCH_ROLE)
+        if role is None:
+            role = Role(id=BENCH_ROLE, code=BENCH_ROLE, name="Benchmark admin")
+            role.permissions = [permission]
+            db.add(role)
+
+        existing = {
+            email
+            for (email,) in db.query(User.email).filter(User.email.like("bench-%@bench.local"))
+        }
+        password_hash = hash_password(BENCH_PASSWORD)  # um hash para todos
+        for i in range(count):
+            if bench_email(i) not in existing:
+                user = User(email=bench_email(i), password_hash=password_hash, is_active=True)
+                user.roles = [role]
+                db.add(user)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _client(base_url: str | None) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=30.0)
+    from sgp_plus.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def _login(client: httpx.AsyncClient, i: int) -> httpx.Response:
+    return await client.post(
+        "/auth/login", json={"email": bench_email(i), "password": BENCH_PASSWORD}
+    )
+
+
+async def _timed(request: Awaitable[httpx.Response]) -> tuple[float, bool]:
+    started = time.perf_counter()
+    response = await request
+    return time.perf_counter() - started, response.status_code < 400
+
+
+def _operation(name: str, i: int) -> Callable[[httpx.AsyncClient], Awaitable[tuple[float, bool]]]:
+    """One measured iteration of a scenario for worker i"""
+    if name == "login":
+        return lambda client: _timed(_login(client, i))
+    if name == "me":
+        return lambda client: _timed(client.get("/auth/me"))
+    if name == "admin_ping":
+        return lambda client: _timed(client.get("/admin/ping"))
+
+    async def logout(client: httpx.AsyncClient) -> tuple[float, bool]:
+        await _login(client, i)  # fora da medição: cada logout precisa de sessão nova
+        return await _timed(client.post("/auth/logout"))
+
+    return logout
+
+
+async def _route_statements(client: httpx.AsyncClient, route: str) -> tuple[float, float] | None:
+    """(sum, count) of sgp_http_request_db_statements for a route, None without /metrics"""
+    response = await client.get("/metrics")
+    if response.status_code != 200:
+        return None
+    total = count = 0.0
+    for line in response.text.splitlines():
+        if line.startswith(f'sgp_http_request_db_statements_sum{{route="{route}"}} '):
+            total = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f'sgp_http_request_db_statements_count{{route="{route}"}} '):
+            count = float(line.rsplit(" ", 1)[1])
+    return total, count
+
+
+async def run_scenario(
+    name: str, base_url: str | None, concurrency: int, duration: float, warmup: float
+) -> dict:
+    """Run one scenario with `concurrency` workers (own client/cookies each)"""
+    clients = [_client(base_url) for _ in range(concurrency)]
+    samples: list[float] = []
+    errors = 0
+    try:
+        if name in ("me", "admin_ping"):
+            for i, client in enumerate(clients):
+                response = await _login(client, i)
+                response.raise_for_status()
+
+        async def worker(i: int, client: httpx.AsyncClient, until: float, record: bool):
+            nonlocal errors
+            operation = _operation(name, i)
+            while time.perf_counter() < until:
+                elapsed, ok = await operation(client)
+                if record:
+                    samples.append(elapsed)
+                    errors += not ok
+
+        if warmup:
+            until = time.perf_counter() + warmup
+            await asyncio.gather(*(worker(i, c, until, False) for i, c in enumerate(clients)))
+
+        before = await _route_statements(clients[0], ROUTES[name])
+        started = time.perf_counter()
+        until = started + duration
+        await asyncio.gather(*(worker(i, c, until, True) for i, c in enumerate(clients)))
+        elapsed = time.perf_counter() - started
+        after = await _route_statements(clients[0], ROUTES[name])
+    finally:
+        for client in clients:
+            await client.aclose()
+
+    queries = None
+    if before is not None and after is not None and after[1] > before[1]:
+        queries = round((after[0] - before[0]) / (after[1] - before[1]), 3)
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": queries,
+        **latency_summary(samples),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {
+        "meta": run_metadata(
+            benchmark="auth_load",
+            mode="http" if args.base_url else "in-process",
+            base_url=args.base_url,
+            concurrency=args.concurrency,
+            duration_seconds=args.duration,
+            warmup_seconds=args.warmup,
+        ),
+        "scenarios": {},
+    }
+    if not args.base_url:
+        from sgp_plus.core.config import settings
+        from sgp_plus.core.login_throttle import login_throttle
+
+        # Todos os workers logam do mesmo IP: o throttle mediria só 429
+        login_throttle.enabled = False
+        results["meta"]["db_mode"] = settings.db_mode
+        results["meta"]["session_token_mode"] = settings.session_token_mode
+
+    for name in args.scenarios:
+        numbers = await run_scenario(
+            name, args.base_url, args.concurrency, args.duration, args.warmup
+        )
+        results["scenarios"][name] = numbers
+        print(
+            f"{name:>11}: {numbers['rps']:>8} req/s  p50 {numbers['p50_ms']:>8}ms  "
+            f"p95 {numbers['p95_ms']:>8}ms  p99 {numbers['p99_ms']:>8}ms  "
+            f"queries/req {numbers['queries_per_request']}  errors {numbers['errors']}"
+        )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de carga dos caminhos de auth/RBAC")
+    parser.add_argument("--base-url", help="servidor em execução; sem isso roda in-process")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="segundos por cenário")
+    parser.add_argument("--warmup", type=float, default=2.0, help="segundos sem medição")
+    parser.add_argument(
+        "--users", type=int, default=None, help="usuários semeados (>= concurrency)"
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: [s.strip() for s in value.split(",") if s.strip()],
+        default=list(SCENARIOS),
+        help=f"lista separada por vírgula ({','.join(SCENARIOS)})",
+    )
+    parser.add_argument("--no-seed", action="store_true", help="não criar usuários bench-*")
+    parser.add_argument("--output", help="arquivo JSON (padrão: benchmarks/results/)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    if not args.no_seed:
+        seed_users(max(args.users or 0, args.concurrency))
+
+    results = asyncio.run(run(args))
+    path = save_results("auth_load", results, args.output)
+    print(f"resultados: {path}")
+
+    if args.baseline:
+        regressions = compare(
+            results,
+            args.baseline,
+            max_regression=args.max_regression,
+            higher_is_better=("rps",),
+            lower_is_better=("p95_ms", "queries_per_request"),
+        )
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Import-time and startup benchmark.
+
+Cada execução é um interpretador novo (cold start de verdade, como um
+container que acabou de subir): mede o import de sgp_plus.main, create_app(),
+o lifespan (warm-up) e as primeiras requisições (/auth/login e /auth/me), com
+STARTUP_WARMUP ligado e desligado. next_login_ms é um segundo login, já em
+regime: first_login_ms - next_login_ms é o custo de "primeira vez" (o bcrypt
+entra nos dois). Guarda a mediana de --runs execuções.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --baseline benchmarks/results/startup-....json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks._common import compare, run_metadata, save_results
+
+SCENARIOS = {"warmup": "true", "no_warmup": "false"}
+METRICS = (
+    "import_ms",
+    "create_app_ms",
+    "startup_ms",
+    "ready_ms",
+    "first_login_ms",
+    "first_me_ms",
+    "next_login_ms",
+)
+
+
+async def _probe_requests(app) -> dict:
+    import httpx
+
+    from benchmarks.auth_load import BENCH_PASSWORD, bench_email
+
+    timings = {}
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["startup_ms"] = (time.perf_counter() - started) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            credentials = {"email": bench_email(0), "password": BENCH_PASSWORD}
+            started = time.perf_counter()
+            (await client.post("/auth/login", json=credentials)).raise_for_status()
+            timings["first_login_ms"] = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            (await client.get("/auth/me")).raise_for_status()
+            timings["first_me_ms"] = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            (await client.post("/auth/login", json=credentials)).raise_for_status()
+            timings["next_login_ms"] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def probe() -> None:
+    """Child process: one cold start, timings as JSON on stdout"""
+    started = time.perf_counter()
+    import sgp_plus.main
+
+    imported = time.perf_counter()
+    app = sgp_plus.main.create_app()
+    created = time.perf_counter()
+
+    timings = {
+        "import_ms": (imported - started) * 1000,
+        "create_app_ms": (created - imported) * 1000,
+    }
+    timings.update(asyncio.run(_probe_requests(app)))
+    timings["ready_ms"] = timings["import_ms"] + timings["create_app_ms"] + timings["startup_ms"]
+    print(json.dumps(timings))
+
+
+def _cold_start(warmup: str) -> dict:
+    env = {
+        **os.environ,
+        "STARTUP_WARMUP": warmup,
+        # Só o que o warm-up faz entra na conta
+        "SESSION_REAPER_ENABLED": "false",
+        "INVALIDATION_ENABLED": "false",
+        "LOGIN_THROTTLE_ENABLED": "false",
+    }
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--probe"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int) -> dict:
+    scenarios = {}
+    for name, warmup in SCENARIOS.items():
+        samples = [_cold_start(warmup) for _ in range(runs)]
+        scenarios[name] = {
+            metric: round(statistics.median(s[metric] for s in samples), 1) for metric in METRICS
+        }
+        print(
+            f"{name:>10}: import {scenarios[name]['import_ms']:.0f} ms, "
+            f"create_app {scenarios[name]['create_app_ms']:.0f} ms, "
+            f"startup {scenarios[name]['startup_ms']:.0f} ms, "
+            f"1º login {scenarios[name]['first_login_ms']:.0f} ms, "
+            f"1º me {scenarios[name]['first_me_ms']:.0f} ms, "
+            f"login em regime {scenarios[name]['next_login_ms']:.0f} ms"
+        )
+    return scenarios
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de import e startup do app")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts por cenário")
+    parser.add_argument("--output", help="arquivo JSON de saída")
+    parser.add_argument("--baseline", help="resultado anterior para comparar")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        probe()
+        return 0
+
+    from benchmarks.auth_load import seed_users
+
+    seed_users(1)
+    results = {"meta": run_metadata(runs=args.runs), "scenarios": run(args.runs)}
+    path = save_results("startup", results, args.output)
+    print(f"resultados: {path}")
+
+    if args.baseline:
+        regressions = compare(
+            results,
+            args.baseline,
+            max_regression=args.max_regression,
+            higher_is_better=(),
+            lower_is_better=METRICS,
+        )
+        for line in regressions:
+            print(f"REGRESSÃO {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Buffered audit trail of authentication events (auth_events).
+
+Na requisição, record() só monta uma tupla e põe numa fila limitada em memória
+(microssegundos, nunca espera o banco). Uma task do lifespan grava a fila a
+cada AUDIT_FLUSH_SECONDS com INSERT multi-linha, AUDIT_BATCH_SIZE eventos por
+statement. Fila cheia (banco lento ou fora): o evento novo é descartado e
+contado em sgp_audit_dropped_total — a requisição nunca bloqueia.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.metrics import AUDIT_DROPPED
+from sgp_plus.db.models.auth_event import AuthEvent
+from sgp_plus.db.session import SessionLocal
+from sgp_plus.shared.utils import get_client_ip, get_user_agent
+
+logger = logging.getLogger(__name__)
+
+LOGIN_SUCCESS = "login_success"
+LOGIN_FAILURE = "login_failure"
+LOGOUT = "logout"
+FORBIDDEN = "forbidden"
+
+# Ordem da tupla na fila = colunas gravadas
+_COLUMNS = ("occurred_at", "kind", "user_id", "session_id", "email", "ip", "user_agent", "detail")
+# Tamanho das colunas String: valor maior é cortado em vez de derrubar o lote
+_LIMITS = {"email": 255, "ip": 45, "user_agent": 512, "detail": 255}
+
+
+def _row(event: tuple) -> dict:
+    row = dict(zip(_COLUMNS, event))
+    for name, limit in _LIMITS.items():
+        value = row[name]
+        if value is not None and len(value) > limit:
+            row[name] = value[:limit]
+    return row
+
+
+class AuditLog:
+    """Bounded in-memory queue of auth events, flushed in batches"""
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        flush_seconds: float = 1.0,
+        batch_size: int = 1000,
+        enabled: bool = True,
+    ):
+        self.max_queue = max_queue
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._queue: deque[tuple] = deque()
+        self.written = 0
+        self.dropped = 0
+
+    def record(
+        self,
+        kind: str,
+        *,
+        user_id: UUID | None = None,
+        session_id: UUID | None = None,
+        email: str | None = None,
+        ip: str | None = None,
+        user_agent: str | None = None,
+        detail: str | None = None,
+    ) -> None:
+        """Queue an event (memory only; dropped and counted when the queue is full)"""
+        if not self.enabled:
+            return
+        event = (datetime.utcnow(), kind, user_id, session_id, email, ip, user_agent, detail)
+        with self._lock:
+            if len(self._queue) < self.max_queue:
+                self._queue.append(event)
+                return
+            self.dropped += 1
+        AUDIT_DROPPED.inc()
+
+    def record_request(self, kind: str, request, **fields) -> None:
+        """record() with IP and user agent taken from the request"""
+        self.record(
+            kind, ip=get_client_ip(request), user_agent=get_user_agent(request), **fields
+        )
+
+    def _drain(self) -> list[tuple]:
+        with self._lock:
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _restore(self, events: list[tuple]) -> None:
+        """Put a failed batch back in front (what no longer fits is dropped)"""
+        with self._lock:
+            room = max(self.max_queue - len(self._queue), 0)
+            lost = len(events) - room
+            self._queue.extendleft(reversed(events[:room]))
+            if lost > 0:
+                self.dropped += lost
+        if lost > 0:
+            AUDIT_DROPPED.inc(amount=lost)
+
+    def flush(self, db: Session) -> int:
+        """Write queued events in batches, one transaction each; returns events written"""
+        written = 0
+        while events := self._drain():
+            try:
+                db.execute(insert(AuthEvent.__table__), [_row(event) for event in events])
+                db.commit()
+            except Exception:
+                db.rollback()
+                self._restore(events)
+                raise
+            written += len(events)
+            self.written += len(events)
+        return written
+
+    def flush_once(self) -> int:
+        """Flush on a fresh session (lifespan task / shutdown)"""
+        db = SessionLocal()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    async def run_forever(self) -> None:
+        """Lifespan task: flush every flush_seconds off the event loop"""
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await asyncio.to_thread(self.flush_once)
+            except Exception:
+                logger.exception("audit: falha ao gravar auth_events (eventos mantidos na fila)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "queued": len(self._queue),
+                "written": self.written,
+                "dropped": self.dropped,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queue.clear()
+
+
+audit_log = AuditLog(
+    max_queue=settings.audit_queue_max,
+    flush_seconds=settings.audit_flush_seconds,
+    batch_size=settings.audit_batch_size,
+    enabled=settings.audit_enabled,
+)
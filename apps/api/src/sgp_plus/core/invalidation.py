@@ -0,0 +1,177 @@
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Cada worker mantém caches locais (session_cache, revocation_filter, catálogo
+RBAC). Quem muda o estado publica no canal CHANNEL dentro da própria transação
+(NOTIFY só sai no commit) e todos os workers, de todos os nós, escutam numa
+conexão dedicada:
+
+    s:<session_id>      sessão revogada (RETURNING do UPDATE em AuthRepository)
+    u:<id>,<id>,...     usuário desativado ou com roles alteradas (trigger, 0006)
+    r                   catálogo RBAC alterado (trigger de rbac_state, 0006)
+    *                   esquecer tudo
+
+Para tokens assinados o "u:" vira um "not before" por usuário no
+revocation_filter; sem o NOTIFY (listener fora do ar) a sync periódica traz o
+mesmo de users.access_changed_at (migration 0009).
+
+O listener junta o que chega em INVALIDATION_COALESCE_MS e aplica uma vez por
+lote (um passe no cache para N usuários, uma checagem do RBAC para N "r").
+Ao (re)conectar aplica "*": o que foi publicado sem ninguém escutando se
+perdeu, então os caches recomeçam do banco.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from uuid import UUID
+
+import psycopg
+from sqlalchemy import String, cast, func, literal
+from sqlalchemy.engine import make_url
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.rbac_engine import rbac_engine
+from sgp_plus.core.read_routing import read_routing
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.core.session_tokens import revocation_filter
+
+logger = logging.getLogger(__name__)
+
+# Mesmo nome nos triggers da migration 0006
+CHANNEL = "sgp_invalidation"
+
+
+def session_revoked_notify(session_id_column):
+    """pg_notify expression for RETURNING: one message per revoked row"""
+    return func.pg_notify(CHANNEL, literal("s:") + cast(session_id_column, String))
+
+
+@dataclass
+class InvalidationBatch:
+    """Coalesced messages of one listener wake-up"""
+
+    sessions: set[UUID] = field(default_factory=set)
+    users: set[UUID] = field(default_factory=set)
+    rbac: bool = False
+    everything: bool = False
+
+    def add(self, payload: str) -> None:
+        kind, _, ids = payload.partition(":")
+        try:
+            if kind == "s":
+                self.sessions.add(UUID(ids))
+            elif kind == "u":
+                self.users.update(UUID(i) for i in ids.split(",") if i)
+            elif kind == "r":
+                self.rbac = True
+            elif kind == "*":
+                self.everything = True
+            else:
+                logger.warning("invalidation: mensagem desconhecida %r", payload[:100])
+        except ValueError:
+            logger.warning("invalidation: payload inválido %r", payload[:100])
+
+    def apply(self) -> None:
+        if self.everything:
+            session_cache.clear()
+            revocation_filter.expire()
+            rbac_engine.expire()
+            read_routing.stick_all()
+            return
+        for session_id in self.sessions:
+            session_cache.invalidate(session_id)
+            revocation_filter.add(session_id)
+        # A réplica pode ainda não ter a mudança que o NOTIFY anunciou
+        read_routing.stick(self.sessions)
+        if self.users:
+            # Principal em cache tem is_active/roles antigos: relê do banco.
+            # Token assinado carrega os mesmos dados: emitido até aqui não vale
+            session_cache.invalidate_users(self.users)
+            revocation_filter.users_changed(self.users)
+            read_routing.stick_all()
+        if self.rbac:
+            rbac_engine.expire()
+
+
+class InvalidationListener:
+    """Background LISTEN loop with coalescing and reconnect/backoff"""
+
+    def __init__(
+        self,
+        database_url: str,
+        coalesce_seconds: float = 0.01,
+        idle_check_seconds: float = 30.0,
+        reconnect_max_seconds: float = 30.0,
+    ):
+        self.database_url = database_url
+        self.coalesce_seconds = coalesce_seconds
+        self.idle_check_seconds = idle_check_seconds
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self.connected = False
+        self.messages = 0
+        self.batches = 0
+        self.reconnects = 0
+
+    @property
+    def dsn(self) -> str:
+        """libpq DSN from the SQLAlchemy URL (postgresql+psycopg:// → postgresql://)"""
+        url = make_url(self.database_url).set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    def _apply(self, batch: InvalidationBatch, received: int) -> None:
+        batch.apply()
+        self.messages += received
+        self.batches += 1
+
+    async def _listen(self, conn: psycopg.AsyncConnection) -> None:
+        await conn.execute(f"LISTEN {CHANNEL}")
+        self.connected = True
+        self._apply(InvalidationBatch(everything=True), 0)
+        while True:
+            batch, received = InvalidationBatch(), 0
+            # Espera a primeira mensagem; sem nada, testa a conexão
+            async for notify in conn.notifies(timeout=self.idle_check_seconds, stop_after=1):
+                batch.add(notify.payload)
+                received += 1
+            if not received:
+                await conn.execute("SELECT 1")
+                continue
+            # Junta o que chegar na janela de coalescência e aplica uma vez
+            async for notify in conn.notifies(timeout=self.coalesce_seconds):
+                batch.add(notify.payload)
+                received += 1
+            self._apply(batch, received)
+
+    async def run_forever(self) -> None:
+        """Lifespan task: listen, reconnecting with exponential backoff"""
+        delay = 0.5
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.dsn, autocommit=True
+                ) as conn:
+                    delay = 0.5
+                    await self._listen(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("invalidation: conexão LISTEN caiu; reconectando em %.1fs", delay)
+            self.connected = False
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "messages": self.messages,
+            "batches": self.batches,
+            "reconnects": self.reconnects,
+        }
+
+
+invalidation_listener = InvalidationListener(
+    settings.database_url,
+    coalesce_seconds=settings.invalidation_coalesce_ms / 1000,
+    reconnect_max_seconds=settings.invalidation_reconnect_max_seconds,
+)
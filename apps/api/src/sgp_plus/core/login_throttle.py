@@ -0,0 +1,142 @@
+"""Login throttle: sliding-window attempt counters per client IP and per email.
+
+Checado antes de qualquer acesso ao banco ou bcrypt: tentativa acima do
+limite volta 429 na hora. Cada chave guarda só três números (início da
+janela atual, contagem da anterior e da atual) e a janela deslizante é
+aproximada ponderando a anterior pelo quanto dela ainda cabe na janela.
+Memória limitada por LRU (LOGIN_THROTTLE_MAX_KEYS por tipo de chave).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.metrics import LOGIN_THROTTLED
+from sgp_plus.shared.errors import TooManyRequestsError
+
+
+class SlidingWindowCounter:
+    """Approximate sliding-window counters for many keys, bounded by LRU"""
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        # key → [início da janela atual, contagem anterior, contagem atual]
+        self._windows: OrderedDict[str, list[float]] = OrderedDict()
+        self.evictions = 0
+
+    def _window(self, key: str, now: float) -> list[float]:
+        window = self._windows.get(key)
+        start = now - now % self.window_seconds
+        if window is None:
+            window = self._windows[key] = [start, 0, 0]
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._windows.move_to_end(key)
+            if window[0] != start:
+                # Janela anterior só conta se for a imediatamente anterior
+                previous = window[2] if start - window[0] == self.window_seconds else 0
+                window[:] = [start, previous, 0]
+        return window
+
+    def _estimate(self, window: list[float], now: float) -> float:
+        elapsed = (now - window[0]) / self.window_seconds
+        return window[1] * (1 - elapsed) + window[2]
+
+    def hit(self, key: str, now: float) -> float:
+        """Count one attempt; returns seconds to wait (0 when allowed)"""
+        window = self._window(key, now)
+        if self._estimate(window, now) >= self.limit:
+            if window[2] >= self.limit or not window[1]:
+                # Só a virada da janela libera
+                wait = window[0] + self.window_seconds - now
+            else:
+                # Até o peso da janela anterior cair o bastante
+                excess = self._estimate(window, now) - self.limit + 1
+                wait = excess / window[1] * self.window_seconds
+            return max(1.0, min(wait, self.window_seconds))
+        window[2] += 1
+        return 0.0
+
+    def reset(self, key: str) -> None:
+        self._windows.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class LoginThrottle:
+    """Per-IP and per-email login attempt limits"""
+
+    def __init__(
+        self,
+        ip_limit: int = 30,
+        email_limit: int = 10,
+        window_seconds: float = 60.0,
+        max_keys: int = 100_000,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._ip = SlidingWindowCounter(ip_limit, window_seconds, max_keys)
+        self._email = SlidingWindowCounter(email_limit, window_seconds, max_keys)
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    def check(self, ip: str, email: str) -> None:
+        """Count an attempt; 429 when the IP or the email is over its limit"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            wait = self._ip.hit(ip, now)
+            kind = "ip"
+            if not wait:
+                wait = self._email.hit(self.normalize_email(email), now)
+                kind = "email"
+        if wait:
+            LOGIN_THROTTLED.inc(kind)
+            raise TooManyRequestsError(
+                "Too many login attempts, try again later",
+                retry_after=math.ceil(wait),
+            )
+
+    def succeeded(self, email: str) -> None:
+        """Successful login clears the email's counter (IP keeps counting)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._email.reset(self.normalize_email(email))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ip_keys": len(self._ip),
+                "email_keys": len(self._email),
+                "evictions": self._ip.evictions + self._email.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ip = SlidingWindowCounter(
+                self._ip.limit, self._ip.window_seconds, self._ip.max_keys
+            )
+            self._email = SlidingWindowCounter(
+                self._email.limit, self._email.window_seconds, self._email.max_keys
+            )
+
+
+login_throttle = LoginThrottle(
+    ip_limit=settings.login_throttle_ip_limit,
+    email_limit=settings.login_throttle_email_limit,
+    window_seconds=settings.login_throttle_window_seconds,
+    max_keys=settings.login_throttle_max_keys,
+    enabled=settings.login_throttle_enabled,
+)
@@ -0,0 +1,294 @@
+"""In-process metrics exposed in Prometheus text format (/metrics).
+
+Gravação sem lock no caminho quente: cada thread escreve no próprio shard
+(dict), e só o scrape percorre todos os shards somando os valores. O lock do
+registry é usado apenas para registrar um shard novo (uma vez por thread) e
+durante o scrape.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Registry:
+    """Metric definitions plus per-thread value shards"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._metrics: list["_Metric"] = []
+
+    def shard(self) -> dict:
+        """Values written by the current thread"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def _merged(self) -> dict:
+        merged: dict = {}
+        with self._lock:
+            # dict.copy() é atômico sob o GIL: a thread dona pode seguir escrevendo
+            shards = [shard.copy() for shard in self._shards]
+        for shard in shards:
+            for key, value in shard.items():
+                if isinstance(value, list):
+                    current = merged.get(key)
+                    if current is None:
+                        merged[key] = list(value)
+                    else:
+                        for i, v in enumerate(value):
+                            current[i] += v
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition of every registered metric"""
+        merged = self._merged()
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render(merged))
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: Registry, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._local = registry._local
+        registry.register(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            return self.registry.shard()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def _series(self, merged: dict):
+        return sorted(
+            ((key[1], value) for key, value in merged.items() if key[0] is self),
+            key=lambda item: item[0],
+        )
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        shard = self._shard()
+        key = (self, labelvalues)
+        shard[key] = shard.get(key, 0) + amount
+
+    def render(self, merged: dict) -> list[str]:
+        lines = self._header()
+        for labelvalues, value in self._series(merged):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: Registry,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues) -> None:
+        self.observe_into(self._shard(), (self, labelvalues), value)
+
+    def observe_into(self, shard: dict, key: tuple, value: float) -> None:
+        """observe() with shard/key already resolved (hot path of the middleware)"""
+        state = shard.get(key)
+        if state is None:
+            # [contagem por bucket..., +Inf, soma, total]
+            state = shard[key] = [0] * (len(self.buckets) + 3)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def render(self, merged: dict) -> list[str]:
+        lines = self._header()
+        for labelvalues, state in self._series(merged):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), state):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{_number(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}"
+                )
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_number(state[-1])}")
+        return lines
+
+
+registry = Registry()
+
+HTTP_REQUESTS = Counter(
+    registry, "sgp_http_requests_total", "HTTP requests by route and status",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = Histogram(
+    registry, "sgp_http_request_duration_seconds", "HTTP request latency",
+    ("method", "route"),
+)
+HTTP_DB_STATEMENTS = Histogram(
+    registry, "sgp_http_request_db_statements", "SQL statements per HTTP request",
+    ("route",), buckets=STATEMENT_BUCKETS,
+)
+HTTP_DB_SECONDS = Histogram(
+    registry, "sgp_http_request_db_seconds", "Time spent in SQL per HTTP request",
+    ("route",),
+)
+DB_STATEMENTS = Counter(registry, "sgp_db_statements_total", "SQL statements executed")
+DB_SECONDS = Counter(registry, "sgp_db_seconds_total", "Time spent executing SQL")
+PASSWORD_SECONDS = Histogram(
+    registry, "sgp_password_hash_seconds", "Password hash/verify CPU time",
+    ("operation",), buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+PASSWORD_REHASHED = Counter(
+    registry, "sgp_password_rehashed_total", "Outdated password hashes replaced at login",
+)
+SESSIONS_CREATED = Counter(registry, "sgp_sessions_created_total", "Sessions created (logins)")
+SESSIONS_REVOKED = Counter(
+    registry, "sgp_sessions_revoked_total", "Sessions revoked (logout and bulk revocation)"
+)
+AUDIT_DROPPED = Counter(
+    registry, "sgp_audit_dropped_total", "Audit events dropped (queue full or failed flush)"
+)
+LOGIN_THROTTLED = Counter(
+    registry, "sgp_login_throttled_total", "Login attempts rejected by the throttle", ("key",),
+)
+
+# [statements, db_seconds] da requisição HTTP corrente (visível no threadpool)
+_request_db: ContextVar[list | None] = ContextVar("sgp_request_db", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._sgp_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sgp_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_STATEMENTS.inc()
+    DB_SECONDS.inc(amount=elapsed)
+    current = _request_db.get()
+    if current is not None:
+        current[0] += 1
+        current[1] += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and SQL time of a (sync) engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """ASGI middleware: latency, status and SQL cost per route template"""
+
+    def __init__(self, app):
+        self.app = app
+        # (method, route, status) → chaves já montadas dos 4 series
+        self._keys: dict[tuple, tuple] = {}
+
+    def _record(self, method: str, route: str, status: int, elapsed: float, db: list) -> None:
+        keys = self._keys.get((method, route, status))
+        if keys is None:
+            keys = self._keys[(method, route, status)] = (
+                (HTTP_REQUESTS, (method, route, status)),
+                (HTTP_LATENCY, (method, route)),
+                (HTTP_DB_STATEMENTS, (route,)),
+                (HTTP_DB_SECONDS, (route,)),
+            )
+        requests_key, latency_key, statements_key, db_seconds_key = keys
+        shard = HTTP_REQUESTS._shard()
+        shard[requests_key] = shard.get(requests_key, 0) + 1
+        HTTP_LATENCY.observe_into(shard, latency_key, elapsed)
+        HTTP_DB_STATEMENTS.observe_into(shard, statements_key, db[0])
+        HTTP_DB_SECONDS.observe_into(shard, db_seconds_key, db[1])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        db = [0, 0.0]
+        token = _request_db.set(db)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db.reset(token)
+            # Template da rota (não o path), para cardinalidade limitada
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self._record(scope["method"], route, status, elapsed, db)
@@ -0,0 +1,157 @@
+"""Password hash cost calibration.
+
+Mede o tempo de hash neste host e recomenda o custo mais alto (rounds do bcrypt
+ou time_cost do argon2id) que cabe em --target-ms. Rode em cada ambiente
+(des/hml/prod) no hardware onde a API roda; com --env-file grava as variáveis.
+Hashes existentes continuam válidos e são regravados no próximo login.
+
+    python -m sgp_plus.core.password_calibration --target-ms 250
+    python -m sgp_plus.core.password_calibration --scheme argon2 --env-file .env
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from passlib.exc import MissingBackendError
+from passlib.hash import argon2, bcrypt
+
+from sgp_plus.core.config import settings
+
+SAMPLE_PASSWORD = "calibration-password-123"
+# Pisos do OWASP Password Storage Cheat Sheet
+BCRYPT_MIN_ROUNDS = 10
+ARGON2_MIN_TIME_COST = 2
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """Recommended cost for one scheme and its measured time per hash"""
+
+    scheme: str
+    env: dict[str, str]
+    seconds: float
+
+
+def measure(handler, samples: int) -> float:
+    """Median seconds per hash of a configured passlib handler"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash(SAMPLE_PASSWORD)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def recommend_bcrypt_rounds(seconds: float, rounds: int, target_seconds: float) -> int:
+    """Highest rounds fitting the target, extrapolated from one measurement (+1 round = 2x)"""
+    best = rounds + math.floor(math.log2(target_seconds / seconds))
+    return max(BCRYPT_MIN_ROUNDS, min(31, best))
+
+
+def recommend_argon2_time_cost(seconds: float, time_cost: int, target_seconds: float) -> int:
+    """Highest time_cost fitting the target (time grows linearly with passes)"""
+    return max(ARGON2_MIN_TIME_COST, math.floor(time_cost * target_seconds / seconds))
+
+
+def calibrate_bcrypt(target_seconds: float, samples: int = 3) -> Calibration:
+    """Extrapolate from rounds=10, then step down while the measured time is over target"""
+    base = BCRYPT_MIN_ROUNDS
+    rounds = recommend_bcrypt_rounds(
+        measure(bcrypt.using(rounds=base), samples), base, target_seconds
+    )
+    seconds = measure(bcrypt.using(rounds=rounds), samples)
+    while seconds > target_seconds and rounds > BCRYPT_MIN_ROUNDS:
+        rounds -= 1
+        seconds = measure(bcrypt.using(rounds=rounds), samples)
+    return Calibration("bcrypt", {"PASSWORD_BCRYPT_ROUNDS": str(rounds)}, seconds)
+
+
+def calibrate_argon2(
+    target_seconds: float, memory_cost: int, parallelism: int, samples: int = 3
+) -> Calibration:
+    """Fixed memory/parallelism; pick time_cost from a time_cost=1 measurement"""
+
+    def handler(time_cost: int):
+        return argon2.using(
+            type="ID", rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+
+    time_cost = recommend_argon2_time_cost(measure(handler(1), samples), 1, target_seconds)
+    seconds = measure(handler(time_cost), samples)
+    while seconds > target_seconds and time_cost > ARGON2_MIN_TIME_COST:
+        time_cost -= 1
+        seconds = measure(handler(time_cost), samples)
+    env = {
+        "PASSWORD_ARGON2_TIME_COST": str(time_cost),
+        "PASSWORD_ARGON2_MEMORY_COST": str(memory_cost),
+        "PASSWORD_ARGON2_PARALLELISM": str(parallelism),
+    }
+    return Calibration("argon2", env, seconds)
+
+
+def update_env_file(path: Path, values: dict[str, str]) -> None:
+    """Replace KEY=... lines in an env file (appending missing keys)"""
+    lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+    pending = dict(values)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if "=" in line and not line.lstrip().startswith("#") and key in pending:
+            lines[i] = f"{key}={pending.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in pending.items())
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Calibra o custo do hash de senha neste host")
+    parser.add_argument(
+        "--scheme", choices=("bcrypt", "argon2"), help="padrão: primeiro de PASSWORD_SCHEMES"
+    )
+    parser.add_argument("--target-ms", type=float, default=250.0, help="tempo alvo por hash")
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--memory-kib", type=int, default=settings.password_argon2_memory_cost)
+    parser.add_argument("--parallelism", type=int, default=settings.password_argon2_parallelism)
+    parser.add_argument("--env-file", type=Path, help="grava as variáveis recomendadas")
+    args = parser.parse_args(argv)
+
+    schemes = settings.password_schemes.split(",")
+    scheme = args.scheme or schemes[0]
+    target = args.target_ms / 1000
+
+    try:
+        if scheme == "argon2":
+            result = calibrate_argon2(target, args.memory_kib, args.parallelism, args.samples)
+        else:
+            result = calibrate_bcrypt(target, args.samples)
+    except MissingBackendError:
+        print("❌ argon2 indisponível: pip install argon2-cffi", file=sys.stderr)
+        return 1
+
+    # Esquemas antigos continuam na lista para verificar hashes existentes
+    env = {"PASSWORD_SCHEMES": ",".join(dict.fromkeys([scheme, *schemes])), **result.env}
+    # Hash é CPU pura: vazão limitada pelo menor entre workers e CPUs
+    workers = settings.password_pool_workers
+    cpus = os.cpu_count() or 1
+    print(
+        f"✅ {scheme}: {result.seconds * 1000:.1f} ms/hash (alvo {args.target_ms:.0f} ms) "
+        f"→ ~{min(workers, cpus) / result.seconds:.0f} logins/s "
+        f"({workers} workers, {cpus} CPUs)"
+    )
+    if result.seconds > target:
+        print("⚠️  nem o custo mínimo recomendado cabe no alvo neste host")
+    for key, value in env.items():
+        print(f"{key}={value}")
+
+    if args.env_file:
+        update_env_file(args.env_file, env)
+        print(f"✅ {args.env_file} atualizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
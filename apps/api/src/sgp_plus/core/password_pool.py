@@ -0,0 +1,155 @@
+"""Bounded worker pool for password hashing/verification.
+
+bcrypt custa centenas de ms de CPU por chamada; rodar no event loop congela
+todas as outras requisições. O pool executa hash/verify em threads (bcrypt
+libera o GIL) ou processos, com admissão limitada: acima de
+workers + max_queue pendentes a chamada falha na hora com 503.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.metrics import PASSWORD_SECONDS
+from sgp_plus.core.security import (
+    hash_password,
+    load_password_backends,
+    verify_and_update_password,
+    verify_password,
+)
+from sgp_plus.shared.errors import ServiceUnavailableError
+
+
+def _timed(fn: Callable, *args: Any) -> tuple[Any, float]:
+    """Run fn in the worker and return (result, seconds spent running)"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordPool:
+    """Thread/process pool with admission control and wait-time stats"""
+
+    def __init__(self, kind: str = "thread", workers: int = 4, max_queue: int = 32):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._run_seconds_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use"""
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-pool",
+                )
+        return self._executor
+
+    async def warm_up(self) -> None:
+        """Start every worker and load the hashing backend in it (app startup).
+
+        Com kind=process cada worker é um interpretador novo (spawn) que importa
+        o app: sem isso, os primeiros logins pagam esse custo.
+        """
+        executor = self._get_executor()
+        futures = [executor.submit(load_password_backends) for _ in range(self.workers)]
+        await asyncio.gather(*map(asyncio.wrap_future, futures))
+
+    def _release(self, _future: Future) -> None:
+        """Done callback: the slot is free only when the worker really finished"""
+        with self._lock:
+            self._pending -= 1
+
+    async def _submit(self, fn: Callable, *args: Any) -> Any:
+        """Admit, run fn on the pool and record wait/run time"""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise ServiceUnavailableError("Too many concurrent logins, retry shortly")
+            self._pending += 1
+            self._submitted += 1
+
+        submitted_at = time.perf_counter()
+        try:
+            future = self._get_executor().submit(_timed, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        result, run_seconds = await asyncio.wrap_future(future)
+
+        PASSWORD_SECONDS.observe(run_seconds, fn.__name__)
+        wait_seconds = max(0.0, time.perf_counter() - submitted_at - run_seconds)
+        with self._lock:
+            self._completed += 1
+            self._run_seconds_total += run_seconds
+            self._wait_seconds_total += wait_seconds
+            if wait_seconds > self._wait_seconds_max:
+                self._wait_seconds_max = wait_seconds
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash on the pool"""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify on the pool; also returns a new hash when the stored one is outdated"""
+        return await self._submit(verify_and_update_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the pool"""
+        return await self._submit(hash_password, password)
+
+    def stats(self) -> dict:
+        """Pool depth and wait-time snapshot"""
+        with self._lock:
+            pending = self._pending
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(pending, self.workers),
+                "queued": max(0, pending - self.workers),
+                "submitted": self._submitted,
+                "completed": completed,
+                "rejected": self._rejected,
+                "wait_seconds_avg": self._wait_seconds_total / completed if completed else 0.0,
+                "wait_seconds_max": self._wait_seconds_max,
+                "run_seconds_avg": self._run_seconds_total / completed if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the executor (app shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordPool(
+    kind=settings.password_pool_kind,
+    workers=settings.password_pool_workers,
+    max_queue=settings.password_pool_max_queue,
+)
@@ -0,0 +1,62 @@
+"""Authenticated principal (immutable snapshot, no ORM)"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sgp_plus.db.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class RoleInfo:
+    """Role snapshot"""
+
+    id: str
+    code: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class PermissionInfo:
+    """Permission snapshot"""
+
+    id: str
+    code: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Quem está chamando: usuário + ids das roles + sessão.
+
+    Mesmos atributos de User usados por UserResponse (id, email, is_active,
+    created_at), então pode ser validado com from_attributes. Roles/permissions
+    detalhadas vêm do catálogo compilado (rbac_engine) a partir de role_ids.
+    Imutável para poder ser compartilhado entre requisições pelo cache de sessão.
+    """
+
+    id: UUID
+    email: str
+    is_active: bool
+    created_at: datetime
+    role_ids: tuple[str, ...]
+    session_id: UUID | None = None
+    session_expires_at: datetime | None = None
+
+    @classmethod
+    def from_user(
+        cls,
+        user: User,
+        session_id: UUID | None = None,
+        session_expires_at: datetime | None = None,
+    ) -> "Principal":
+        """Snapshot a User with roles already loaded"""
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            role_ids=tuple(sorted(role.id for role in user.roles)),
+            session_id=session_id,
+            session_expires_at=session_expires_at,
+        )
@@ -2,47 +2,84 @@
 
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from sgp_plus.db.session import get_db
-from sgp_plus.core.security import get_current_user
-from sgp_plus.db.models.user import User
+from sgp_plus.core.audit import FORBIDDEN, audit_log
+from sgp_plus.core.principal import PermissionInfo, Principal, RoleInfo
+from sgp_plus.core.rbac_engine import RbacCatalog, RbacEngine, rbac_engine
+from sgp_plus.core.security import get_current_user_dependency
+from sgp_plus.core.sql_profiler import mark_authorized
+from sgp_plus.db.session import get_db_dependency
+
+# Quem pode ver o relatório do SQL profiler (header X-SQL-Profile)
+_PROFILER_MASK = rbac_engine.required_mask("rbac.manage")
+
+__all__ = [
+    "RbacCatalog",
+    "RbacEngine",
+    "principal_access_json",
+    "rbac_engine",
+    "require_permissions",
+    "resolve_principal_access",
+]
 
-from sqlalchemy.orm import Session
+
+async def principal_access_json(principal: Principal, db: Session | AsyncSession) -> bytes:
+    """Precomputed roles/permissions JSON fragment of a principal (see RbacCatalog)"""
+    catalog = await rbac_engine.ensure_fresh(db, principal.role_ids)
+    mask, _, _ = catalog.resolve(principal.role_ids)
+    mark_authorized(mask & _PROFILER_MASK == _PROFILER_MASK)
+    return catalog.resolve_json(principal.role_ids)
+
+
+async def resolve_principal_access(
+    principal: Principal,
+    db: Session | AsyncSession,
+) -> tuple[int, tuple[RoleInfo, ...], tuple[PermissionInfo, ...]]:
+    """(mask, roles, permissions) of a principal from the compiled catalog"""
+    catalog = await rbac_engine.ensure_fresh(db, principal.role_ids)
+    access = catalog.resolve(principal.role_ids)
+    mark_authorized(access[0] & _PROFILER_MASK == _PROFILER_MASK)
+    return access
 
 
 def require_permissions(*permission_codes: str):
     """
     Dependency to require specific permissions.
     Usage: @app.get("/route", dependencies=[Depends(require_permissions("users.read"))])
+    Resolves the current user with the sync or async stack according to DB_MODE.
     """
+    # Resolvido uma vez, na declaração da rota
+    required = rbac_engine.required_mask(*permission_codes)
+
+    def forbidden(request: Request, principal: Principal, detail: str) -> HTTPException:
+        audit_log.record_request(
+            FORBIDDEN,
+            request,
+            user_id=principal.id,
+            session_id=principal.session_id,
+            email=principal.email,
+            detail=f"{request.method} {request.url.path}: {detail}",
+        )
+        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
     async def permission_checker(
-        db: Annotated[Session, Depends(get_db)],
-        current_user: Annotated[User, Depends(get_current_user)],
-    ) -> User:
+        request: Request,
+        current_user: Annotated[Principal, Depends(get_current_user_dependency())],
+        db: Annotated[Session | AsyncSession, Depends(get_db_dependency())],
+    ) -> Principal:
         """Check if user has required permissions"""
         if not current_user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User is inactive",
-            )
+            raise forbidden(request, current_user, "User is inactive")
 
-        # Get user permissions
-        user_permissions = set()
-        for role in current_user.roles:
-            for perm in role.permissions:
-                user_permissions.add(perm.code)
+        mask, _, _ = await resolve_principal_access(current_user, db)
 
         # Check if user has all required permissions
-        required = set(permission_codes)
-        missing = required - user_permissions
-
-        if missing:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Missing permissions: {', '.join(missing)}",
-            )
+        if mask & required != required:
+            missing = rbac_engine.codes_for_mask(required & ~mask)
+            raise forbidden(request, current_user, f"Missing permissions: {', '.join(missing)}")
 
         return current_user
 
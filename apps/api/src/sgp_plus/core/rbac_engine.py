@@ -0,0 +1,341 @@
+"""Compiled RBAC catalog: permission codes as bits, roles as bitmasks
+
+Herança de roles (role_inheritance) e grants curinga ("processos.*", "*") são
+resolvidos na compilação: o curinga vira os bits de todos os códigos que casam
+com o prefixo e cada role recebe a união das máscaras das roles que inclui.
+Na requisição continua sendo um AND por rota, sem consulta recursiva.
+"""
+
+import threading
+import time
+from typing import Iterable
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.principal import PermissionInfo, RoleInfo
+from sgp_plus.db.models.associations import role_inheritance, role_permissions
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.rbac_state import RbacState
+from sgp_plus.db.models.role import Role
+
+_ROLES_QUERY = select(Role.id, Role.code, Role.name)
+_PERMISSIONS_QUERY = select(Permission.id, Permission.code, Permission.name)
+_GRANTS_QUERY = select(role_permissions.c.role_id, role_permissions.c.permission_id)
+_INHERITANCE_QUERY = select(role_inheritance.c.role_id, role_inheritance.c.included_role_id)
+_VERSION_QUERY = select(RbacState.version).where(RbacState.id == 1)
+
+
+WILDCARD = "*"
+_GRANTEES = None  # chave do nó com as roles do curinga (segmentos são str)
+
+
+def is_wildcard(code: str) -> bool:
+    """'*' or a dotted prefix ending in '.*' ('processos.*')"""
+    return code == WILDCARD or code.endswith("." + WILDCARD)
+
+
+class WildcardTrie:
+    """Dotted-prefix trie of wildcard grants → role ids.
+
+    "processos.*" cobre qualquer código abaixo de "processos." (em qualquer
+    profundidade), "*" cobre tudo. match() anda um nó por segmento do código.
+    """
+
+    def __init__(self):
+        self._root: dict = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._root)
+
+    def add(self, pattern: str, role_id: str) -> None:
+        node = self._root
+        for segment in pattern.split(".")[:-1]:
+            node = node.setdefault(segment, {})
+        node.setdefault(_GRANTEES, set()).add(role_id)
+
+    def match(self, code: str) -> set[str]:
+        """Role ids whose wildcards cover code"""
+        node = self._root
+        grantees = set(node.get(_GRANTEES, ()))
+        for segment in code.split(".")[:-1]:
+            node = node.get(segment)
+            if node is None:
+                break
+            grantees.update(node.get(_GRANTEES, ()))
+        return grantees
+
+
+def flatten_inheritance(
+    role_masks: dict[str, int], inherits: Iterable[tuple[str, str]]
+) -> dict[str, int]:
+    """Each role's mask OR the masks of every role it includes, transitively.
+
+    Ponto fixo sobre as arestas: termina em (profundidade + 1) passes e um
+    ciclo (que o rbac_sync recusa, mas pode vir do banco) só faz as roles do
+    ciclo compartilharem as permissões, sem laço infinito.
+    """
+    edges = [
+        (role_id, included)
+        for role_id, included in inherits
+        if role_id in role_masks and included in role_masks and role_id != included
+    ]
+    flat = dict(role_masks)
+    changed = bool(edges)
+    while changed:
+        changed = False
+        for role_id, included in edges:
+            mask = flat[role_id] | flat[included]
+            if mask != flat[role_id]:
+                flat[role_id] = mask
+                changed = True
+    return flat
+
+
+class RbacCatalog:
+    """Compiled, immutable snapshot of roles/permissions as bitmasks"""
+
+    def __init__(
+        self,
+        version: int,
+        source_version: int,
+        roles: dict[str, RoleInfo],
+        permissions_by_bit: dict[int, PermissionInfo],
+        role_masks: dict[str, int],
+    ):
+        self.version = version
+        self.source_version = source_version
+        self.roles = roles
+        self.permissions_by_bit = permissions_by_bit
+        self.role_masks = role_masks
+        # role_ids → (mask, roles, permissions); poucas combinações distintas
+        self._resolved: dict[tuple[str, ...], tuple[int, tuple, tuple]] = {}
+        # JSON de cada role/permissão, serializado uma vez por compilação
+        self._role_json = {role_id: orjson.dumps(info) for role_id, info in roles.items()}
+        self._permission_json = {
+            bit: orjson.dumps(info) for bit, info in permissions_by_bit.items()
+        }
+        self._resolved_json: dict[tuple[str, ...], bytes] = {}
+        # Role ids pedidas que não existem nesta versão (role apagada com sessão em
+        # cache): conferidas uma vez, não recarregam o catálogo a cada requisição
+        self.unknown_roles: frozenset[str] = frozenset()
+
+    def knows(self, role_id: str) -> bool:
+        """True if role_id is in the catalog or already confirmed missing from it"""
+        return role_id in self.roles or role_id in self.unknown_roles
+
+    def mark_unknown(self, role_ids: tuple[str, ...]) -> None:
+        missing = {role_id for role_id in role_ids if role_id not in self.roles}
+        if missing - self.unknown_roles:
+            self.unknown_roles = self.unknown_roles | missing
+
+    def resolve(self, role_ids: tuple[str, ...]) -> tuple[int, tuple, tuple]:
+        """(mask, roles, permissions) for a set of role ids, memoized"""
+        resolved = self._resolved.get(role_ids)
+        if resolved is None:
+            mask = 0
+            for role_id in role_ids:
+                mask |= self.role_masks.get(role_id, 0)
+            roles = tuple(self.roles[r] for r in role_ids if r in self.roles)
+            permissions = tuple(
+                info for bit, info in sorted(self.permissions_by_bit.items()) if mask >> bit & 1
+            )
+            resolved = (mask, roles, permissions)
+            self._resolved[role_ids] = resolved
+        return resolved
+
+    def resolve_json(self, role_ids: tuple[str, ...]) -> bytes:
+        """'"roles":[...],"permissions":[...]' JSON fragment for a set of role ids, memoized"""
+        fragment = self._resolved_json.get(role_ids)
+        if fragment is None:
+            mask, roles, _ = self.resolve(role_ids)
+            fragment = b"".join((
+                b'"roles":[',
+                b",".join(self._role_json[role.id] for role in roles),
+                b'],"permissions":[',
+                b",".join(
+                    json for bit, json in sorted(self._permission_json.items()) if mask >> bit & 1
+                ),
+                b"]",
+            ))
+            self._resolved_json[role_ids] = fragment
+        return fragment
+
+
+class RbacEngine:
+    """Process-wide RBAC engine.
+
+    Códigos de permissão são internados em posições de bit (append-only, então
+    máscaras exigidas calculadas na declaração da rota continuam válidas após
+    recompilar). Cada role vira um inteiro; a checagem é um AND + comparação.
+    A versão em rbac_state (trigger) é consultada a cada
+    RBAC_VERSION_CHECK_SECONDS; se mudou, o catálogo é recompilado.
+    """
+
+    def __init__(self, check_seconds: float = 5.0):
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._bits: dict[str, int] = {}
+        self._catalog: RbacCatalog | None = None
+        self._checked_at = 0.0
+        self._builds = 0
+        # Linhas da última compilação: código novo com curinga carregado recompila
+        self._rows: tuple | None = None
+
+    @property
+    def version(self) -> int:
+        """Local build counter (increments on every recompilation)"""
+        return self._builds
+
+    @property
+    def catalog(self) -> RbacCatalog | None:
+        return self._catalog
+
+    def bit(self, code: str) -> int:
+        """Bit position for a permission code (interned on first use)"""
+        bit = self._bits.get(code)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(code, len(self._bits))
+                rows = self._rows
+            # Rota declarada depois da compilação: o curinga precisa cobrir o bit novo
+            if rows is not None and rows[-1]:
+                self._compile(*rows[:-1])
+        return bit
+
+    def required_mask(self, *codes: str) -> int:
+        """Mask with the bits of all codes set"""
+        mask = 0
+        for code in codes:
+            mask |= 1 << self.bit(code)
+        return mask
+
+    def codes_for_mask(self, mask: int) -> list[str]:
+        """Decode a mask back to permission codes"""
+        return [code for code, bit in self._bits.items() if mask >> bit & 1]
+
+    def load(
+        self,
+        roles: Iterable[tuple[str, str, str]],
+        permissions: Iterable[tuple[str, str, str]],
+        grants: Iterable[tuple[str, str]],
+        source_version: int = 0,
+        inherits: Iterable[tuple[str, str]] = (),
+    ) -> RbacCatalog:
+        """Compile (id, code, name) rows, (role_id, permission_id) grants and
+        (role_id, included_role_id) inheritance edges"""
+        return self._compile(
+            tuple(roles), tuple(permissions), tuple(grants), source_version, tuple(inherits)
+        )
+
+    def _compile(self, roles, permissions, grants, source_version, inherits) -> RbacCatalog:
+        role_infos = {r[0]: RoleInfo(id=r[0], code=r[1], name=r[2]) for r in roles}
+        permission_infos = {
+            p[0]: PermissionInfo(id=p[0], code=p[1], name=p[2]) for p in permissions
+        }
+        permissions_by_bit = {self.bit(p.code): p for p in permission_infos.values()}
+        role_masks = dict.fromkeys(role_infos, 0)
+        wildcards = WildcardTrie()
+        for role_id, permission_id in grants:
+            permission = permission_infos.get(permission_id)
+            if role_id in role_masks and permission is not None:
+                role_masks[role_id] |= 1 << self.bit(permission.code)
+                if is_wildcard(permission.code):
+                    wildcards.add(permission.code, role_id)
+
+        with self._lock:
+            if wildcards:
+                # Todos os códigos internados: do banco e os exigidos pelas rotas
+                for code, bit in self._bits.items():
+                    for role_id in wildcards.match(code):
+                        role_masks[role_id] |= 1 << bit
+            self._builds += 1
+            catalog = RbacCatalog(
+                version=self._builds,
+                source_version=source_version,
+                roles=role_infos,
+                permissions_by_bit=permissions_by_bit,
+                role_masks=flatten_inheritance(role_masks, inherits),
+            )
+            self._catalog = catalog
+            self._rows = (roles, permissions, grants, source_version, inherits, bool(wildcards))
+            self._checked_at = time.monotonic()
+        return catalog
+
+    def _needs_check(self, role_ids: tuple[str, ...] = ()) -> bool:
+        """True if not loaded, check interval elapsed or a role is unknown"""
+        catalog = self._catalog
+        if catalog is None or time.monotonic() - self._checked_at >= self.check_seconds:
+            return True
+        return not all(catalog.knows(role_id) for role_id in role_ids)
+
+    def _is_current(self, source_version: int | None, role_ids: tuple[str, ...]) -> bool:
+        catalog = self._catalog
+        return (
+            catalog is not None
+            and catalog.source_version == (source_version or 0)
+            and all(catalog.knows(role_id) for role_id in role_ids)
+        )
+
+    def refresh(self, db: Session, role_ids: tuple[str, ...] = ()) -> RbacCatalog:
+        """Reload from DB if the catalog version changed (sync)"""
+        source_version = db.execute(_VERSION_QUERY).scalar()
+        if self._is_current(source_version, role_ids):
+            self._checked_at = time.monotonic()
+            return self._catalog
+        catalog = self.load(
+            db.execute(_ROLES_QUERY).all(),
+            db.execute(_PERMISSIONS_QUERY).all(),
+            db.execute(_GRANTS_QUERY).all(),
+            source_version=source_version or 0,
+            inherits=db.execute(_INHERITANCE_QUERY).all(),
+        )
+        catalog.mark_unknown(role_ids)
+        return catalog
+
+    async def refresh_async(self, db: AsyncSession, role_ids: tuple[str, ...] = ()) -> RbacCatalog:
+        """Reload from DB if the catalog version changed (async)"""
+        source_version = (await db.execute(_VERSION_QUERY)).scalar()
+        if self._is_current(source_version, role_ids):
+            self._checked_at = time.monotonic()
+            return self._catalog
+        catalog = self.load(
+            (await db.execute(_ROLES_QUERY)).all(),
+            (await db.execute(_PERMISSIONS_QUERY)).all(),
+            (await db.execute(_GRANTS_QUERY)).all(),
+            source_version=source_version or 0,
+            inherits=(await db.execute(_INHERITANCE_QUERY)).all(),
+        )
+        catalog.mark_unknown(role_ids)
+        return catalog
+
+    async def ensure_fresh(
+        self,
+        db: Session | AsyncSession,
+        role_ids: tuple[str, ...] = (),
+    ) -> RbacCatalog:
+        """Catalog ready for use; only touches the DB when a check is due"""
+        if not self._needs_check(role_ids):
+            return self._catalog
+        if isinstance(db, AsyncSession):
+            return await self.refresh_async(db, role_ids)
+        return await run_in_threadpool(self.refresh, db, role_ids)
+
+    def expire(self) -> None:
+        """Check rbac_state on the next use (catalog change announced by another worker)"""
+        with self._lock:
+            self._checked_at = 0.0
+
+    def reset(self) -> None:
+        """Forget the compiled catalog (bit positions are kept)"""
+        with self._lock:
+            self._catalog = None
+            self._rows = None
+            self._checked_at = 0.0
+
+
+rbac_engine = RbacEngine(check_seconds=settings.rbac_version_check_seconds)
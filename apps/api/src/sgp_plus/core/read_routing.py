@@ -0,0 +1,97 @@
+"""Read-replica routing: which reads may go to DATABASE_REPLICA_URL.
+
+Leituras só de consulta (principal de sessão fora do cache, /auth/me,
+listagens de usuários) vão para a réplica; escritas ficam no primário. A
+réplica atrasa alguns ms a segundos, então:
+
+- resposta negativa da réplica (sessão não encontrada, usuário inativo) é
+  confirmada no primário antes de virar 401 — cobre o login recém-feito
+  atendido por outro worker;
+- sessão criada ou revogada aqui, ou anunciada por NOTIFY, fica "grudada" no
+  primário por REPLICA_STICK_SECONDS: a réplica ainda pode devolvê-la válida;
+- usuário alterado (desativado, roles) ou "*" grudam todas as leituras de
+  principal no primário pela mesma janela (não se sabe de antemão quais
+  sessões são dele).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+from sgp_plus.core.config import settings
+
+
+class ReadRouting:
+    """Per-session (and global) windows during which reads stay on the primary"""
+
+    def __init__(self, stick_seconds: float = 5.0, max_entries: int = 10_000, enabled: bool = True):
+        self.stick_seconds = stick_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._sticky: OrderedDict[UUID, float] = OrderedDict()
+        self._all_until = 0.0
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self.fallbacks = 0
+
+    def stick(self, session_ids: Iterable[UUID]) -> None:
+        """Keep these sessions' reads on the primary for stick_seconds"""
+        if not self.enabled:
+            return
+        deadline = time.monotonic() + self.stick_seconds
+        with self._lock:
+            for session_id in session_ids:
+                self._sticky[session_id] = deadline
+                self._sticky.move_to_end(session_id)
+            while len(self._sticky) > self.max_entries:
+                self._sticky.popitem(last=False)
+
+    def stick_all(self) -> None:
+        """Keep every principal read on the primary for stick_seconds"""
+        if self.enabled:
+            self._all_until = time.monotonic() + self.stick_seconds
+
+    def use_replica(self, session_id: UUID) -> bool:
+        """False while the session (or everything) is stuck to the primary"""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if now < self._all_until:
+            self.primary_reads += 1
+            return False
+        with self._lock:
+            deadline = self._sticky.get(session_id)
+            if deadline is not None:
+                if deadline > now:
+                    self.primary_reads += 1
+                    return False
+                del self._sticky[session_id]
+        self.replica_reads += 1
+        return True
+
+    def fell_back(self) -> None:
+        """A replica miss re-read on the primary"""
+        self.fallbacks += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sticky.clear()
+            self._all_until = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sticky_sessions": len(self._sticky),
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+            "fallbacks": self.fallbacks,
+        }
+
+
+read_routing = ReadRouting(
+    stick_seconds=settings.replica_stick_seconds,
+    enabled=settings.database_replica_url is not None,
+)
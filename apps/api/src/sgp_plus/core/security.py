@@ -1,23 +1,61 @@
 """Security utilities"""
-from typing import Annotated
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Annotated, Callable
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request, Response, status
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from sgp_plus.core.config import settings
-from sgp_plus.db.session import get_db
-from sgp_plus.db.models.user import User
-from sgp_plus.db.models.role import Role
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.rbac_engine import rbac_engine
+from sgp_plus.core.read_routing import read_routing
+from sgp_plus.core.session_activity import session_activity
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.core.session_tokens import (
+    SessionClaims,
+    revocation_filter,
+    sign_session_token,
+    verify_session_token,
+)
+from sgp_plus.db.session import get_async_db, get_async_read_db, get_db, get_read_db
+from sgp_plus.features.auth.repository import AsyncAuthRepository, AuthRepository
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_password_context(config=settings) -> CryptContext:
+    """CryptContext for PASSWORD_SCHEMES and the configured costs.
+
+    Esquemas além do primeiro ficam deprecated e custo diferente do configurado
+    (para mais ou para menos) também conta como desatualizado: needs_update
+    devolve True e o hash é regravado no próximo login.
+    """
+    schemes = config.password_schemes.split(",")
+    return CryptContext(
+        schemes=schemes,
+        default=schemes[0],
+        deprecated="auto",
+        bcrypt__rounds=config.password_bcrypt_rounds,
+        bcrypt__min_rounds=config.password_bcrypt_rounds,
+        bcrypt__max_rounds=config.password_bcrypt_rounds,
+        argon2__type="ID",
+        argon2__rounds=config.password_argon2_time_cost,
+        argon2__min_rounds=config.password_argon2_time_cost,
+        argon2__max_rounds=config.password_argon2_time_cost,
+        argon2__memory_cost=config.password_argon2_memory_cost,
+        argon2__parallelism=config.password_argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context()
 
 
 def hash_password(password: str) -> str:
     """Hash a password"""
     password_bytes = len(password.encode("utf-8"))
-    if password_bytes > 72:
+    if password_bytes > 72 and pwd_context.default_scheme() == "bcrypt":
         raise ValueError(
             "Password too long for bcrypt (max 72 bytes). "
             "Use a shorter password or adjust policy."
@@ -25,17 +63,52 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def load_password_backends() -> None:
+    """Load every configured scheme's backend now (import + passlib self-test),
+    instead of inside the first login"""
+    for scheme in pwd_context.schemes():
+        pwd_context.handler(scheme).get_backend()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def set_session_cookie(response: Response, session_id: UUID) -> None:
-    """Set HttpOnly session cookie"""
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password; on success also return a new hash if the stored one is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def session_cookie_value(principal: Principal) -> str:
+    """Cookie value for a principal: session UUID (opaque) or signed token"""
+    if settings.session_token_mode == "signed":
+        catalog = rbac_engine.catalog
+        return sign_session_token(principal, catalog.source_version if catalog else -1)
+    return str(principal.session_id)
+
+
+def session_id_from_cookie(value: str | None) -> UUID | None:
+    """Session UUID carried by a cookie value (signature checked, expiry ignored)"""
+    if not value:
+        return None
+    if settings.session_token_mode == "signed":
+        claims = verify_session_token(value, check_expiry=False)
+        return claims.session_id if claims else None
+    try:
+        return UUID(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def set_session_cookie(response: Response, value: UUID | str) -> None:
+    """Set HttpOnly session cookie (session UUID or signed token)"""
     max_age = settings.session_ttl_minutes * 60
     response.set_cookie(
         key=settings.cookie_name,
-        value=str(session_id),
+        value=str(value),
         max_age=max_age,
         httponly=True,
         secure=settings.cookie_secure,
@@ -55,51 +128,197 @@ def clear_session_cookie(response: Response) -> None:
         secure=settings.cookie_secure,
         samesite=settings.cookie_samesite,
     )
-def get_current_user(
-    request: Request,
-    db: Annotated[Session, Depends(get_db)],
-) -> User:
-    """Get current user from session cookie"""
-    session_id = request.cookies.get(settings.cookie_name)
 
-    if not session_id:
+
+def _read_session_cookie(request: Request) -> tuple[UUID, SessionClaims | None]:
+    """Session UUID (+ verified claims in signed mode) from cookie; 401 if missing or bad"""
+    value = request.cookies.get(settings.cookie_name)
+
+    if not value:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
 
+    if settings.session_token_mode == "signed":
+        claims = verify_session_token(value)
+        if claims is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+            )
+        return claims.session_id, claims
+
     try:
-        session_uuid = UUID(session_id)
+        return UUID(value), None
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
 
-    from sgp_plus.features.auth.repository import AuthRepository
 
-    repository = AuthRepository()
-    session = repository.get_valid_session(db, session_uuid)
+def _principal_from_claims(claims: SessionClaims) -> Principal | None:
+    """Token fast path (pure CPU); None when the RBAC version in the token is stale"""
+    if revocation_filter.is_revoked(claims.session_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or invalid",
+        )
+    catalog = rbac_engine.catalog
+    if catalog is not None and catalog.source_version == claims.rbac_version:
+        return claims.to_principal()
+    return None
 
-    if not session:
+
+def _cached_principal(session_uuid: UUID) -> Principal | None:
+    """Principal from the session cache (401 if known to be invalid)"""
+    principal = session_cache.get(session_uuid)
+    if principal is not None:
+        return principal
+    if session_cache.is_negative(session_uuid):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session expired or invalid",
         )
+    return None
+
 
-    user = (
-        db.query(User)
-        .filter(User.id == session.user_id)
-        .options(
-            selectinload(User.roles).selectinload(Role.permissions),
+def _accept_principal(session_uuid: UUID, principal: Principal | None) -> Principal:
+    """Validate the principal loaded from DB and cache it"""
+    if principal is None:
+        session_cache.put_negative(session_uuid)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or invalid",
         )
-        .first()
-    )
 
-    if not user or not user.is_active:
+    if not principal.is_active:
+        session_cache.put_negative(session_uuid)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    return user
+    session_cache.put(principal)
+    return principal
+
+
+def _track_activity(principal: Principal, response: Response) -> Principal:
+    """Record activity (write-behind) and slide cookie + cached expiry past half the TTL"""
+    now = datetime.utcnow()
+    session_activity.touch(principal.session_id, now)
+    if not settings.session_sliding_expiration or principal.session_expires_at is None:
+        return principal
+
+    ttl = timedelta(minutes=settings.session_ttl_minutes)
+    if principal.session_expires_at - now > ttl / 2:
+        return principal
+
+    # expires_at no banco é estendido pelo próximo flush de session_activity
+    principal = replace(principal, session_expires_at=now + ttl)
+    session_cache.put(principal)
+    set_session_cookie(response, session_cookie_value(principal))
+    return principal
+
+
+def _load_principal(db: Session, read_db: Session, session_uuid: UUID) -> Principal | None:
+    """Principal from the replica; a negative answer is confirmed on the primary"""
+    if read_db is db or not read_routing.use_replica(session_uuid):
+        return AuthRepository.get_principal(db, session_uuid)
+    principal = AuthRepository.get_principal(read_db, session_uuid)
+    if principal is None or not principal.is_active:
+        # Réplica atrasada: sessão recém-criada (ou usuário reativado) ainda não chegou
+        read_routing.fell_back()
+        principal = AuthRepository.get_principal(db, session_uuid)
+    return principal
+
+
+async def _load_principal_async(
+    db: AsyncSession, read_db: AsyncSession, session_uuid: UUID
+) -> Principal | None:
+    """Async variant of _load_principal"""
+    if read_db is db or not read_routing.use_replica(session_uuid):
+        return await AsyncAuthRepository.get_principal(db, session_uuid)
+    principal = await AsyncAuthRepository.get_principal(read_db, session_uuid)
+    if principal is None or not principal.is_active:
+        read_routing.fell_back()
+        principal = await AsyncAuthRepository.get_principal(db, session_uuid)
+    return principal
+
+
+def _reissued(principal: Principal, response: Response) -> Principal:
+    """Signed token with the principal just re-read (the old one predates a user change)"""
+    set_session_cookie(response, session_cookie_value(principal))
+    return principal
+
+
+def _resolve_principal(
+    request: Request, response: Response, db: Session, read_db: Session
+) -> Principal:
+    """Principal of the session cookie: token, cache, then DB (replica when configured)"""
+    session_uuid, claims = _read_session_cookie(request)
+    if claims is not None:
+        revocation_filter.ensure_fresh_sync(db)
+        if revocation_filter.is_stale(claims):
+            # Roles/is_active mudaram depois da emissão: cache e réplica podem ser
+            # tão velhos quanto o token, então relê do primário
+            principal = AuthRepository.get_principal(db, session_uuid)
+            return _reissued(_accept_principal(session_uuid, principal), response)
+        principal = _principal_from_claims(claims)
+        if principal is not None:
+            return principal
+
+    principal = _cached_principal(session_uuid)
+    if principal is not None:
+        return principal
+
+    return _accept_principal(session_uuid, _load_principal(db, read_db, session_uuid))
+
+
+async def _resolve_principal_async(
+    request: Request, response: Response, db: AsyncSession, read_db: AsyncSession
+) -> Principal:
+    """Async variant of _resolve_principal"""
+    session_uuid, claims = _read_session_cookie(request)
+    if claims is not None:
+        await revocation_filter.ensure_fresh(db)
+        if revocation_filter.is_stale(claims):
+            principal = await AsyncAuthRepository.get_principal(db, session_uuid)
+            return _reissued(_accept_principal(session_uuid, principal), response)
+        principal = _principal_from_claims(claims)
+        if principal is not None:
+            return principal
+
+    principal = _cached_principal(session_uuid)
+    if principal is not None:
+        return principal
+
+    principal = await _load_principal_async(db, read_db, session_uuid)
+    return _accept_principal(session_uuid, principal)
+
+
+def get_current_user(
+    request: Request,
+    response: Response,
+    db: Annotated[Session, Depends(get_db)],
+    read_db: Annotated[Session, Depends(get_read_db)],
+) -> Principal:
+    """Get current user from session cookie"""
+    return _track_activity(_resolve_principal(request, response, db, read_db), response)
+
+
+async def get_current_user_async(
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    read_db: Annotated[AsyncSession, Depends(get_async_read_db)],
+) -> Principal:
+    """Get current user from session cookie (DB_MODE=async)"""
+    principal = await _resolve_principal_async(request, response, db, read_db)
+    return _track_activity(principal, response)
+
+
+def get_current_user_dependency() -> Callable:
+    """Return the current-user dependency for the configured DB_MODE"""
+    return get_current_user_async if settings.db_mode == "async" else get_current_user
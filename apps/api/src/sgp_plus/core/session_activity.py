@@ -0,0 +1,144 @@
+"""Write-behind session activity (last_seen_at + sliding expiration).
+
+Cada requisição autenticada só grava em memória (session_id → último acesso);
+a cada SESSION_ACTIVITY_FLUSH_SECONDS o acumulado vira UPDATE ... FROM
+(VALUES ...) em lotes, uma linha por sessão, não importa quantas requisições
+ela fez no intervalo. Com SESSION_SLIDING_EXPIRATION o mesmo UPDATE empurra
+expires_at para último acesso + SESSION_TTL_MINUTES.
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Linhas por statement (limite de parâmetros e tamanho da transação)
+FLUSH_BATCH_SIZE = 1000
+
+
+class SessionActivity:
+    """Coalesces session activity in memory and flushes it in batches"""
+
+    def __init__(self, flush_seconds: float = 5.0):
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending: dict[UUID, datetime] = {}
+        self._flushed = 0
+
+    def touch(self, session_id: UUID, seen_at: datetime | None = None) -> None:
+        """Record activity (memory only; later touches overwrite earlier ones)"""
+        seen_at = seen_at or datetime.utcnow()
+        with self._lock:
+            self._pending[session_id] = seen_at
+
+    def _drain(self) -> list[tuple[UUID, datetime]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.items())
+
+    def _restore(self, rows: list[tuple[UUID, datetime]]) -> None:
+        """Put back rows of a failed flush (newer touches win)"""
+        with self._lock:
+            for session_id, seen_at in rows:
+                current = self._pending.get(session_id)
+                if current is None or current < seen_at:
+                    self._pending[session_id] = seen_at
+
+    def _statements(self, rows: list[tuple[UUID, datetime]]):
+        ttl = timedelta(minutes=settings.session_ttl_minutes)
+        now = datetime.utcnow()
+        for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+            batch = rows[start:start + FLUSH_BATCH_SIZE]
+            activity = values(
+                column("id", PGUUID(as_uuid=True)),
+                column("seen_at", DateTime()),
+                column("expires_at", DateTime()),
+                name="activity",
+            ).data([(session_id, seen_at, seen_at + ttl) for session_id, seen_at in batch])
+            changes = {"last_seen_at": activity.c.seen_at}
+            if settings.session_sliding_expiration:
+                changes["expires_at"] = func.greatest(
+                    SessionModel.expires_at, activity.c.expires_at
+                )
+            yield (
+                update(SessionModel)
+                .where(
+                    SessionModel.id == activity.c.id,
+                    SessionModel.revoked_at.is_(None),
+                    SessionModel.expires_at > now,
+                )
+                .values(**changes)
+                .execution_options(synchronize_session=False)
+            )
+
+    def flush(self, db: Session) -> int:
+        """Write pending activity (sync); returns sessions written"""
+        rows = self._drain()
+        if not rows:
+            return 0
+        try:
+            for statement in self._statements(rows):
+                db.execute(statement)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self._restore(rows)
+            raise
+        self._flushed += len(rows)
+        return len(rows)
+
+    async def flush_async(self, db: AsyncSession) -> int:
+        """Write pending activity (async); returns sessions written"""
+        rows = self._drain()
+        if not rows:
+            return 0
+        try:
+            for statement in self._statements(rows):
+                await db.execute(statement)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            self._restore(rows)
+            raise
+        self._flushed += len(rows)
+        return len(rows)
+
+    def flush_once(self) -> int:
+        """Flush on a fresh session (lifespan task / shutdown)"""
+        db = SessionLocal()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    async def run_forever(self) -> None:
+        """Lifespan task: flush every flush_seconds off the event loop"""
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await asyncio.to_thread(self.flush_once)
+            except Exception:
+                logger.exception("session activity: falha ao gravar last_seen_at")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pending": len(self._pending), "flushed": self._flushed}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+
+session_activity = SessionActivity(flush_seconds=settings.session_activity_flush_seconds)
@@ -0,0 +1,159 @@
+"""In-process TTL/LRU cache of validated sessions.
+
+Chave: UUID da sessão (cookie). Valor: Principal já resolvido. Com o cache
+quente, get_current_user não faz nenhuma query.
+
+- TTL = min(SESSION_CACHE_TTL_SECONDS, tempo restante até expires_at)
+- revoke_session/logout invalida na hora (AuthRepository); nos outros workers
+  via LISTEN/NOTIFY (core/invalidation)
+- cache negativo (TTL curto) para sessões desconhecidas/revogadas/expiradas,
+  para que cookies inválidos não martelem o Postgres
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from uuid import UUID
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.principal import Principal
+
+
+class SessionCache:
+    """Bounded LRU of session → Principal with a negative side-cache"""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 30.0,
+        negative_max_entries: int = 10_000,
+        negative_ttl_seconds: float = 10.0,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_max_entries = negative_max_entries
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[UUID, tuple[Principal, float]] = OrderedDict()
+        self._negative: OrderedDict[UUID, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, session_id: UUID) -> Principal | None:
+        """Cached principal, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                principal, deadline = entry
+                if deadline > now:
+                    self._entries.move_to_end(session_id)
+                    self.hits += 1
+                    return principal
+                del self._entries[session_id]
+            self.misses += 1
+            return None
+
+    def is_negative(self, session_id: UUID) -> bool:
+        """True if session_id was recently looked up and found invalid"""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            deadline = self._negative.get(session_id)
+            if deadline is None:
+                return False
+            if deadline <= now:
+                del self._negative[session_id]
+                return False
+            self.negative_hits += 1
+            return True
+
+    def put(self, principal: Principal) -> None:
+        """Cache principal until min(ttl, session expiry)"""
+        if not self.enabled or principal.session_id is None:
+            return
+        ttl = self.ttl_seconds
+        if principal.session_expires_at is not None:
+            remaining = (principal.session_expires_at - datetime.utcnow()).total_seconds()
+            ttl = min(ttl, remaining)
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            # Revogada enquanto a query estava em voo: não ressuscitar
+            if self._negative.get(principal.session_id, 0.0) > now:
+                return
+            self._entries[principal.session_id] = (principal, now + ttl)
+            self._entries.move_to_end(principal.session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_negative(self, session_id: UUID) -> None:
+        """Remember that session_id is invalid for a short while"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._negative[session_id] = time.monotonic() + self.negative_ttl_seconds
+            self._negative.move_to_end(session_id)
+            while len(self._negative) > self.negative_max_entries:
+                self._negative.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, session_id: UUID) -> None:
+        """Drop a session immediately (logout/revoke); later lookups hit the negative cache"""
+        with self._lock:
+            if self._entries.pop(session_id, None) is not None:
+                self.invalidations += 1
+        self.put_negative(session_id)
+
+    def invalidate_users(self, user_ids: set[UUID]) -> int:
+        """Drop every cached session of these users (one pass); returns how many"""
+        with self._lock:
+            stale = [
+                session_id
+                for session_id, (principal, _) in self._entries.items()
+                if principal.id in user_ids
+            ]
+            for session_id in stale:
+                del self._entries[session_id]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop everything (tests, catalog changes)"""
+        with self._lock:
+            self._entries.clear()
+            self._negative.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "negative_size": len(self._negative),
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+session_cache = SessionCache(
+    max_entries=settings.session_cache_max_entries,
+    ttl_seconds=settings.session_cache_ttl_seconds,
+    negative_max_entries=settings.session_cache_negative_max_entries,
+    negative_ttl_seconds=settings.session_cache_negative_ttl_seconds,
+    enabled=settings.session_cache_enabled,
+)
@@ -0,0 +1,272 @@
+"""Signed session tokens (SESSION_TOKEN_MODE=signed) and revocation filter.
+
+O cookie carrega um payload assinado com HMAC-SHA256 (sessão, usuário,
+expiração, versão RBAC, roles) que get_current_user valida só com CPU.
+Revogação continua server-side: um conjunto compacto de sessões revogadas e
+ainda não expiradas fica em memória, sincronizado incrementalmente com a
+tabela sessions a cada REVOCATION_SYNC_SECONDS (e atualizado na hora quando
+o próprio worker revoga).
+
+Roles e is_active no token envelhecem: usuário desativado ou com roles
+alteradas ganha um "not before" (users.access_changed_at, trigger da migration
+0009), sincronizado junto com as revogações. Token emitido antes disso não vale
+como principal e cai no caminho do cache/banco, que relê o usuário.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.principal import Principal
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.models.user import User
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PREFIX = "v1"
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Tolerância para relógios diferentes entre workers ao gravar revoked_at
+_WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+@dataclass(frozen=True, slots=True)
+class SessionClaims:
+    """Verified token payload"""
+
+    session_id: UUID
+    user_id: UUID
+    expires_at: datetime
+    rbac_version: int
+    role_ids: tuple[str, ...]
+    email: str
+    created_at: datetime
+    # Tokens v1 antigos não trazem: _EPOCH (anterior a qualquer mudança)
+    issued_at: datetime = _EPOCH
+
+    def to_principal(self) -> Principal:
+        return Principal(
+            id=self.user_id,
+            email=self.email,
+            is_active=True,
+            created_at=self.created_at,
+            role_ids=self.role_ids,
+            session_id=self.session_id,
+            session_expires_at=self.expires_at,
+        )
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(payload: str) -> str:
+    key = settings.session_token_secret.encode("utf-8")
+    return _b64encode(hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def sign_session_token(principal: Principal, rbac_version: int) -> str:
+    """Issue a signed token for a principal with an open session"""
+    payload = _b64encode(
+        json.dumps(
+            [
+                principal.session_id.hex,
+                principal.id.hex,
+                int((principal.session_expires_at - _EPOCH).total_seconds()),
+                rbac_version,
+                list(principal.role_ids),
+                principal.email,
+                principal.created_at.isoformat(),
+                int((datetime.utcnow() - _EPOCH).total_seconds()),
+            ],
+            separators=(",", ":"),
+        ).encode("utf-8")
+    )
+    return f"{TOKEN_PREFIX}.{payload}.{_signature(payload)}"
+
+
+def verify_session_token(token: str, *, check_expiry: bool = True) -> SessionClaims | None:
+    """Claims of a token with a valid signature (and not expired), else None"""
+    # Cookie vem do header em latin-1: byte fora do base64 não chega ao HMAC
+    if not token.isascii():
+        return None
+    try:
+        prefix, payload, signature = token.split(".")
+    except ValueError:
+        return None
+    if prefix != TOKEN_PREFIX or not hmac.compare_digest(signature, _signature(payload)):
+        return None
+    try:
+        sid, uid, exp, rbac_version, role_ids, email, created_at, *iat = json.loads(
+            _b64decode(payload)
+        )
+        claims = SessionClaims(
+            session_id=UUID(sid),
+            user_id=UUID(uid),
+            expires_at=_EPOCH + timedelta(seconds=exp),
+            rbac_version=int(rbac_version),
+            role_ids=tuple(role_ids),
+            email=email,
+            created_at=datetime.fromisoformat(created_at),
+            issued_at=_EPOCH + timedelta(seconds=iat[0]) if iat else _EPOCH,
+        )
+    except (ValueError, TypeError):
+        return None
+    if check_expiry and claims.expires_at <= datetime.utcnow():
+        return None
+    return claims
+
+
+class RevocationFilter:
+    """Revoked, not-yet-expired session ids and per-user "not before" times,
+    kept in sync with the sessions and users tables"""
+
+    def __init__(self, sync_seconds: float = 5.0):
+        self.sync_seconds = sync_seconds
+        self._lock = threading.Lock()
+        self._revoked: dict[UUID, datetime] = {}
+        self._watermark: datetime | None = None
+        # user_id → access_changed_at: tokens emitidos até aí têm roles/is_active velhos
+        self._users: dict[UUID, datetime] = {}
+        self._users_watermark: datetime | None = None
+        self._synced_at = 0.0
+
+    def is_revoked(self, session_id: UUID) -> bool:
+        return session_id in self._revoked
+
+    def is_stale(self, claims: SessionClaims) -> bool:
+        """True if the user's roles/activation changed since the token was issued"""
+        changed_at = self._users.get(claims.user_id)
+        # issued_at tem resolução de segundos: no mesmo segundo, conta como velho
+        return changed_at is not None and claims.issued_at <= changed_at
+
+    def users_changed(self, user_ids, changed_at: datetime | None = None) -> None:
+        """Record a role/activation change (tokens issued until changed_at are stale)"""
+        changed_at = changed_at or datetime.utcnow()
+        with self._lock:
+            for user_id in user_ids:
+                previous = self._users.get(user_id)
+                if previous is None or changed_at > previous:
+                    self._users[user_id] = changed_at
+
+    def add(self, session_id: UUID, expires_at: datetime | None = None) -> None:
+        """Record a revocation done by this worker (visible immediately)"""
+        if expires_at is None:
+            expires_at = datetime.utcnow() + timedelta(minutes=settings.session_ttl_minutes)
+        with self._lock:
+            self._revoked[session_id] = expires_at
+
+    def needs_sync(self) -> bool:
+        return time.monotonic() - self._synced_at >= self.sync_seconds
+
+    def _query(self):
+        now = datetime.utcnow()
+        conditions = [SessionModel.revoked_at.is_not(None), SessionModel.expires_at > now]
+        if self._watermark is not None:
+            conditions.append(SessionModel.revoked_at >= self._watermark - _WATERMARK_OVERLAP)
+        return select(SessionModel.id, SessionModel.expires_at, SessionModel.revoked_at).where(
+            and_(*conditions)
+        )
+
+    def _users_query(self):
+        # Token mais velho ainda válido foi emitido há no máximo um TTL
+        since = datetime.utcnow() - timedelta(minutes=settings.session_ttl_minutes)
+        if self._users_watermark is not None:
+            since = max(since, self._users_watermark - _WATERMARK_OVERLAP)
+        return select(User.id, User.access_changed_at).where(User.access_changed_at >= since)
+
+    def _apply(self, rows, user_rows) -> None:
+        now = datetime.utcnow()
+        token_horizon = now - timedelta(minutes=settings.session_ttl_minutes)
+        with self._lock:
+            for session_id, expires_at, revoked_at in rows:
+                self._revoked[session_id] = expires_at
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+            if self._watermark is None:
+                self._watermark = now
+            for session_id in [s for s, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[session_id]
+
+            for user_id, changed_at in user_rows:
+                previous = self._users.get(user_id)
+                if previous is None or changed_at > previous:
+                    self._users[user_id] = changed_at
+                if self._users_watermark is None or changed_at > self._users_watermark:
+                    self._users_watermark = changed_at
+            if self._users_watermark is None:
+                self._users_watermark = now
+            # Todo token emitido antes da mudança já expirou
+            for user_id in [u for u, at in self._users.items() if at <= token_horizon]:
+                del self._users[user_id]
+            self._synced_at = time.monotonic()
+
+    def sync(self, db: Session) -> None:
+        """Pull revocations and user changes since the last watermarks (sync)"""
+        self._apply(db.execute(self._query()).all(), db.execute(self._users_query()).all())
+
+    async def sync_async(self, db: AsyncSession) -> None:
+        """Pull revocations and user changes since the last watermarks (async)"""
+        rows = (await db.execute(self._query())).all()
+        self._apply(rows, (await db.execute(self._users_query())).all())
+
+    def ensure_fresh_sync(self, db: Session) -> None:
+        """Sync when due; on DB errors keep serving the last known set"""
+        if not self.needs_sync():
+            return
+        try:
+            self.sync(db)
+        except Exception:
+            logger.exception("revocation filter: falha ao sincronizar com sessions")
+            db.rollback()
+            self._synced_at = time.monotonic()
+
+    async def ensure_fresh(self, db: Session | AsyncSession) -> None:
+        """Async variant of ensure_fresh_sync (Session runs in the threadpool)"""
+        if not self.needs_sync():
+            return
+        if not isinstance(db, AsyncSession):
+            await run_in_threadpool(self.ensure_fresh_sync, db)
+            return
+        try:
+            await self.sync_async(db)
+        except Exception:
+            logger.exception("revocation filter: falha ao sincronizar com sessions")
+            await db.rollback()
+            self._synced_at = time.monotonic()
+
+    def expire(self) -> None:
+        """Sync on the next check (notifications may have been missed)"""
+        self._synced_at = 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._watermark = None
+            self._users.clear()
+            self._users_watermark = None
+            self._synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocation_filter = RevocationFilter(sync_seconds=settings.revocation_sync_seconds)
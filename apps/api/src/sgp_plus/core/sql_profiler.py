@@ -0,0 +1,210 @@
+"""Per-request SQL profiler with N+1 detection.
+
+Ativado para toda requisição com SQL_PROFILE_ENABLED (resumo no log) ou por
+requisição com o header X-SQL-Profile: 1 — neste caso o resumo volta no header
+de resposta X-SQL-Profile, mas só se o usuário tiver rbac.manage. Cada
+statement é registrado com duração e call site (primeiro frame do sgp_plus
+fora deste módulo); o mesmo "formato" de SQL repetido N+ vezes é marcado
+como N+1.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from sgp_plus.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-SQL-Profile"
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent.parent)
+_SKIP_FILES = (__file__, str(Path(__file__).with_name("metrics.py")))
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with IN lists collapsed (same shape = same query, other params)"""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("IN (...)", statement)).strip()
+
+
+def _call_site() -> str:
+    """file:line function of the first sgp_plus frame outside the profiler"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PACKAGE_DIR) and filename not in _SKIP_FILES:
+            relative = filename[len(_PACKAGE_DIR) + 1:]
+            return f"{relative}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+@dataclass(slots=True)
+class ProfiledStatement:
+    """One statement executed while profiling"""
+
+    shape: str
+    seconds: float
+    call_site: str
+
+
+@dataclass
+class SqlProfile:
+    """Statements of one request (or one test block)"""
+
+    n_plus_one_threshold: int = 3
+    statements: list[ProfiledStatement] = field(default_factory=list)
+    # Header só é devolvido para quem tem rbac.manage (marcado pelo RBAC)
+    authorized: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: ProfiledStatement) -> None:
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(s.seconds for s in self.statements)
+
+    def repeated(self) -> list[tuple[str, int, str]]:
+        """(shape, count, first call site) of shapes run n_plus_one_threshold+ times"""
+        counts = Counter(s.shape for s in self.statements)
+        sites: dict[str, str] = {}
+        for s in self.statements:
+            sites.setdefault(s.shape, s.call_site)
+        return [
+            (shape, count, sites[shape])
+            for shape, count in counts.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+    def summary(self) -> str:
+        """Short one-line summary (response header)"""
+        return (
+            f"statements={len(self.statements)}; "
+            f"time_ms={self.total_seconds * 1000:.1f}; "
+            f"n_plus_one={len(self.repeated())}"
+        )
+
+    def report(self) -> str:
+        """Multi-line report: every statement with duration and call site"""
+        lines = [self.summary()]
+        for s in self.statements:
+            lines.append(f"  {s.seconds * 1000:8.2f}ms  {s.call_site}  {s.shape[:160]}")
+        for shape, count, site in self.repeated():
+            lines.append(f"  N+1: {count}x at {site}: {shape[:160]}")
+        return "\n".join(lines)
+
+
+_current: ContextVar[SqlProfile | None] = ContextVar("sgp_sql_profile", default=None)
+# Perfis globais (todas as threads): usados por testes, onde o app roda em outra thread
+_global: list[SqlProfile] = []
+
+
+def _active() -> list[SqlProfile]:
+    current = _current.get()
+    if current is None:
+        return _global
+    return [current, *_global] if _global else [current]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None or _global:
+        context._sgp_profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sgp_profile_started", None)
+    if started is None:
+        return
+    profiled = ProfiledStatement(
+        shape=statement_shape(statement),
+        seconds=time.perf_counter() - started,
+        call_site=_call_site(),
+    )
+    for profile in _active():
+        profile.record(profiled)
+
+
+def profile_engine(engine: Engine) -> None:
+    """Feed active profiles from a (sync) engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def mark_authorized(is_admin: bool) -> None:
+    """Called by RBAC once the caller's permissions are known"""
+    profile = _current.get()
+    if profile is not None and is_admin:
+        profile.authorized = True
+
+
+@contextmanager
+def capture(n_plus_one_threshold: int | None = None):
+    """Profile every statement on any thread while the block runs"""
+    profile = SqlProfile(
+        n_plus_one_threshold=n_plus_one_threshold or settings.sql_profile_n_plus_one_threshold
+    )
+    _global.append(profile)
+    try:
+        yield profile
+    finally:
+        _global.remove(profile)
+
+
+class SqlProfilerMiddleware:
+    """ASGI middleware: opens a profile per request and reports it"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = any(
+            name == b"x-sql-profile" and value == b"1" for name, value in scope["headers"]
+        )
+        if not (requested or settings.sql_profile_enabled):
+            await self.app(scope, receive, send)
+            return
+
+        profile = SqlProfile(n_plus_one_threshold=settings.sql_profile_n_plus_one_threshold)
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start" and requested and profile.authorized:
+                headers = list(message.get("headers", []))
+                headers.append((HEADER.lower().encode(), profile.summary().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current.reset(token)
+            _log_profile(scope, profile)
+
+
+def _log_profile(scope, profile: SqlProfile) -> None:
+    """Log the report (N+1 as warning); header-only profiles log just for admins"""
+    if not (settings.sql_profile_enabled or profile.authorized):
+        return
+    if profile.repeated():
+        logger.warning("N+1 em %s %s\n%s", scope["method"], scope["path"], profile.report())
+    elif settings.sql_profile_enabled:
+        logger.info("SQL em %s %s\n%s", scope["method"], scope["path"], profile.report())
@@ -4,6 +4,17 @@ from sgp_plus.db.models.user import User
 from sgp_plus.db.models.role import Role
 from sgp_plus.db.models.permission import Permission
 from sgp_plus.db.models.session import Session
+from sgp_plus.db.models.rbac_state import RbacState
+from sgp_plus.db.models.auth_event import AuthEvent
 from sgp_plus.db.models.associations import user_roles, role_permissions
 
-__all__ = ["User", "Role", "Permission", "Session", "user_roles", "role_permissions"]
+__all__ = [
+    "User",
+    "Role",
+    "Permission",
+    "Session",
+    "RbacState",
+    "AuthEvent",
+    "user_roles",
+    "role_permissions",
+]
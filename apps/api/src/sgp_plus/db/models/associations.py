@@ -1,6 +1,6 @@
 """Association tables for many-to-many relationships"""
 
-from sqlalchemy import Column, ForeignKey, String, Table
+from sqlalchemy import Column, ForeignKey, Index, String, Table
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 
 from sgp_plus.db.base import Base
@@ -11,6 +11,8 @@ user_roles = Table(
     Base.metadata,
     Column("user_id", PGUUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
     Column("role_id", String(50), ForeignKey("roles.id"), primary_key=True),
+    # PK começa por user_id; filtro de usuários por role parte do role_id
+    Index("ix_user_roles_role_id", "role_id", "user_id"),
 )
 
 # Role-Permission association
@@ -20,3 +22,16 @@ role_permissions = Table(
     Column("role_id", String(50), ForeignKey("roles.id"), primary_key=True),
     Column("permission_id", String(50), ForeignKey("permissions.id"), primary_key=True),
 )
+
+# Role-Role inheritance (role_id inclui todas as permissões de included_role_id)
+role_inheritance = Table(
+    "role_inheritance",
+    Base.metadata,
+    Column("role_id", String(50), ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    Column(
+        "included_role_id",
+        String(50),
+        ForeignKey("roles.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+)
@@ -0,0 +1,31 @@
+"""Auth event model (audit trail)"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, String
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+
+from sgp_plus.db.base import Base
+
+
+class AuthEvent(Base):
+    """Authentication/authorization event (login, logout, 403)
+
+    Só acrescentado, em lote, pelo core/audit. Sem FK para users/sessions: o
+    registro sobrevive à remoção do usuário e não custa checagem no INSERT.
+    """
+
+    __tablename__ = "auth_events"
+    __table_args__ = (
+        Index("ix_auth_events_user_id_occurred_at", "user_id", "occurred_at"),
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    kind = Column(String(32), nullable=False)  # login_success|login_failure|logout|forbidden
+    user_id = Column(PGUUID(as_uuid=True), nullable=True)
+    session_id = Column(PGUUID(as_uuid=True), nullable=True)
+    email = Column(String(255), nullable=True)
+    ip = Column(String(45), nullable=True)
+    user_agent = Column(String(512), nullable=True)
+    detail = Column(String(255), nullable=True)
@@ -0,0 +1,19 @@
+"""RBAC state model"""
+
+from sqlalchemy import BigInteger, Column, Integer
+
+from sgp_plus.db.base import Base
+
+
+class RbacState(Base):
+    """Linha única com a versão do catálogo RBAC.
+
+    Incrementada por trigger (migration 0002) a cada mudança em roles,
+    permissions ou role_permissions; os workers comparam com a versão
+    carregada para recompilar as máscaras sem restart.
+    """
+
+    __tablename__ = "rbac_state"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
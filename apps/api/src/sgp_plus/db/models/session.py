@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 
@@ -14,12 +14,21 @@ class Session(Base):
     """Session model"""
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Filtro de revogação (modo signed) lê só as sessões revogadas
+        Index(
+            "ix_sessions_revoked_at",
+            "revoked_at",
+            postgresql_where=Column("revoked_at").is_not(None),
+        ),
+    )
 
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(PGUUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     expires_at = Column(DateTime, nullable=False, index=True)
     revoked_at = Column(DateTime, nullable=True)
+    last_seen_at = Column(DateTime, nullable=True)
     user_agent = Column(String(512), nullable=True)
     ip = Column(String(45), nullable=True)
 
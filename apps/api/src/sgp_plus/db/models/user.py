@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, String
+from sqlalchemy import Boolean, Column, DateTime, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 
@@ -14,12 +14,32 @@ class User(Base):
     """User model"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Listagem por keyset (GET /users): ordenação e filtro por is_active
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+        # Filtro por prefixo de email (LIKE 'x%' independe da collation)
+        Index(
+            "ix_users_email_prefix",
+            "email",
+            postgresql_ops={"email": "text_pattern_ops"},
+        ),
+        # Sincronização do filtro de revogação (só linhas com mudança)
+        Index(
+            "ix_users_access_changed_at",
+            "access_changed_at",
+            postgresql_where=text("access_changed_at IS NOT NULL"),
+        ),
+    )
 
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Última mudança de is_active/email/roles (triggers da migration 0009): token
+    # assinado emitido antes disso não vale como principal (core/session_tokens)
+    access_changed_at = Column(DateTime, nullable=True)
 
     # Relationships
     roles = relationship("Role", secondary="user_roles", back_populates="users")
@@ -0,0 +1,120 @@
+"""Connection pool configuration and instrumentation"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from sgp_plus.core.config import Settings
+
+
+class PoolMetrics:
+    """Counters for one engine's pool (checkouts, wait, invalidations)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._checkins = 0
+        self._connects = 0
+        self._invalidations = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._wait_total += seconds
+            if seconds > self._wait_max:
+                self._wait_max = seconds
+            if timed_out:
+                self._timeouts += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self._checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self._invalidations += 1
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to pool events of a (sync) engine"""
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_invalidate)
+
+    def stats(self, pool: Pool) -> dict:
+        """Counters plus current pool occupancy"""
+        with self._lock:
+            checkouts = self._checkouts
+            stats = {
+                "checkouts": checkouts,
+                "checkins": self._checkins,
+                "connects": self._connects,
+                "invalidations": self._invalidations,
+                "timeouts": self._timeouts,
+                "wait_ms_total": round(self._wait_total * 1000, 3),
+                "wait_ms_avg": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+class _TimedCheckoutMixin:
+    """Measures how long a checkout waits for a free connection (QueuePool._do_get)"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def instrumented_pool_class(metrics: PoolMetrics, *, is_async: bool = False) -> type[Pool]:
+    """QueuePool subclass bound to metrics (class attribute survives pool.recreate())"""
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(f"Instrumented{base.__name__}", (_TimedCheckoutMixin, base), {"metrics": metrics})
+
+
+def engine_options(config: Settings, metrics: PoolMetrics, *, is_async: bool = False) -> dict:
+    """create_engine/create_async_engine kwargs for the configured pool"""
+    options = {
+        "poolclass": instrumented_pool_class(metrics, is_async=is_async),
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+    }
+    if config.db_statement_timeout_ms:
+        # Aplicado pelo servidor em toda conexão nova (psycopg repassa "options")
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={config.db_statement_timeout_ms}"
+        }
+    return options
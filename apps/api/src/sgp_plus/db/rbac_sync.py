@@ -0,0 +1,321 @@
+"""Declarative RBAC catalog sync.
+
+Compara o catálogo (rbac_catalog.toml) com o banco e aplica só o que mudou,
+numa transação e com statements por conjunto: um INSERT ... ON CONFLICT para
+permissões, um para roles, um para grants novos e um DELETE para grants que
+saíram (idem para a herança entre roles) — não importa quantas permissões o
+catálogo tenha. No fim a versão em
+rbac_state é incrementada para os workers recompilarem o catálogo.
+
+    python -m sgp_plus.db.rbac_sync --dry-run
+    python -m sgp_plus.db.rbac_sync --catalog outro.toml --prune
+"""
+
+import argparse
+import sys
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.rbac_engine import is_wildcard
+from sgp_plus.db.models.associations import role_inheritance, role_permissions, user_roles
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.rbac_state import RbacState
+from sgp_plus.db.models.role import Role
+
+DEFAULT_CATALOG = Path(__file__).with_name("rbac_catalog.toml")
+
+# Dois deploys sincronizando ao mesmo tempo: o segundo espera o primeiro
+_SYNC_LOCK_KEY = 0x5C9_4BAC
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    """Parsed catalog: permission code → name, role code → (name, permission codes),
+    role code → included role codes"""
+
+    permissions: dict[str, str]
+    roles: dict[str, tuple[str, frozenset[str]]]
+    includes: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    @property
+    def grants(self) -> set[tuple[str, str]]:
+        return {(role, perm) for role, (_, perms) in self.roles.items() for perm in perms}
+
+    @property
+    def inherits(self) -> set[tuple[str, str]]:
+        return {(role, included) for role, codes in self.includes.items() for included in codes}
+
+
+@dataclass
+class RbacDiff:
+    """Changes needed to make the DB match a catalog"""
+
+    permissions_added: dict[str, str] = field(default_factory=dict)
+    permissions_renamed: dict[str, tuple[str, str]] = field(default_factory=dict)
+    roles_added: dict[str, str] = field(default_factory=dict)
+    roles_renamed: dict[str, tuple[str, str]] = field(default_factory=dict)
+    grants_added: set[tuple[str, str]] = field(default_factory=set)
+    grants_removed: set[tuple[str, str]] = field(default_factory=set)
+    inherits_added: set[tuple[str, str]] = field(default_factory=set)
+    inherits_removed: set[tuple[str, str]] = field(default_factory=set)
+    # Só no banco: removidas apenas com prune
+    permissions_unmanaged: set[str] = field(default_factory=set)
+    roles_unmanaged: set[str] = field(default_factory=set)
+
+    def is_empty(self, prune: bool = False) -> bool:
+        managed = (
+            self.permissions_added or self.permissions_renamed or self.roles_added
+            or self.roles_renamed or self.grants_added or self.grants_removed
+            or self.inherits_added or self.inherits_removed
+        )
+        return not managed and not (
+            prune and (self.permissions_unmanaged or self.roles_unmanaged)
+        )
+
+    def lines(self, prune: bool = False) -> list[str]:
+        """Human-readable diff (+ added, ~ renamed, - removed, ? unmanaged)"""
+        out = [
+            f"+ permission {code} ({name})"
+            for code, name in sorted(self.permissions_added.items())
+        ]
+        out += [
+            f"~ permission {code}: {old!r} → {new!r}"
+            for code, (old, new) in sorted(self.permissions_renamed.items())
+        ]
+        out += [f"+ role {code} ({name})" for code, name in sorted(self.roles_added.items())]
+        out += [
+            f"~ role {code}: {old!r} → {new!r}"
+            for code, (old, new) in sorted(self.roles_renamed.items())
+        ]
+        out += [f"+ grant {role} → {perm}" for role, perm in sorted(self.grants_added)]
+        out += [f"- grant {role} → {perm}" for role, perm in sorted(self.grants_removed)]
+        out += [f"+ include {role} → {inc}" for role, inc in sorted(self.inherits_added)]
+        out += [f"- include {role} → {inc}" for role, inc in sorted(self.inherits_removed)]
+        mark = "-" if prune else "?"
+        out += [f"{mark} permission {code}" for code in sorted(self.permissions_unmanaged)]
+        out += [f"{mark} role {code}" for code in sorted(self.roles_unmanaged)]
+        return out
+
+
+def _check_acyclic(includes: dict[str, frozenset[str]]) -> None:
+    """ValueError naming a role that (transitively) includes itself"""
+    done: set[str] = set()
+
+    def visit(code: str, path: tuple[str, ...]) -> None:
+        if code in path:
+            cycle = " → ".join((*path[path.index(code):], code))
+            raise ValueError(f"herança de roles em ciclo: {cycle}")
+        if code in done:
+            return
+        for included in sorted(includes.get(code, ())):
+            visit(included, (*path, code))
+        done.add(code)
+
+    for code in sorted(includes):
+        visit(code, ())
+
+
+def load_catalog(path: Path = DEFAULT_CATALOG) -> CatalogSpec:
+    """Read and validate a TOML catalog (grants must reference declared permissions,
+    includes must reference declared roles and form a DAG)"""
+    with path.open("rb") as source:
+        data = tomllib.load(source)
+
+    permissions = {str(code): str(name) for code, name in data.get("permissions", {}).items()}
+    roles: dict[str, tuple[str, frozenset[str]]] = {}
+    includes: dict[str, frozenset[str]] = {}
+    for code, role in data.get("roles", {}).items():
+        granted = frozenset(role.get("permissions", ()))
+        unknown = sorted(granted - permissions.keys())
+        if unknown:
+            raise ValueError(f"role {code}: permissões não declaradas: {', '.join(unknown)}")
+        roles[str(code)] = (str(role.get("name", code)), granted)
+        if role.get("includes"):
+            includes[str(code)] = frozenset(map(str, role["includes"]))
+
+    for code, included in includes.items():
+        unknown = sorted(included - roles.keys())
+        if unknown:
+            raise ValueError(f"role {code}: inclui roles não declaradas: {', '.join(unknown)}")
+    _check_acyclic(includes)
+
+    for code in (*permissions, *roles):
+        if len(code) > 50:
+            raise ValueError(f"código maior que 50 caracteres: {code}")
+        if "*" in code and (code in roles or not is_wildcard(code)):
+            raise ValueError(f"curinga só no fim de um código de permissão: {code}")
+    return CatalogSpec(permissions=permissions, roles=roles, includes=includes)
+
+
+def diff_catalog(db: Session, spec: CatalogSpec) -> RbacDiff:
+    """Diff a catalog against the DB (four reads)"""
+    db_permissions = dict(db.execute(select(Permission.id, Permission.name)).all())
+    db_roles = dict(db.execute(select(Role.id, Role.name)).all())
+    db_grants = set(
+        db.execute(select(role_permissions.c.role_id, role_permissions.c.permission_id)).all()
+    )
+
+    db_inherits = set(
+        db.execute(select(role_inheritance.c.role_id, role_inheritance.c.included_role_id)).all()
+    )
+
+    result = RbacDiff()
+    for code, name in spec.permissions.items():
+        if code not in db_permissions:
+            result.permissions_added[code] = name
+        elif db_permissions[code] != name:
+            result.permissions_renamed[code] = (db_permissions[code], name)
+    for code, (name, _) in spec.roles.items():
+        if code not in db_roles:
+            result.roles_added[code] = name
+        elif db_roles[code] != name:
+            result.roles_renamed[code] = (db_roles[code], name)
+
+    wanted = spec.grants
+    result.grants_added = wanted - db_grants
+    # Roles do catálogo têm exatamente os grants declarados
+    result.grants_removed = {g for g in db_grants - wanted if g[0] in spec.roles}
+    wanted = spec.inherits
+    result.inherits_added = wanted - db_inherits
+    result.inherits_removed = {i for i in db_inherits - wanted if i[0] in spec.roles}
+    result.permissions_unmanaged = db_permissions.keys() - spec.permissions.keys()
+    result.roles_unmanaged = db_roles.keys() - spec.roles.keys()
+    return result
+
+
+def _upsert(table, rows: dict[str, str]):
+    """INSERT ... ON CONFLICT (id) DO UPDATE SET name (id = code)"""
+    statement = pg_insert(table).values(
+        [{"id": code, "code": code, "name": name} for code, name in sorted(rows.items())]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["id"], set_={"name": statement.excluded.name}
+    )
+
+
+def _bump_version(db: Session) -> None:
+    """rbac_state.version + 1 (row created if missing, e.g. DB from create_all)"""
+    statement = pg_insert(RbacState).values(id=1, version=1)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["id"], set_={"version": RbacState.version + 1}
+        )
+    )
+
+
+def sync_catalog(
+    db: Session, spec: CatalogSpec, *, dry_run: bool = False, prune: bool = False
+) -> RbacDiff:
+    """Make the DB match the catalog in one transaction; returns the applied diff.
+
+    Só roda os statements cuja parte do diff não está vazia: os triggers de
+    rbac_state incrementam a versão por statement, mesmo sem linhas afetadas,
+    e um sync sem mudanças não deve forçar recompilação nos workers.
+    """
+    db.execute(select(func.pg_advisory_xact_lock(_SYNC_LOCK_KEY)))
+    result = diff_catalog(db, spec)
+    if dry_run or result.is_empty(prune):
+        db.rollback()
+        return result
+
+    try:
+        permissions = {**result.permissions_added}
+        permissions.update({code: new for code, (_, new) in result.permissions_renamed.items()})
+        if permissions:
+            db.execute(_upsert(Permission.__table__, permissions))
+
+        roles = {**result.roles_added}
+        roles.update({code: new for code, (_, new) in result.roles_renamed.items()})
+        if roles:
+            db.execute(_upsert(Role.__table__, roles))
+
+        grant_pair = tuple_(role_permissions.c.role_id, role_permissions.c.permission_id)
+        if result.grants_removed:
+            db.execute(delete(role_permissions).where(grant_pair.in_(sorted(result.grants_removed))))
+        if result.grants_added:
+            db.execute(
+                pg_insert(role_permissions)
+                .values([
+                    {"role_id": role, "permission_id": perm}
+                    for role, perm in sorted(result.grants_added)
+                ])
+                .on_conflict_do_nothing()
+            )
+
+        inherit_pair = tuple_(role_inheritance.c.role_id, role_inheritance.c.included_role_id)
+        if result.inherits_removed:
+            db.execute(
+                delete(role_inheritance).where(inherit_pair.in_(sorted(result.inherits_removed)))
+            )
+        if result.inherits_added:
+            db.execute(
+                pg_insert(role_inheritance)
+                .values([
+                    {"role_id": role, "included_role_id": included}
+                    for role, included in sorted(result.inherits_added)
+                ])
+                .on_conflict_do_nothing()
+            )
+
+        if prune and result.permissions_unmanaged:
+            unmanaged = sorted(result.permissions_unmanaged)
+            db.execute(
+                delete(role_permissions).where(role_permissions.c.permission_id.in_(unmanaged))
+            )
+            db.execute(delete(Permission).where(Permission.id.in_(unmanaged)))
+        if prune and result.roles_unmanaged:
+            unmanaged = sorted(result.roles_unmanaged)
+            db.execute(delete(role_permissions).where(role_permissions.c.role_id.in_(unmanaged)))
+            db.execute(
+                delete(role_inheritance).where(
+                    role_inheritance.c.role_id.in_(unmanaged)
+                    | role_inheritance.c.included_role_id.in_(unmanaged)
+                )
+            )
+            db.execute(delete(user_roles).where(user_roles.c.role_id.in_(unmanaged)))
+            db.execute(delete(Role).where(Role.id.in_(unmanaged)))
+
+        _bump_version(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    from sgp_plus.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Sincroniza o catálogo RBAC declarativo")
+    parser.add_argument("--catalog", type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument("--dry-run", action="store_true", help="só mostra o diff")
+    parser.add_argument(
+        "--prune", action="store_true", help="remove roles/permissões fora do catálogo"
+    )
+    args = parser.parse_args(argv)
+
+    spec = load_catalog(args.catalog)
+    db = SessionLocal()
+    try:
+        result = sync_catalog(db, spec, dry_run=args.dry_run, prune=args.prune)
+    finally:
+        db.close()
+
+    for line in result.lines(args.prune):
+        print(line)
+    if result.is_empty(args.prune):
+        print("✅ catálogo RBAC já sincronizado")
+    elif args.dry_run:
+        print("(dry-run: nada gravado)")
+    else:
+        print("✅ catálogo RBAC sincronizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Session reaper: delete expired/revoked sessions in bounded batches.
+
+Roda como task no lifespan da API (SESSION_REAPER_ENABLED) e como CLI:
+
+    python -m sgp_plus.db.reaper [--retention-hours N] [--batch-size N]
+
+Cada lote é uma transação curta (DELETE ... WHERE id IN (SELECT ... LIMIT n
+FOR UPDATE SKIP LOCKED)): linhas travadas por logins/logouts em andamento são
+puladas em vez de esperadas, e vários workers podem rodar o reaper ao mesmo tempo.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_, select, text
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ReapResult:
+    """Outcome of one reaper run"""
+
+    deleted: int
+    batches: int
+    elapsed_seconds: float
+
+
+def _reapable(cutoff: datetime):
+    """Sessions past the retention window (expired, or revoked when safe to forget)"""
+    condition = SessionModel.expires_at < cutoff
+    # Em modo signed a linha revogada é a única prova da revogação até o token
+    # expirar (filtro de revogação recarrega de sessions): só apaga após expires_at.
+    if settings.session_token_mode != "signed":
+        condition = or_(condition, SessionModel.revoked_at < cutoff)
+    return condition
+
+
+def reap_sessions(
+    db: Session,
+    *,
+    retention_hours: int | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float = 0.0,
+) -> ReapResult:
+    """Delete reapable sessions batch by batch until none are left"""
+    if retention_hours is None:
+        retention_hours = settings.session_retention_hours
+    if batch_size is None:
+        batch_size = settings.session_reaper_batch_size
+
+    started = time.perf_counter()
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    batch = (
+        select(SessionModel.id)
+        .where(_reapable(cutoff))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    statement = delete(SessionModel).where(SessionModel.id.in_(batch.scalar_subquery()))
+
+    deleted = batches = 0
+    while True:
+        try:
+            # Nunca fica esperando lock de linha/tabela atrás do tráfego de login
+            db.execute(text("SET LOCAL lock_timeout = '1s'"))
+            count = db.execute(
+                statement, execution_options={"synchronize_session": False}
+            ).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if count <= 0:
+            break
+        deleted += count
+        batches += 1
+        if count < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return ReapResult(
+        deleted=deleted,
+        batches=batches,
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def run_reaper_once() -> ReapResult:
+    """One reaper run on a fresh session (used by the lifespan task)"""
+    db = SessionLocal()
+    try:
+        return reap_sessions(db, pause_seconds=0.05)
+    finally:
+        db.close()
+
+
+async def run_reaper_forever(interval_seconds: float) -> None:
+    """Lifespan task: reap every interval_seconds off the event loop"""
+    while True:
+        try:
+            result = await asyncio.to_thread(run_reaper_once)
+            if result.deleted:
+                logger.info(
+                    "session reaper: %d sessões removidas em %d lotes (%.2fs)",
+                    result.deleted,
+                    result.batches,
+                    result.elapsed_seconds,
+                )
+        except Exception:
+            logger.exception("session reaper: falha ao remover sessões")
+        await asyncio.sleep(interval_seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Remove sessões expiradas/revogadas")
+    parser.add_argument("--retention-hours", type=int, default=settings.session_retention_hours)
+    parser.add_argument("--batch-size", type=int, default=settings.session_reaper_batch_size)
+    parser.add_argument("--pause-seconds", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        result = reap_sessions(
+            db,
+            retention_hours=args.retention_hours,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause_seconds,
+        )
+    finally:
+        db.close()
+
+    print(
+        f"✅ {result.deleted} sessões removidas em {result.batches} lotes "
+        f"({result.elapsed_seconds:.2f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,9 +11,9 @@ from sqlalchemy.orm import Session
 from sgp_plus.db.session import SessionLocal
 from sgp_plus.db.models.user import User
 from sgp_plus.db.models.role import Role
-from sgp_plus.db.models.permission import Permission
 from sgp_plus.core.config import settings
 from sgp_plus.core.security import hash_password
+from sgp_plus.db.rbac_sync import load_catalog, sync_catalog
 
 INSECURE_PASSWORDS = frozenset({"", "admin123", "CHANGE_ME"})
 
@@ -32,35 +32,14 @@ def seed():
     db: Session = SessionLocal()
 
     try:
-        # Create permissions
-        permissions_data = [
-            {"id": "rbac.manage", "code": "rbac.manage", "name": "Manage RBAC"},
-            {"id": "users.read", "code": "users.read", "name": "Read Users"},
-            {"id": "users.write", "code": "users.write", "name": "Write Users"},
-        ]
-
-        for perm_data in permissions_data:
-            perm = db.query(Permission).filter(Permission.code == perm_data["code"]).first()
-            if not perm:
-                perm = Permission(**perm_data)
-                db.add(perm)
-                print(f"Created permission: {perm_data['code']}")
-
-        db.commit()
-
-        # Create admin role
-        admin_role = db.query(Role).filter(Role.code == "admin").first()
-        if not admin_role:
-            admin_role = Role(id="admin", code="admin", name="Administrator")
-            db.add(admin_role)
-            db.flush()
-
-            # Assign all permissions to admin role
-            all_perms = db.query(Permission).all()
-            admin_role.permissions = all_perms
-            print("Created admin role with all permissions")
-
-        db.commit()
+        # Permissões, roles e grants vêm do catálogo declarativo
+        changes = sync_catalog(db, load_catalog())
+        for line in changes.lines():
+            print(line)
+
+        admin_role = db.get(Role, "admin")
+        if admin_role is None:
+            raise RuntimeError("Catálogo RBAC precisa declarar a role 'admin'.")
 
         # Create admin user (bloquear senhas previsíveis)
         _block_insecure_bootstrap(
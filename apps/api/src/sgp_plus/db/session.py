@@ -1,15 +1,200 @@
-"""Database session management"""
+"""Database session management
 
-from typing import Generator
+Engines são criados no primeiro uso, não no import: importar o app, rodar um CLI
+ou um teste que não toca no banco não paga create_engine nem a montagem do pool.
+No app, o lifespan (main.create_app) cria e aquece o pool antes da primeira
+requisição.
+"""
 
+import threading
+from contextlib import AsyncExitStack, ExitStack
+from typing import Annotated, AsyncGenerator, Callable, Generator
+
+from fastapi import Depends
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
 
-from sgp_plus.core.config import settings
+from sgp_plus.core.config import Settings, settings
+from sgp_plus.core.metrics import instrument_engine
+from sgp_plus.core.sql_profiler import profile_engine
 from sgp_plus.db.base import Base
+from sgp_plus.db.pool import PoolMetrics, engine_options
+
+
+class Database:
+    """Primary and (optional) read-replica engines, sync and async, created on first use"""
+
+    def __init__(self, config: Settings):
+        self.settings = config
+        self.pool_metrics = PoolMetrics()
+        self.async_pool_metrics = PoolMetrics()
+        self.replica_pool_metrics = PoolMetrics()
+        self.async_replica_pool_metrics = PoolMetrics()
+        self._lock = threading.Lock()
+        self._engines: dict[str, Engine | AsyncEngine] = {}
+
+    @property
+    def has_replica(self) -> bool:
+        return self.settings.database_replica_url is not None
+
+    def _get(self, name: str, url: str, metrics: PoolMetrics, is_async: bool = False):
+        engine = self._engines.get(name)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(name)
+                if engine is None:
+                    options = engine_options(self.settings, metrics, is_async=is_async)
+                    if is_async:
+                        engine = create_async_engine(url, echo=False, **options)
+                        sync_engine = engine.sync_engine
+                    else:
+                        engine = sync_engine = create_engine(url, echo=False, **options)
+                    metrics.attach(sync_engine)
+                    instrument_engine(sync_engine)
+                    profile_engine(sync_engine)
+                    self._engines[name] = engine
+        return engine
+
+    @property
+    def engine(self) -> Engine:
+        return self._get("primary", self.settings.database_url, self.pool_metrics)
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """Async path (DB_MODE=async): mesmo DATABASE_URL, psycopg em modo async"""
+        return self._get(
+            "async_primary", self.settings.database_url, self.async_pool_metrics, is_async=True
+        )
+
+    @property
+    def replica_engine(self) -> Engine:
+        """Read replica engine (the primary one without DATABASE_REPLICA_URL)"""
+        if not self.has_replica:
+            return self.engine
+        return self._get(
+            "replica", self.settings.database_replica_url, self.replica_pool_metrics
+        )
+
+    @property
+    def async_replica_engine(self) -> AsyncEngine:
+        if not self.has_replica:
+            return self.async_engine
+        return self._get(
+            "async_replica",
+            self.settings.database_replica_url,
+            self.async_replica_pool_metrics,
+            is_async=True,
+        )
+
+    def warm_up(self, connections: int) -> int:
+        """Open up to `connections` pooled connections (capped at DB_POOL_SIZE) per
+        engine, primary and replica, and return them to the pool; returns how many
+        were opened"""
+        count = min(connections, self.settings.db_pool_size)
+        engines = [self.engine, self.replica_engine] if self.has_replica else [self.engine]
+        with ExitStack() as stack:
+            for engine in engines:
+                for _ in range(count):
+                    stack.enter_context(engine.connect())
+        return count * len(engines)
+
+    async def warm_up_async(self, connections: int) -> int:
+        """Async variant of warm_up (async engines)"""
+        count = min(connections, self.settings.db_pool_size)
+        engines = [self.async_engine]
+        if self.has_replica:
+            engines.append(self.async_replica_engine)
+        async with AsyncExitStack() as stack:
+            for engine in engines:
+                for _ in range(count):
+                    await stack.enter_async_context(engine.connect())
+        return count * len(engines)
+
+    def pool_stats(self) -> dict:
+        """Pool counters/occupancy of the engines created so far (sync, async, replicas);
+        an engine nobody used is left out instead of being created here"""
+        metrics = {
+            "primary": ("sync", self.pool_metrics),
+            "async_primary": ("async", self.async_pool_metrics),
+            "replica": ("replica", self.replica_pool_metrics),
+            "async_replica": ("async_replica", self.async_replica_pool_metrics),
+        }
+        stats = {}
+        for name, engine in list(self._engines.items()):
+            key, pool_metrics = metrics[name]
+            sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+            stats[key] = pool_metrics.stats(sync_engine.pool)
+        return stats
+
+    async def dispose(self) -> None:
+        """Close pooled connections (app shutdown); engines stay usable"""
+        for engine in list(self._engines.values()):
+            if isinstance(engine, AsyncEngine):
+                await engine.dispose()
+            else:
+                engine.dispose()
+
+
+database = Database(settings)
+
+
+def configure(config: Settings) -> Database:
+    """Point the module's engines/sessions at another Settings (create_app)"""
+    global database
+    if config is not database.settings:
+        database = Database(config)
+    return database
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker bound to one of the current database's engines at call time"""
+
+    def __init__(self, engine_name: str, **kw):
+        super().__init__(**kw)
+        self.engine_name = engine_name
+
+    def __call__(self, **local_kw) -> Session:
+        local_kw.setdefault("bind", getattr(database, self.engine_name))
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """async_sessionmaker bound to one of the current database's async engines at call time"""
 
-engine = create_engine(settings.database_url, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def __init__(self, engine_name: str, **kw):
+        super().__init__(**kw)
+        self.engine_name = engine_name
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        local_kw.setdefault("bind", getattr(database, self.engine_name))
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker("engine", autocommit=False, autoflush=False)
+AsyncSessionLocal = _LazyAsyncSessionmaker(
+    "async_engine", autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+# Só leitura (réplica); sem DATABASE_REPLICA_URL, get_read_db reusa a sessão primária
+ReadSessionLocal = _LazySessionmaker("replica_engine", autocommit=False, autoflush=False)
+AsyncReadSessionLocal = _LazyAsyncSessionmaker(
+    "async_replica_engine", autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
+
+def __getattr__(name: str):
+    # `from sgp_plus.db.session import engine` continua funcionando (cria sob demanda)
+    if name == "engine":
+        return database.engine
+    if name == "async_engine":
+        return database.async_engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db() -> Generator:
@@ -21,6 +206,58 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(db: Annotated[Session, Depends(get_db)]) -> Generator:
+    """Dependency for read-only queries: a replica session, or the request's
+    primary session when there is no replica (no second checkout)"""
+    if not database.has_replica:
+        yield db
+        return
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+
+async def get_async_read_db(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """Async variant of get_read_db"""
+    if not database.has_replica:
+        yield db
+        return
+    async with AsyncReadSessionLocal() as read_db:
+        yield read_db
+
+
+def get_read_sessionmaker() -> sessionmaker:
+    """Dependency for reads that outlive the request (streamed responses): the
+    caller opens and closes its own session instead of relying on the teardown
+    order of yield dependencies"""
+    return ReadSessionLocal if database.has_replica else SessionLocal
+
+
+def get_db_dependency() -> Callable:
+    """Return the session dependency for the configured DB_MODE"""
+    return get_async_db if settings.db_mode == "async" else get_db
+
+
+def get_read_db_dependency() -> Callable:
+    """Return the read-only session dependency for the configured DB_MODE"""
+    return get_async_read_db if settings.db_mode == "async" else get_read_db
+
+
+def pool_stats() -> dict:
+    """Pool counters/occupancy of the engines created so far"""
+    return database.pool_stats()
+
+
 def init_db():
     """Initialize database (create tables)"""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=database.engine)
@@ -3,21 +3,151 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
+from sgp_plus.db.models.associations import user_roles
 from sgp_plus.db.models.user import User
 from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.core.config import settings
+from sgp_plus.core.invalidation import session_revoked_notify
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.read_routing import read_routing
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.core.session_tokens import revocation_filter
 from sgp_plus.core.session_utils import get_session_expires_at
 
 
+def _principal_query(session_id: UUID):
+    """sessions ⋈ users ⟕ user_roles numa única query, roles agregadas.
+
+    Permissões não precisam de join: saem do catálogo RBAC compilado a partir
+    dos role_ids.
+    """
+    return (
+        select(
+            SessionModel.id,
+            SessionModel.expires_at,
+            User.id,
+            User.email,
+            User.is_active,
+            User.created_at,
+            func.array_agg(user_roles.c.role_id).filter(user_roles.c.role_id.is_not(None)),
+        )
+        .join(User, User.id == SessionModel.user_id)
+        .outerjoin(user_roles, user_roles.c.user_id == User.id)
+        .where(
+            and_(
+                SessionModel.id == session_id,
+                SessionModel.expires_at > datetime.utcnow(),
+                SessionModel.revoked_at.is_(None),
+            )
+        )
+        .group_by(SessionModel.id, User.id)
+    )
+
+
+def _rehash_statement(user_id: UUID, old_hash: str, new_hash: str):
+    """Compare-and-set: a password changed meanwhile is not overwritten"""
+    return (
+        update(User)
+        .where(User.id == user_id, User.password_hash == old_hash)
+        .values(password_hash=new_hash)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _revoke_statement(*criteria):
+    """UPDATE ... RETURNING of the still-valid sessions matching criteria.
+
+    Com a invalidação ligada, o próprio RETURNING chama pg_notify por linha
+    revogada: os outros workers ficam sabendo no commit, sem statement extra.
+    """
+    now = datetime.utcnow()
+    returning = [SessionModel.id, SessionModel.expires_at, SessionModel.user_id]
+    if settings.invalidation_enabled:
+        returning.append(session_revoked_notify(SessionModel.id))
+    return (
+        update(SessionModel)
+        .where(SessionModel.revoked_at.is_(None), SessionModel.expires_at > now, *criteria)
+        .values(revoked_at=now)
+        .returning(*returning)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _user_sessions_criteria(
+    user_id: UUID,
+    session_ids: list[UUID] | None = None,
+    exclude_session_id: UUID | None = None,
+    created_before: datetime | None = None,
+) -> list:
+    criteria = [SessionModel.user_id == user_id]
+    if session_ids is not None:
+        criteria.append(SessionModel.id.in_(session_ids))
+    if exclude_session_id is not None:
+        criteria.append(SessionModel.id != exclude_session_id)
+    if created_before is not None:
+        criteria.append(SessionModel.created_at < created_before)
+    return criteria
+
+
+def _active_sessions_query(user_id: UUID):
+    return (
+        select(SessionModel)
+        .where(
+            SessionModel.user_id == user_id,
+            SessionModel.revoked_at.is_(None),
+            SessionModel.expires_at > datetime.utcnow(),
+        )
+        .order_by(SessionModel.created_at.desc())
+    )
+
+
+def _forget_revoked(rows) -> list[UUID]:
+    """Drop revoked sessions from this worker's caches; returns their ids"""
+    for session_id, expires_at, *_ in rows:
+        session_cache.invalidate(session_id)
+        revocation_filter.add(session_id, expires_at)
+    revoked = [row[0] for row in rows]
+    # A réplica ainda pode vê-las válidas
+    read_routing.stick(revoked)
+    return revoked
+
+
+def _row_to_principal(row) -> Principal | None:
+    if row is None:
+        return None
+    session_id, expires_at, user_id, email, is_active, created_at, role_ids = row
+    return Principal(
+        id=user_id,
+        email=email,
+        is_active=is_active,
+        created_at=created_at,
+        role_ids=tuple(sorted(role_ids or ())),
+        session_id=session_id,
+        session_expires_at=expires_at,
+    )
+
+
 class AuthRepository:
     """Auth repository"""
 
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> User | None:
-        """Get user by email"""
-        return db.query(User).filter(User.email == email).first()
+        """Get user by email (roles eagerly loaded)"""
+        return (
+            db.query(User)
+            .filter(User.email == email)
+            .options(selectinload(User.roles))
+            .first()
+        )
+
+    @staticmethod
+    def update_password_hash(db: Session, user_id: UUID, old_hash: str, new_hash: str) -> None:
+        """Replace an outdated hash (no commit: goes out with the session's commit)"""
+        db.execute(_rehash_statement(user_id, old_hash, new_hash))
 
     @staticmethod
     def create_session(
@@ -36,6 +166,7 @@ class AuthRepository:
         db.add(session)
         db.commit()
         db.refresh(session)
+        read_routing.stick((session.id,))
         return session
 
     @staticmethod
@@ -55,9 +186,119 @@ class AuthRepository:
         )
 
     @staticmethod
-    def revoke_session(db: Session, session_id: UUID) -> None:
-        """Revoke a session"""
-        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-        if session:
-            session.revoked_at = datetime.utcnow()
-            db.commit()
+    def get_principal(db: Session, session_id: UUID) -> Principal | None:
+        """Resolve a valid session into a Principal in one round-trip"""
+        return _row_to_principal(db.execute(_principal_query(session_id)).first())
+
+    @staticmethod
+    def revoke_session(db: Session, session_id: UUID) -> UUID | None:
+        """Revoke a session (one UPDATE, no SELECT); returns its user id if it was valid"""
+        session_cache.invalidate(session_id)
+        revocation_filter.add(session_id)
+        read_routing.stick((session_id,))
+        row = db.execute(_revoke_statement(SessionModel.id == session_id)).first()
+        db.commit()
+        return row.user_id if row else None
+
+    @staticmethod
+    def list_active_sessions(db: Session, user_id: UUID) -> list[SessionModel]:
+        """Valid (not revoked, not expired) sessions of a user, newest first"""
+        return list(db.scalars(_active_sessions_query(user_id)))
+
+    @staticmethod
+    def revoke_user_sessions(db: Session, user_id: UUID, **filters) -> list[UUID]:
+        """Revoke a user's valid sessions (all or filtered) in one UPDATE ... RETURNING"""
+        rows = db.execute(_revoke_statement(*_user_sessions_criteria(user_id, **filters))).all()
+        db.commit()
+        return _forget_revoked(rows)
+
+
+class AsyncAuthRepository:
+    """Auth repository (AsyncSession, DB_MODE=async)
+
+    Mesma interface do AuthRepository. Relacionamentos usados depois da query
+    são carregados com selectinload: lazy load não é permitido em AsyncSession.
+    """
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+        """Get user by email (roles eagerly loaded)"""
+        result = await db.execute(
+            select(User)
+            .where(User.email == email)
+            .options(selectinload(User.roles))
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def update_password_hash(
+        db: AsyncSession, user_id: UUID, old_hash: str, new_hash: str
+    ) -> None:
+        """Replace an outdated hash (no commit: goes out with the session's commit)"""
+        await db.execute(_rehash_statement(user_id, old_hash, new_hash))
+
+    @staticmethod
+    async def create_session(
+        db: AsyncSession,
+        user_id: UUID,
+        user_agent: str | None = None,
+        ip: str | None = None,
+    ) -> SessionModel:
+        """Create a new session"""
+        session = SessionModel(
+            user_id=user_id,
+            expires_at=get_session_expires_at(),
+            user_agent=user_agent,
+            ip=ip,
+        )
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+        read_routing.stick((session.id,))
+        return session
+
+    @staticmethod
+    async def get_valid_session(db: AsyncSession, session_id: UUID) -> SessionModel | None:
+        """Get valid session by ID"""
+        now = datetime.utcnow()
+        result = await db.execute(
+            select(SessionModel).where(
+                and_(
+                    SessionModel.id == session_id,
+                    SessionModel.expires_at > now,
+                    SessionModel.revoked_at.is_(None),
+                )
+            )
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_principal(db: AsyncSession, session_id: UUID) -> Principal | None:
+        """Resolve a valid session into a Principal in one round-trip"""
+        result = await db.execute(_principal_query(session_id))
+        return _row_to_principal(result.first())
+
+    @staticmethod
+    async def revoke_session(db: AsyncSession, session_id: UUID) -> UUID | None:
+        """Revoke a session (one UPDATE, no SELECT); returns its user id if it was valid"""
+        session_cache.invalidate(session_id)
+        revocation_filter.add(session_id)
+        read_routing.stick((session_id,))
+        row = (await db.execute(_revoke_statement(SessionModel.id == session_id))).first()
+        await db.commit()
+        return row.user_id if row else None
+
+    @staticmethod
+    async def list_active_sessions(db: AsyncSession, user_id: UUID) -> list[SessionModel]:
+        """Valid (not revoked, not expired) sessions of a user, newest first"""
+        return list((await db.scalars(_active_sessions_query(user_id))).all())
+
+    @staticmethod
+    async def revoke_user_sessions(db: AsyncSession, user_id: UUID, **filters) -> list[UUID]:
+        """Revoke a user's valid sessions (all or filtered) in one UPDATE ... RETURNING"""
+        result = await db.execute(
+            _revoke_statement(*_user_sessions_criteria(user_id, **filters))
+        )
+        rows = result.all()
+        await db.commit()
+        return _forget_revoked(rows)
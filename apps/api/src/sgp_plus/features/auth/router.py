@@ -1,17 +1,28 @@
 """Auth router"""
 
+import hashlib
 import logging
+from dataclasses import replace
 from typing import Annotated
-from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request, Response, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 logger = logging.getLogger(__name__)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from sgp_plus.db.session import get_db
+from sgp_plus.db.session import get_db_dependency
+from sgp_plus.core.audit import LOGIN_FAILURE, LOGIN_SUCCESS, LOGOUT, audit_log
+from sgp_plus.core.login_throttle import login_throttle
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.rbac import principal_access_json
+from sgp_plus.core.rbac_engine import rbac_engine
+from sgp_plus.core.session_cache import session_cache
 from sgp_plus.core.security import (
-    get_current_user,
+    get_current_user_dependency,
+    session_cookie_value,
+    session_id_from_cookie,
     set_session_cookie,
     clear_session_cookie,
 )
@@ -19,86 +30,169 @@ from sgp_plus.features.auth.schemas import (
     LoginRequest,
     LoginResponse,
     MeResponse,
-    UserResponse,
-    RoleResponse,
-    PermissionResponse,
+    RevokeSessionsRequest,
+    RevokeSessionsResponse,
+    SessionResponse,
 )
 from sgp_plus.features.auth.service import AuthService
-from sgp_plus.features.auth.repository import AuthRepository
-from sgp_plus.db.models.user import User
-from sgp_plus.shared.utils import get_client_ip, get_user_agent
+from sgp_plus.shared.responses import RawJSONResponse
+from sgp_plus.shared.utils import etag_matches, get_client_ip, get_user_agent
 from sgp_plus.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Session/AsyncSession conforme DB_MODE
+DbSession = Annotated[Session | AsyncSession, Depends(get_db_dependency())]
+CurrentUser = Annotated[Principal, Depends(get_current_user_dependency())]
+
+
+# Navegador sempre revalida (If-None-Match); nada fica em caches compartilhados
+ME_CACHE_CONTROL = "private, no-cache"
+
+
+def _me_etag(principal: Principal, rbac_version: int | str) -> str:
+    """Weak ETag over everything MeResponse is built from"""
+    key = "|".join((
+        str(principal.id),
+        principal.email,
+        str(principal.is_active),
+        principal.created_at.isoformat(),
+        ",".join(principal.role_ids),
+        str(rbac_version),
+    ))
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+async def _principal_json(principal: Principal, db: Session | AsyncSession) -> bytes:
+    """LoginResponse/MeResponse body as JSON bytes, without pydantic models.
+
+    Roles/permissions são um fragmento pré-serializado do catálogo RBAC
+    compilado; só o usuário é serializado por requisição.
+    """
+    user = orjson.dumps(
+        {
+            "id": principal.id,
+            "email": principal.email,
+            "is_active": principal.is_active,
+            "created_at": principal.created_at,
+        },
+        option=orjson.OPT_UTC_Z,
+    )
+    access = await principal_access_json(principal, db)
+    return b"".join((b'{"user":', user, b",", access, b"}"))
+
 
 @router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
 async def login(
     request: Request,
     response: Response,
     login_data: LoginRequest,
-    db: Annotated[Session, Depends(get_db)],
+    db: DbSession,
 ):
     """Login endpoint"""
+    ip, user_agent = get_client_ip(request), get_user_agent(request)
     service = AuthService(db)
-    user = service.authenticate(login_data.email, login_data.password)
+    try:
+        # 429 antes de qualquer query ou bcrypt
+        login_throttle.check(ip, login_data.email)
+        user = await service.authenticate(login_data.email, login_data.password)
+    except HTTPException as exc:
+        audit_log.record(
+            LOGIN_FAILURE, email=login_data.email, ip=ip, user_agent=user_agent, detail=exc.detail
+        )
+        raise
+    login_throttle.succeeded(login_data.email)
+
+    # Snapshot antes do commit da sessão (evita refresh do ORM no event loop)
+    principal = Principal.from_user(user)
 
     # Create session
-    repository = AuthRepository()
-    session = repository.create_session(
-        db,
-        user.id,
-        user_agent=get_user_agent(request),
-        ip=get_client_ip(request),
+    session = await service.create_session(user.id, user_agent=user_agent, ip=ip)
+    audit_log.record(
+        LOGIN_SUCCESS,
+        user_id=principal.id,
+        session_id=session.id,
+        email=principal.email,
+        ip=ip,
+        user_agent=user_agent,
     )
 
-    # Set cookie
-    set_session_cookie(response, session.id)
+    # Cache quente: o próximo /auth/me não vai ao banco
+    principal = replace(principal, session_id=session.id, session_expires_at=session.expires_at)
+    session_cache.put(principal)
+    body = await _principal_json(principal, db)
 
-    # Get user data
-    roles = service.get_user_roles(user)
-    permissions = service.get_user_permissions(user)
+    # Set cookie (depois do corpo: token assinado leva a versão RBAC atual)
+    set_session_cookie(response, session_cookie_value(principal))
 
-    return LoginResponse(
-        user=UserResponse.model_validate(user),
-        roles=[RoleResponse(**r) for r in roles],
-        permissions=[PermissionResponse(**p) for p in permissions],
-    )
+    return RawJSONResponse.merged(body, response)
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
     request: Request,
     response: Response,
-    db: Annotated[Session, Depends(get_db)],
+    db: DbSession,
 ):
     """Logout endpoint"""
-    session_id = request.cookies.get(settings.cookie_name)
-    if session_id:
+    session_id = session_id_from_cookie(request.cookies.get(settings.cookie_name))
+    if session_id:  # cookie inválido/adulterado: nada a revogar
+        user_id = None
         try:
-            repository = AuthRepository()
-            repository.revoke_session(db, UUID(session_id))
-        except ValueError:
-            pass  # Invalid UUID, ignora
+            user_id = await AuthService(db).revoke_session(session_id)
         except Exception:
             logger.exception("logout: falha ao revogar sessão no DB")
+        audit_log.record_request(LOGOUT, request, user_id=user_id, session_id=session_id)
 
     clear_session_cookie(response)
     return {"message": "Logged out"}
 
 
-@router.get("/me", response_model=MeResponse)
-async def me(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
-):
-    """Get current user info"""
-    service = AuthService(db)
-    roles = service.get_user_roles(current_user)
-    permissions = service.get_user_permissions(current_user)
+@router.get("/sessions", response_model=list[SessionResponse])
+async def my_sessions(current_user: CurrentUser, db: DbSession):
+    """Active sessions of the current user (the caller's flagged as current)"""
+    sessions = await AuthService(db).list_active_sessions(current_user.id)
+    current = current_user.session_id
+    return [
+        SessionResponse.model_validate(s).model_copy(update={"current": s.id == current})
+        for s in sessions
+    ]
 
-    return MeResponse(
-        user=UserResponse.model_validate(current_user),
-        roles=[RoleResponse(**r) for r in roles],
-        permissions=[PermissionResponse(**p) for p in permissions],
+
+@router.post("/sessions/revoke", response_model=RevokeSessionsResponse)
+async def revoke_my_sessions(
+    body: RevokeSessionsRequest,
+    response: Response,
+    current_user: CurrentUser,
+    db: DbSession,
+):
+    """Revoke the current user's other sessions (or a subset; include_current to log out too)"""
+    revoked = await AuthService(db).revoke_user_sessions(
+        current_user.id,
+        session_ids=body.session_ids,
+        exclude_session_id=None if body.include_current else current_user.session_id,
+        created_before=body.created_before,
     )
+    if current_user.session_id in revoked:
+        clear_session_cookie(response)
+    return RevokeSessionsResponse(revoked=revoked)
+
+
+@router.get("/me", response_model=MeResponse)
+async def me(request: Request, response: Response, current_user: CurrentUser, db: DbSession):
+    """Get current user info (304 when If-None-Match still matches)"""
+    # Com principal em cache e catálogo sem checagem pendente, nada vai ao banco
+    catalog = await rbac_engine.ensure_fresh(db, current_user.role_ids)
+    # Versão global do catálogo (igual em todos os workers); sem rbac_state,
+    # o contador local de compilações
+    etag = _me_etag(current_user, catalog.source_version or f"local-{catalog.version}")
+    headers = {"ETag": etag, "Cache-Control": ME_CACHE_CONTROL}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        # Cookie renovado pela expiração deslizante vai junto
+        not_modified.headers.raw.extend(response.headers.raw)
+        return not_modified
+
+    response.headers.update(headers)
+    return RawJSONResponse.merged(await _principal_json(current_user, db), response)
@@ -6,6 +6,30 @@ from uuid import UUID
 from pydantic import BaseModel, field_validator, ConfigDict
 
 
+def normalize_email(v: str) -> str:
+    """Validate email format minimally (accepts internal domains like .local)"""
+    if not isinstance(v, str):
+        raise ValueError("email must be a string")
+
+    email = v.strip().lower()
+
+    # Basic validation: must contain exactly one @
+    if email.count("@") != 1:
+        raise ValueError("email must contain exactly one @")
+
+    parts = email.split("@")
+    local_part = parts[0]
+    domain_part = parts[1]
+
+    # Both parts must be non-empty
+    if not local_part:
+        raise ValueError("email local part cannot be empty")
+    if not domain_part:
+        raise ValueError("email domain part cannot be empty")
+
+    return email
+
+
 class LoginRequest(BaseModel):
     """Login request"""
 
@@ -16,26 +40,7 @@ class LoginRequest(BaseModel):
     @classmethod
     def validate_email(cls, v: str) -> str:
         """Validate email format minimally (accepts internal domains like .local)"""
-        if not isinstance(v, str):
-            raise ValueError("email must be a string")
-        
-        email = v.strip().lower()
-        
-        # Basic validation: must contain exactly one @
-        if email.count("@") != 1:
-            raise ValueError("email must contain exactly one @")
-        
-        parts = email.split("@")
-        local_part = parts[0]
-        domain_part = parts[1]
-        
-        # Both parts must be non-empty
-        if not local_part:
-            raise ValueError("email local part cannot be empty")
-        if not domain_part:
-            raise ValueError("email domain part cannot be empty")
-        
-        return email
+        return normalize_email(v)
 
 
 class UserResponse(BaseModel):
@@ -83,3 +88,32 @@ class MeResponse(BaseModel):
     user: UserResponse
     roles: list[RoleResponse]
     permissions: list[PermissionResponse]
+
+
+class SessionResponse(BaseModel):
+    """Active session (current = the one making the request)"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    created_at: datetime
+    expires_at: datetime
+    last_seen_at: datetime | None
+    user_agent: str | None
+    ip: str | None
+    current: bool = False
+
+
+class RevokeSessionsRequest(BaseModel):
+    """Which sessions to revoke (no filter = all of the user's sessions)"""
+
+    session_ids: list[UUID] | None = None
+    created_before: datetime | None = None
+    # /auth/sessions/revoke: por padrão mantém a sessão de quem pediu
+    include_current: bool = False
+
+
+class RevokeSessionsResponse(BaseModel):
+    """Ids of the sessions revoked by the request"""
+
+    revoked: list[UUID]
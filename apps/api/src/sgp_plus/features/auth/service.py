@@ -1,25 +1,45 @@
 """Auth service"""
 
+from datetime import datetime
 from uuid import UUID
 
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from sgp_plus.db.models.session import Session as SessionModel
 from sgp_plus.db.models.user import User
-from sgp_plus.core.security import verify_password
-from sgp_plus.features.auth.repository import AuthRepository
+from sgp_plus.core.config import settings
+from sgp_plus.core.metrics import PASSWORD_REHASHED, SESSIONS_CREATED, SESSIONS_REVOKED
+from sgp_plus.core.password_pool import password_pool
+from sgp_plus.features.auth.repository import AsyncAuthRepository, AuthRepository
 from sgp_plus.shared.errors import AuthenticationError
 
 
 class AuthService:
-    """Auth service"""
+    """Auth service
 
-    def __init__(self, db: Session):
+    Aceita Session (DB_MODE=sync) ou AsyncSession (DB_MODE=async). No modo sync
+    as chamadas ao repositório rodam no threadpool para não bloquear o event loop.
+    """
+
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
-        self.repository = AuthRepository()
+        if isinstance(db, AsyncSession):
+            self.repository = AsyncAuthRepository()
+        else:
+            self.repository = AuthRepository()
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Run a repository method without blocking the event loop"""
+        fn = getattr(self.repository, method)
+        if isinstance(self.db, AsyncSession):
+            return await fn(self.db, *args, **kwargs)
+        return await run_in_threadpool(fn, self.db, *args, **kwargs)
 
-    def authenticate(self, email: str, password: str) -> User:
+    async def authenticate(self, email: str, password: str) -> User:
         """Authenticate user"""
-        user = self.repository.get_user_by_email(self.db, email)
+        user = await self._call("get_user_by_email", email)
 
         if not user:
             raise AuthenticationError()
@@ -27,22 +47,57 @@ class AuthService:
         if not user.is_active:
             raise AuthenticationError("User is inactive")
 
-        if not verify_password(password, user.password_hash):
+        # bcrypt no pool (fora do event loop); 503 se o pool estiver saturado
+        valid, new_hash = await password_pool.verify_and_update(password, user.password_hash)
+        if not valid:
             raise AuthenticationError()
 
+        # Esquema/custo antigo: regrava com o atual (commit junto com a sessão)
+        if new_hash and settings.password_rehash_on_login:
+            await self._call("update_password_hash", user.id, user.password_hash, new_hash)
+            PASSWORD_REHASHED.inc()
+
         return user
 
-    def get_user_permissions(self, user: User) -> list[dict]:
-        """Get user permissions"""
-        permissions = []
-        seen = set()
-        for role in user.roles:
-            for perm in role.permissions:
-                if perm.code not in seen:
-                    permissions.append({"id": perm.id, "code": perm.code, "name": perm.name})
-                    seen.add(perm.code)
-        return permissions
-
-    def get_user_roles(self, user: User) -> list[dict]:
-        """Get user roles"""
-        return [{"id": role.id, "code": role.code, "name": role.name} for role in user.roles]
+    async def create_session(
+        self,
+        user_id: UUID,
+        user_agent: str | None = None,
+        ip: str | None = None,
+    ) -> SessionModel:
+        """Create a new session"""
+        session = await self._call("create_session", user_id, user_agent=user_agent, ip=ip)
+        SESSIONS_CREATED.inc()
+        return session
+
+    async def revoke_session(self, session_id: UUID) -> UUID | None:
+        """Revoke a session; returns its user id (None if it was already invalid)"""
+        user_id = await self._call("revoke_session", session_id)
+        # Logout repetido ou sessão já expirada não conta
+        if user_id is not None:
+            SESSIONS_REVOKED.inc()
+        return user_id
+
+    async def list_active_sessions(self, user_id: UUID) -> list[SessionModel]:
+        """Valid sessions of a user, newest first"""
+        return await self._call("list_active_sessions", user_id)
+
+    async def revoke_user_sessions(
+        self,
+        user_id: UUID,
+        *,
+        session_ids: list[UUID] | None = None,
+        exclude_session_id: UUID | None = None,
+        created_before: datetime | None = None,
+    ) -> list[UUID]:
+        """Revoke all (or a filtered subset) of a user's sessions; returns revoked ids"""
+        revoked = await self._call(
+            "revoke_user_sessions",
+            user_id,
+            session_ids=session_ids,
+            exclude_session_id=exclude_session_id,
+            created_before=created_before,
+        )
+        if revoked:
+            SESSIONS_REVOKED.inc(amount=len(revoked))
+        return revoked
@@ -0,0 +1,372 @@
+"""Bulk user import (CSV / NDJSON).
+
+Lê o arquivo em streaming, valida cada linha, faz o hash das senhas em paralelo
+(pool de processos por padrão) e grava `users` + `user_roles` com INSERT
+multi-linha, uma transação por lote de USER_IMPORT_CHUNK_SIZE linhas. Linha
+inválida, email já existente ou lote que falhou viram erros por linha; o resto
+do arquivo continua.
+
+Arquivo em UTF-8 (com ou sem BOM), conferido antes do primeiro lote.
+CSV: cabeçalho com email,password e opcionalmente roles (códigos separados por
+"|") e is_active. NDJSON: um objeto por linha com as mesmas chaves (roles pode
+ser lista).
+
+    python -m sgp_plus.features.users.importer usuarios.csv
+    python -m sgp_plus.features.users.importer usuarios.ndjson --errors erros.ndjson
+"""
+
+import argparse
+import codecs
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.security import hash_password
+from sgp_plus.db.models.associations import user_roles
+from sgp_plus.db.models.role import Role
+from sgp_plus.db.models.user import User
+from sgp_plus.features.auth.schemas import normalize_email
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+_TRUE = frozenset({"1", "true", "t", "yes", "y", "sim", "s"})
+_FALSE = frozenset({"0", "false", "f", "no", "n", "nao", "não"})
+_EMAIL_MAX_LENGTH = User.__table__.c.email.type.length
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRow:
+    """One parsed input row (line = 1-based line in the file)"""
+
+    line: int
+    email: str
+    password: str
+    roles: tuple[str, ...] = ()
+    is_active: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class RowError:
+    """A row that was not imported"""
+
+    line: int
+    email: str | None
+    error: str
+
+
+@dataclass
+class ImportResult:
+    """Totals of one import run"""
+
+    created: int = 0
+    failed: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if not text or text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"is_active inválido: {value!r}")
+
+
+def _parse_roles(value) -> tuple[str, ...]:
+    if not value:
+        return ()
+    items = value if isinstance(value, list) else str(value).split("|")
+    return tuple(dict.fromkeys(str(item).strip() for item in items if str(item).strip()))
+
+
+def _row(line: int, fields: dict) -> ImportRow | RowError:
+    email = fields.get("email")
+    password = fields.get("password") or ""
+    try:
+        # NDJSON aceita qualquer tipo: número como senha não pode chegar ao hash
+        if not isinstance(password, str):
+            raise ValueError("password precisa ser texto")
+        # Um email longo derrubaria o INSERT do lote inteiro
+        if isinstance(email, str) and len(email.strip()) > _EMAIL_MAX_LENGTH:
+            raise ValueError(f"email com mais de {_EMAIL_MAX_LENGTH} caracteres")
+        return ImportRow(
+            line=line,
+            email=normalize_email(email or ""),
+            password=password,
+            roles=_parse_roles(fields.get("roles")),
+            is_active=_parse_bool(fields.get("is_active", "")),
+        )
+    except ValueError as exc:
+        return RowError(line, email if isinstance(email, str) and email else None, str(exc))
+
+
+class Utf8Check:
+    """Incremental UTF-8 validation of a byte stream, before anything is imported.
+
+    Arquivo em latin-1/cp1252 quebraria o TextIOWrapper no meio da importação,
+    com lotes anteriores já gravados; a checagem roda enquanto o corpo é lido.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.line = 1
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        """ValueError naming the first line that is not valid UTF-8"""
+        buffered = self._decoder.getstate()[0] + data
+        try:
+            self._decoder.decode(data, final)
+        except UnicodeDecodeError as exc:
+            line = self.line + buffered.count(b"\n", 0, exc.start)
+            raise ValueError(f"linha {line}: arquivo precisa estar em UTF-8") from None
+        self.line += data.count(b"\n")
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[ImportRow | RowError]:
+    """Rows of a CSV with a header line (email,password[,roles][,is_active])"""
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or not {"email", "password"} <= set(reader.fieldnames):
+        yield RowError(1, None, "cabeçalho precisa das colunas email e password")
+        return
+    for fields in reader:
+        yield _row(reader.line_num, fields)
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[ImportRow | RowError]:
+    """Rows of a newline-delimited JSON file (one object per line)"""
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            fields = json.loads(text)
+        except json.JSONDecodeError as exc:
+            yield RowError(line, None, f"JSON inválido: {exc.msg}")
+            continue
+        if not isinstance(fields, dict):
+            yield RowError(line, None, "linha precisa ser um objeto JSON")
+            continue
+        yield _row(line, fields)
+
+
+def parse(lines: Iterable[str], fmt: str) -> Iterator[ImportRow | RowError]:
+    return parse_ndjson(lines) if fmt == "ndjson" else parse_csv(lines)
+
+
+def _hash(password: str) -> tuple[str | None, str | None]:
+    """(hash, error) — runs on the hashing pool, errors travel back as text"""
+    if not password:
+        return None, "senha vazia"
+    try:
+        return hash_password(password), None
+    except ValueError as exc:
+        return None, str(exc)
+
+
+def hash_executor(kind: str | None = None, workers: int | None = None) -> Executor:
+    """Pool for hashing (process by default: bcrypt/argon2 are pure CPU)"""
+    kind = kind or settings.user_import_hash_kind
+    workers = workers or settings.user_import_hash_workers or os.cpu_count() or 1
+    if kind == "process":
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="user-import")
+
+
+class _Importer:
+    """State of one run: role map, emails already seen, totals"""
+
+    def __init__(self, db: Session, executor: Executor | None, on_error):
+        self.db = db
+        self.executor = executor
+        self.on_error = on_error
+        self.result = ImportResult()
+        self.seen: dict[str, int] = {}
+        self.role_ids = dict(db.execute(select(Role.code, Role.id)).all())
+
+    def fail(self, error: RowError) -> None:
+        self.result.failed += 1
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def validate(self, row: ImportRow) -> str | None:
+        first = self.seen.get(row.email)
+        if first is not None:
+            return f"email repetido no arquivo (linha {first})"
+        unknown = [code for code in row.roles if code not in self.role_ids]
+        if unknown:
+            return f"roles desconhecidas: {', '.join(unknown)}"
+        self.seen[row.email] = row.line
+        return None
+
+    def load(self, chunk: list[ImportRow]) -> None:
+        """Hash a chunk on the pool and insert it in one transaction"""
+        passwords = [row.password for row in chunk]
+        if self.executor is None:
+            hashed = list(map(_hash, passwords))
+        else:
+            hashed = list(self.executor.map(_hash, passwords, chunksize=8))
+
+        now = datetime.utcnow()
+        users, pending = [], {}
+        for row, (password_hash, error) in zip(chunk, hashed):
+            if error:
+                self.fail(RowError(row.line, row.email, error))
+                continue
+            user_id = uuid4()
+            users.append({
+                "id": user_id,
+                "email": row.email,
+                "password_hash": password_hash,
+                "is_active": row.is_active,
+                "created_at": now,
+            })
+            pending[user_id] = row
+        if not users:
+            return
+
+        try:
+            # Email já cadastrado não derruba o lote: volta só quem entrou
+            inserted = set(
+                self.db.execute(
+                    pg_insert(User.__table__)
+                    .values(users)
+                    .on_conflict_do_nothing(index_elements=["email"])
+                    .returning(User.__table__.c.id)
+                ).scalars()
+            )
+            grants = [
+                {"user_id": user_id, "role_id": self.role_ids[code]}
+                for user_id in inserted
+                for code in pending[user_id].roles
+            ]
+            if grants:
+                self.db.execute(insert(user_roles).values(grants))
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            logger.exception("importação de usuários: lote falhou")
+            for row in pending.values():
+                self.fail(RowError(row.line, row.email, f"lote não gravado: {exc}"))
+            return
+
+        self.result.chunks += 1
+        self.result.created += len(inserted)
+        for user_id, row in pending.items():
+            if user_id not in inserted:
+                self.fail(RowError(row.line, row.email, "email já cadastrado"))
+
+
+def import_users(
+    db: Session,
+    rows: Iterable[ImportRow | RowError],
+    *,
+    chunk_size: int | None = None,
+    executor: Executor | None = None,
+    on_error: Callable[[RowError], None] | None = None,
+) -> ImportResult:
+    """Import parsed rows in chunked transactions; executor=None hashes inline"""
+    chunk_size = chunk_size or settings.user_import_chunk_size
+    started = time.perf_counter()
+    importer = _Importer(db, executor, on_error)
+    chunk: list[ImportRow] = []
+    for row in rows:
+        if isinstance(row, RowError):
+            importer.fail(row)
+            continue
+        error = importer.validate(row)
+        if error:
+            importer.fail(RowError(row.line, row.email, error))
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            importer.load(chunk)
+            chunk = []
+    if chunk:
+        importer.load(chunk)
+    importer.result.elapsed_seconds = time.perf_counter() - started
+    return importer.result
+
+
+def detect_format(path: Path) -> str:
+    return "ndjson" if path.suffix.lower() in (".ndjson", ".jsonl") else "csv"
+
+
+def main(argv: list[str] | None = None) -> int:
+    from sgp_plus.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Importa usuários em massa (CSV/NDJSON)")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=FORMATS, help="padrão: pela extensão do arquivo")
+    parser.add_argument("--chunk-size", type=int, default=settings.user_import_chunk_size)
+    parser.add_argument(
+        "--hash-kind", choices=("process", "thread"), default=settings.user_import_hash_kind
+    )
+    parser.add_argument("--hash-workers", type=int, default=settings.user_import_hash_workers)
+    parser.add_argument("--errors", type=Path, help="grava os erros por linha em NDJSON")
+    args = parser.parse_args(argv)
+
+    errors_file: TextIO | None = None
+    if args.errors:
+        errors_file = args.errors.open("w", encoding="utf-8")
+
+    def report(error: RowError) -> None:
+        print(f"linha {error.line} ({error.email or '-'}): {error.error}", file=sys.stderr)
+        if errors_file is not None:
+            errors_file.write(json.dumps(asdict(error), ensure_ascii=False) + "\n")
+
+    check = Utf8Check()
+    try:
+        with args.path.open("rb") as source:
+            for block in iter(lambda: source.read(1024 * 1024), b""):
+                check.feed(block)
+        check.feed(b"", final=True)
+    except ValueError as exc:
+        print(f"❌ {args.path}: {exc}", file=sys.stderr)
+        return 1
+
+    db = SessionLocal()
+    executor = hash_executor(args.hash_kind, args.hash_workers)
+    try:
+        with args.path.open(encoding="utf-8-sig", newline="") as source:
+            result = import_users(
+                db,
+                parse(source, args.format or detect_format(args.path)),
+                chunk_size=args.chunk_size,
+                executor=executor,
+                on_error=report,
+            )
+    finally:
+        executor.shutdown(cancel_futures=True)
+        db.close()
+        if errors_file is not None:
+            errors_file.close()
+
+    print(
+        f"✅ {result.created} usuários criados, {result.failed} linhas com erro "
+        f"({result.chunks} lotes, {result.elapsed_seconds:.1f}s)"
+    )
+    return 0 if not result.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
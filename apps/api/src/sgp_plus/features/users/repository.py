@@ -0,0 +1,93 @@
+"""Users repository (listing and export queries)
+
+Paginação por keyset em (created_at, id): a próxima página começa depois do
+último par visto, então o custo não cresce com a posição como no OFFSET. Os
+índices da migration 0005 cobrem a ordenação e os filtros.
+"""
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Select, String, exists, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from sgp_plus.db.models.associations import user_roles
+from sgp_plus.db.models.role import Role
+from sgp_plus.db.models.user import User
+
+Cursor = tuple[datetime, UUID]
+
+
+@dataclass(frozen=True)
+class UserFilters:
+    """Listing filters (None = not filtered)"""
+
+    is_active: bool | None = None
+    role: str | None = None
+    email_prefix: str | None = None
+
+
+def encode_cursor(created_at: datetime, user_id: UUID) -> str:
+    """Opaque cursor for the row after which the next page starts"""
+    raw = orjson.dumps([created_at.isoformat(), str(user_id)])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor; ValueError on anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern for a literal prefix (\\ is Postgres' default escape)"""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def users_query(filters: UserFilters, after: Cursor | None = None) -> Select:
+    """Users ordered by (created_at, id) with their role codes, filtered.
+
+    Roles saem de uma subquery correlacionada (ARRAY(SELECT ...)): uma linha
+    por usuário, sem GROUP BY, e o LIMIT continua aplicável direto no índice.
+    """
+    role_codes = func.array(
+        select(Role.code)
+        .join(user_roles, user_roles.c.role_id == Role.id)
+        .where(user_roles.c.user_id == User.id)
+        .order_by(Role.code)
+        .scalar_subquery(),
+        type_=ARRAY(String),
+    )
+    statement = select(
+        User.id, User.email, User.is_active, User.created_at, role_codes.label("roles")
+    ).order_by(User.created_at, User.id)
+
+    if filters.is_active is not None:
+        statement = statement.where(User.is_active == filters.is_active)
+    if filters.email_prefix:
+        # Emails são gravados em minúsculas; text_pattern_ops atende o LIKE 'x%'
+        statement = statement.where(User.email.like(_like_prefix(filters.email_prefix.lower())))
+    if filters.role:
+        statement = statement.where(
+            exists()
+            .where(user_roles.c.user_id == User.id)
+            .where(user_roles.c.role_id == Role.id)
+            .where(Role.code == filters.role)
+        )
+    if after is not None:
+        statement = statement.where(tuple_(User.created_at, User.id) > tuple_(*after))
+    return statement
+
+
+def page_query(filters: UserFilters, after: Cursor | None, limit: int) -> Select:
+    """One page plus one extra row (tells whether there is a next page)"""
+    return users_query(filters, after).limit(limit + 1)
@@ -0,0 +1,262 @@
+"""Users router"""
+
+import csv
+import io
+import tempfile
+from typing import Annotated, Iterator, Literal
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.rbac import require_permissions
+from sgp_plus.db.session import (
+    get_db,
+    get_db_dependency,
+    get_read_db_dependency,
+    get_read_sessionmaker,
+)
+from sgp_plus.features.auth.schemas import (
+    RevokeSessionsRequest,
+    RevokeSessionsResponse,
+    SessionResponse,
+)
+from sgp_plus.features.auth.service import AuthService
+from sgp_plus.features.users.importer import (
+    RowError,
+    Utf8Check,
+    hash_executor,
+    import_users,
+    parse,
+)
+from sgp_plus.features.users.repository import (
+    UserFilters,
+    decode_cursor,
+    encode_cursor,
+    page_query,
+    users_query,
+)
+from sgp_plus.features.users.schemas import UserImportResponse, UserListItem, UserListResponse
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+# Session/AsyncSession conforme DB_MODE
+DbSession = Annotated[Session | AsyncSession, Depends(get_db_dependency())]
+# Só leitura: réplica quando DATABASE_REPLICA_URL está configurada
+ReadDbSession = Annotated[Session | AsyncSession, Depends(get_read_db_dependency())]
+
+_NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+# Mesmas colunas do importer (roles separadas por "|"), sem a senha
+_EXPORT_COLUMNS = ("id", "email", "is_active", "created_at", "roles")
+
+
+def user_filters(
+    is_active: bool | None = None,
+    role: Annotated[str | None, Query(max_length=50, description="role code")] = None,
+    email_prefix: Annotated[str | None, Query(max_length=255)] = None,
+) -> UserFilters:
+    """Query parameters shared by the listing and the export"""
+    return UserFilters(is_active=is_active, role=role, email_prefix=email_prefix)
+
+
+Filters = Annotated[UserFilters, Depends(user_filters)]
+
+
+@router.get("", response_model=UserListResponse)
+async def list_users(
+    db: ReadDbSession,
+    filters: Filters,
+    _=Depends(require_permissions("users.read")),
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+):
+    """List users by creation order, keyset-paginated (users.read).
+
+    `next_cursor` de uma página vai em `?cursor=` da próxima, com os mesmos
+    filtros. `limit` acima de USER_LIST_MAX_LIMIT é reduzido ao máximo.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    limit = min(limit or settings.user_list_default_limit, settings.user_list_max_limit)
+
+    statement = page_query(filters, after, limit)
+    if isinstance(db, AsyncSession):
+        rows = (await db.execute(statement)).all()
+    else:
+        rows = await run_in_threadpool(lambda: db.execute(statement).all())
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+    return UserListResponse(
+        items=[UserListItem.model_validate(row) for row in page], next_cursor=next_cursor
+    )
+
+
+@router.get("/{user_id}/sessions", response_model=list[SessionResponse])
+async def list_user_sessions(
+    user_id: UUID,
+    db: DbSession,
+    _=Depends(require_permissions("users.read")),
+):
+    """Active sessions of a user, newest first (users.read)"""
+    return await AuthService(db).list_active_sessions(user_id)
+
+
+@router.post("/{user_id}/sessions/revoke", response_model=RevokeSessionsResponse)
+async def revoke_user_sessions(
+    user_id: UUID,
+    body: RevokeSessionsRequest,
+    db: DbSession,
+    _=Depends(require_permissions("users.write")),
+):
+    """Revoke all (or a filtered subset) of a user's sessions in one UPDATE (users.write).
+
+    Para conta comprometida ou desativada: corpo vazio revoga todas.
+    """
+    revoked = await AuthService(db).revoke_user_sessions(
+        user_id, session_ids=body.session_ids, created_before=body.created_before
+    )
+    return RevokeSessionsResponse(revoked=revoked)
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow((
+            row.id,
+            row.email,
+            "true" if row.is_active else "false",
+            row.created_at.isoformat(),
+            "|".join(row.roles),
+        ))
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return b"".join(
+        orjson.dumps(row._asdict(), option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def _export_chunks(
+    session_factory: sessionmaker, filters: UserFilters, fmt: str
+) -> Iterator[bytes]:
+    """Rows from a server-side cursor, one response chunk per fetched batch.
+
+    yield_per liga stream_results: o psycopg usa um cursor nomeado e só
+    USER_EXPORT_BATCH_SIZE linhas ficam em memória por vez. A sessão é do
+    próprio gerador: a do request pode fechar antes do primeiro chunk.
+    """
+    if fmt == "csv":
+        yield (",".join(_EXPORT_COLUMNS) + "\r\n").encode()
+    encode = _csv_chunk if fmt == "csv" else _ndjson_chunk
+    statement = users_query(filters).execution_options(
+        yield_per=settings.user_export_batch_size
+    )
+    # close() fecha o cursor nomeado e a transação de leitura
+    with session_factory() as db:
+        for batch in db.execute(statement).partitions():
+            yield encode(batch)
+
+
+@router.get("/export")
+async def export_users(
+    session_factory: Annotated[sessionmaker, Depends(get_read_sessionmaker)],
+    filters: Filters,
+    _=Depends(require_permissions("users.read")),
+    format: Literal["ndjson", "csv"] = "ndjson",
+):
+    """Stream every matching user as NDJSON or CSV (users.read).
+
+    Sempre pela Session síncrona (o gerador roda no threadpool), como o import.
+    """
+    return StreamingResponse(
+        _export_chunks(session_factory, filters, format),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+async def _spool_body(request: Request) -> tempfile.SpooledTemporaryFile:
+    """Stream the request body to a spooled temp file (disk above 1 MiB), capped"""
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    check = Utf8Check()
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.user_import_max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    detail=f"Import file larger than {settings.user_import_max_bytes} bytes",
+                )
+            check.feed(chunk)
+            spool.write(chunk)
+        check.feed(b"", final=True)
+    except ValueError as exc:
+        # Recusado antes de qualquer lote ser gravado
+        spool.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except HTTPException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def _run_import(db: Session, spool, fmt: str) -> tuple:
+    """Parse and import from the spooled file (threadpool: hashing + sync DB)"""
+    errors: list[RowError] = []
+
+    def collect(error: RowError) -> None:
+        if len(errors) < settings.user_import_max_errors:
+            errors.append(error)
+
+    executor = hash_executor()
+    try:
+        lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        result = import_users(db, parse(lines, fmt), executor=executor, on_error=collect)
+    finally:
+        executor.shutdown(cancel_futures=True)
+        spool.close()
+    # Erros de validação saem na hora, os do lote no commit: devolve por linha
+    return result, sorted(errors, key=lambda error: error.line)
+
+
+@router.post("/import", response_model=UserImportResponse)
+async def import_users_endpoint(
+    request: Request,
+    db: Annotated[Session, Depends(get_db)],
+    _=Depends(require_permissions("rbac.manage")),
+    format: Annotated[Literal["csv", "ndjson"] | None, Query()] = None,
+):
+    """Bulk import users from a CSV or NDJSON body (rbac.manage).
+
+    Corpo cru (não multipart); formato pelo parâmetro `format` ou Content-Type.
+    Erros por linha não abortam o arquivo; arquivos enormes: use o CLI.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or ("ndjson" if content_type in _NDJSON_TYPES else "csv")
+
+    spool = await _spool_body(request)
+    result, errors = await run_in_threadpool(_run_import, db, spool, fmt)
+    return UserImportResponse(
+        created=result.created,
+        failed=result.failed,
+        chunks=result.chunks,
+        elapsed_seconds=round(result.elapsed_seconds, 3),
+        errors=errors,
+        errors_truncated=result.failed > len(errors),
+    )
@@ -0,0 +1,46 @@
+"""Users schemas"""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class UserListItem(BaseModel):
+    """User in a listing page (roles = role codes)"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    email: str
+    is_active: bool
+    created_at: datetime
+    roles: list[str]
+
+
+class UserListResponse(BaseModel):
+    """One keyset page; next_cursor is null on the last page"""
+
+    items: list[UserListItem]
+    next_cursor: str | None
+
+
+class ImportRowErrorResponse(BaseModel):
+    """A row that was not imported"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    line: int
+    email: str | None
+    error: str
+
+
+class UserImportResponse(BaseModel):
+    """Bulk import summary"""
+
+    created: int
+    failed: int
+    chunks: int
+    elapsed_seconds: float
+    errors: list[ImportRowErrorResponse]
+    errors_truncated: bool
@@ -1,40 +1,248 @@
-"""Main FastAPI application"""
+"""Main FastAPI application
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+create_app(settings) monta o app. Importar este módulo só carrega o FastAPI:
+routers e singletons entram na chamada, e engine/pool, backend de senha,
+workers de hashing e catálogo RBAC são criados e aquecidos no lifespan, antes
+da primeira requisição (STARTUP_WARMUP). Só os campos de _PER_APP_SETTINGS
+podem diferir do settings do processo: dependências das rotas (DB_MODE) e
+singletons (caches, throttle, pools, tokens) são montados no import a partir
+dele, e um Settings que os mude é recusado em vez de honrado pela metade.
 
-from fastapi import Depends
+    uvicorn sgp_plus.main:app                      # app padrão, criado no 1º acesso
+    uvicorn --factory sgp_plus.main:create_app
+"""
 
-from sgp_plus.core.config import settings
-from sgp_plus.core.rbac import require_permissions
-from sgp_plus.features.auth.router import router as auth_router
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import TYPE_CHECKING
 
-app = FastAPI(
-    title="SGP+ API",
-    description="Sistema de Gestão de Processos Plus - API",
-    version="0.1.0",
-)
+from fastapi import Depends, FastAPI
+
+if TYPE_CHECKING:
+    # Só a anotação: o import de core.config lê env/.env (Settings())
+    from sgp_plus.core.config import Settings
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+logger = logging.getLogger(__name__)
+
+# O que create_app aplica por app: engines/pool, réplica, startup, CORS, métricas,
+# tarefas de fundo do lifespan
+_PER_APP_SETTINGS = frozenset(
+    {
+        "database_url",
+        "db_pool_size",
+        "db_max_overflow",
+        "db_pool_timeout",
+        "db_pool_recycle",
+        "db_pool_pre_ping",
+        "db_statement_timeout_ms",
+        "database_replica_url",
+        "replica_stick_seconds",
+        "startup_warmup",
+        "db_pool_warmup_connections",
+        "cors_origins",
+        "metrics_enabled",
+        "invalidation_enabled",
+        "invalidation_coalesce_ms",
+        "invalidation_reconnect_max_seconds",
+        "session_reaper_enabled",
+        "session_reaper_interval_seconds",
+    }
 )
 
-# Routers
-app.include_router(auth_router)
+
+def _check_config(config: "Settings", process: "Settings") -> None:
+    """Refuse a Settings that differs from the process one where the factory can't apply it"""
+    differing = sorted(
+        name
+        for name in type(config).model_fields
+        if name not in _PER_APP_SETTINGS and getattr(config, name) != getattr(process, name)
+    )
+    if differing:
+        raise ValueError(
+            "create_app: settings lidos no import não podem mudar por app "
+            f"(use env/.env do processo): {', '.join(differing)}"
+        )
+
+
+async def _warm_up(config: "Settings") -> None:
+    """Pay the first-request costs at startup; failures are logged, not fatal"""
+    from sgp_plus.core.password_pool import password_pool
+    from sgp_plus.core.rbac_engine import rbac_engine
+    from sgp_plus.db import session as db_session
+
+    started = time.perf_counter()
+    try:
+        # Container sobe antes do banco: sem conexão, o pool abre sob demanda
+        if config.db_mode == "async":
+            opened = await db_session.database.warm_up_async(config.db_pool_warmup_connections)
+            async with db_session.AsyncSessionLocal() as db:
+                await rbac_engine.refresh_async(db)
+        else:
+            opened = await asyncio.to_thread(
+                db_session.database.warm_up, config.db_pool_warmup_connections
+            )
+
+            def load_rbac() -> None:
+                with db_session.SessionLocal() as db:
+                    rbac_engine.refresh(db)
+
+            await asyncio.to_thread(load_rbac)
+    except Exception:
+        opened = 0
+        logger.exception("startup: warm-up do banco falhou; conexões abrem sob demanda")
+    try:
+        await password_pool.warm_up()
+    except Exception:
+        logger.exception("startup: warm-up do pool de senha falhou")
+    logger.info(
+        "startup: warm-up em %.0f ms (%d conexões)", (time.perf_counter() - started) * 1000, opened
+    )
+
+
+def create_app(config: "Settings | None" = None) -> FastAPI:
+    """Build the API for a Settings (default: the process settings from env/.env)"""
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import PlainTextResponse
+
+    from sgp_plus.core.config import settings as default_settings
+
+    config = config or default_settings
+    if config is not default_settings:
+        _check_config(config, default_settings)
+
+    from sgp_plus.db import session as db_session
+
+    db_session.configure(config)
+
+    from sgp_plus.core.audit import audit_log
+    from sgp_plus.core.invalidation import invalidation_listener
+    from sgp_plus.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+    from sgp_plus.core.password_pool import password_pool
+    from sgp_plus.core.rbac import require_permissions
+    from sgp_plus.core.read_routing import read_routing
+    from sgp_plus.core.session_activity import session_activity
+    from sgp_plus.core.sql_profiler import SqlProfilerMiddleware
+    from sgp_plus.db.reaper import run_reaper_forever
+    from sgp_plus.features.auth.router import router as auth_router
+    from sgp_plus.features.users.router import router as users_router
+
+    # Sem réplica tudo já vai ao primário: nada a grudar
+    read_routing.enabled = config.database_replica_url is not None
+    read_routing.stick_seconds = config.replica_stick_seconds
+    invalidation_listener.database_url = config.database_url
+    invalidation_listener.coalesce_seconds = config.invalidation_coalesce_ms / 1000
+    invalidation_listener.reconnect_max_seconds = config.invalidation_reconnect_max_seconds
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Startup/shutdown hooks"""
+        if config.startup_warmup:
+            await _warm_up(config)
+        reaper = None
+        if config.session_reaper_enabled:
+            reaper = asyncio.create_task(
+                run_reaper_forever(config.session_reaper_interval_seconds)
+            )
+        activity = asyncio.create_task(session_activity.run_forever())
+        audit = asyncio.create_task(audit_log.run_forever()) if audit_log.enabled else None
+        invalidation = None
+        if config.invalidation_enabled:
+            invalidation = asyncio.create_task(invalidation_listener.run_forever())
+        yield
+        for task in (reaper, activity, audit, invalidation):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        # Último acesso pendente não se perde no shutdown
+        try:
+            await asyncio.to_thread(session_activity.flush_once)
+        except Exception:
+            logger.exception("shutdown: falha ao gravar atividade de sessões")
+        try:
+            await asyncio.to_thread(audit_log.flush_once)
+        except Exception:
+            logger.exception("shutdown: falha ao gravar auth_events pendentes")
+        password_pool.shutdown()
+        await db_session.database.dispose()
+
+    app = FastAPI(
+        title="SGP+ API",
+        description="Sistema de Gestão de Processos Plus - API",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+
+    # CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Metrics (latência/status/SQL por rota)
+    if config.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    # SQL profiler (X-SQL-Profile / SQL_PROFILE_ENABLED)
+    app.add_middleware(SqlProfilerMiddleware)
+
+    # Routers
+    app.include_router(auth_router)
+    app.include_router(users_router)
+
+    @app.get("/admin/ping")
+    async def admin_ping(_=Depends(require_permissions("rbac.manage"))):
+        """Rota protegida por RBAC (rbac.manage). Prova server-side."""
+        return {"ok": True}
+
+    @app.get("/admin/password-pool")
+    async def admin_password_pool(_=Depends(require_permissions("rbac.manage"))):
+        """Profundidade e tempo de espera do pool de hashing de senha."""
+        return password_pool.stats()
+
+    @app.get("/admin/invalidation")
+    async def admin_invalidation(_=Depends(require_permissions("rbac.manage"))):
+        """Estado do listener LISTEN/NOTIFY (conectado, mensagens, lotes, reconexões)."""
+        return invalidation_listener.stats()
+
+    @app.get("/admin/audit")
+    async def admin_audit(_=Depends(require_permissions("rbac.manage"))):
+        """Fila da auditoria: eventos pendentes, gravados e descartados."""
+        return audit_log.stats()
+
+    @app.get("/admin/db-pool")
+    async def admin_db_pool(_=Depends(require_permissions("rbac.manage"))):
+        """Ocupação, checkouts, espera e invalidações do pool de conexões (+ réplica)."""
+        return {**db_session.pool_stats(), "read_routing": read_routing.stats()}
+
+    if config.metrics_enabled:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            """Métricas em formato Prometheus (texto)."""
+            return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/health")
+    async def health():
+        """Health check endpoint"""
+        return {"status": "ok"}
+
+    return app
 
 
-@app.get("/admin/ping")
-async def admin_ping(_=Depends(require_permissions("rbac.manage"))):
-    """Rota protegida por RBAC (rbac.manage). Prova server-side."""
-    return {"ok": True}
+_default_app: FastAPI | None = None
 
 
-@app.get("/health")
-async def health():
-    """Health check endpoint"""
-    return {"status": "ok"}
+def __getattr__(name: str):
+    # `sgp_plus.main:app` (uvicorn, testes): app padrão criado no primeiro acesso
+    global _default_app
+    if name == "app":
+        if _default_app is None:
+            _default_app = create_app()
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
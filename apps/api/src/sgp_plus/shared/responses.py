@@ -0,0 +1,22 @@
+"""Shared response classes"""
+
+from starlette.responses import Response
+
+
+class RawJSONResponse(Response):
+    """Body already encoded as JSON bytes: no validation or serialization on the way out.
+
+    Quem monta o corpo garante o formato do response_model declarado na rota
+    (que continua valendo para o OpenAPI).
+    """
+
+    media_type = "application/json"
+
+    @classmethod
+    def merged(
+        cls, body: bytes, sub_response: Response, status_code: int = 200
+    ) -> "RawJSONResponse":
+        """Response carrying the headers (cookies) set on the injected Response"""
+        response = cls(body, status_code=status_code)
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
@@ -10,6 +10,18 @@ def get_client_ip(request: Any) -> str:
     return "unknown"
 
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check with weak comparison (W/ prefix ignored, lists and *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
 def get_user_agent(request: Any) -> str:
     """Extract user agent from request"""
     return request.headers.get("user-agent", "unknown")
@@ -0,0 +1,61 @@
+"""App factory and startup warm-up tests"""
+
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sgp_plus.core.config import Settings, settings
+from sgp_plus.core.rbac import rbac_engine
+from sgp_plus.db import session as db_session
+from sgp_plus.db.models.user import User
+from sgp_plus.main import create_app
+from sgp_plus.tests.conftest import TEST_DATABASE_URL
+
+
+def test_importing_main_builds_nothing():
+    """Import não lê settings, não importa routers e não cria engines"""
+    code = (
+        "import sys, sgp_plus.main\n"
+        "print(sorted(m for m in ('sgp_plus.core.config', 'sgp_plus.features.auth.router')"
+        " if m in sys.modules))\n"
+        "import sgp_plus.db.session as s\n"
+        "print(not s.database._engines)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split("\n")
+    assert out[:2] == ["[]", "True"]
+
+
+def test_create_app_warms_pool_and_rbac_catalog(db, admin_user: User):
+    """Lifespan abre as conexões do pool e compila o catálogo antes da 1ª requisição"""
+    config = Settings(
+        database_url=TEST_DATABASE_URL,
+        db_pool_warmup_connections=3,
+        session_reaper_enabled=False,
+        invalidation_enabled=False,
+    )
+    rbac_engine.reset()
+    app = create_app(config)
+    try:
+        with TestClient(app) as client:
+            database = db_session.database
+            assert database.settings is config
+            stats = database.pool_metrics.stats(database.engine.pool)
+            assert stats["connects"] == 3 and stats["idle"] == 3
+            assert "admin" in rbac_engine.catalog.roles
+            assert client.get("/health").status_code == 200
+    finally:
+        db_session.configure(settings)
+        rbac_engine.reset()
+
+
+def test_create_app_refuses_process_wide_settings():
+    """DB_MODE/tokens/caches vêm do settings do processo: mudar por app é erro"""
+    with pytest.raises(ValueError, match="db_mode, session_cache_enabled"):
+        create_app(
+            Settings(database_url=TEST_DATABASE_URL, db_mode="async", session_cache_enabled=False)
+        )
+    assert db_session.database.settings is settings
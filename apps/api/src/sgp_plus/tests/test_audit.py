@@ -0,0 +1,64 @@
+"""Auth event audit trail tests"""
+
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.audit import AuditLog, audit_log
+from sgp_plus.db.models.auth_event import AuthEvent
+from sgp_plus.db.models.user import User
+
+
+def test_record_is_bounded_and_cheap():
+    """Fila cheia descarta e conta; registrar custa microssegundos"""
+    log = AuditLog(max_queue=3)
+    for _ in range(5):
+        log.record("login_failure", email="x@example.com")
+    assert log.stats() == {"enabled": True, "queued": 3, "written": 0, "dropped": 2}
+
+    log = AuditLog(max_queue=100_000)
+    user_id, session_id = uuid4(), uuid4()
+    started = time.perf_counter()
+    for _ in range(10_000):
+        log.record("login_success", user_id=user_id, session_id=session_id, ip="10.0.0.1")
+    assert (time.perf_counter() - started) / 10_000 < 50e-6
+
+
+def test_flush_in_batches_and_restore_on_failure(db: Session, capture_statements):
+    log = AuditLog(batch_size=2)
+    for i in range(5):
+        log.record("logout", session_id=uuid4(), user_agent="ua" * 400, detail=str(i))
+
+    with capture_statements() as statements:
+        assert log.flush(db) == 5
+    assert sum(s.startswith("INSERT INTO auth_events") for s in statements) == 3
+    events = db.scalars(select(AuthEvent).order_by(AuthEvent.id)).all()
+    assert [e.detail for e in events] == ["0", "1", "2", "3", "4"]
+    assert len(events[0].user_agent) == 512  # cortado, não derruba o lote
+
+    # Lote que falha volta para a fila (kind maior que a coluna)
+    log.record("x" * 40)
+    with pytest.raises(Exception):
+        log.flush(db)
+    assert log.stats()["queued"] == 1
+
+
+def test_login_logout_and_403_are_audited(client: TestClient, db: Session, test_user: User):
+    client.post("/auth/login", json={"email": "test@example.com", "password": "errada"})
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+    assert client.get("/admin/ping").status_code == 403
+    client.post("/auth/logout")
+    audit_log.flush(db)
+
+    events = db.scalars(select(AuthEvent).order_by(AuthEvent.id)).all()
+    assert [e.kind for e in events] == ["login_failure", "login_success", "forbidden", "logout"]
+    assert all(e.ip == "testclient" and e.user_agent == "testclient" for e in events)
+    failure, success, forbidden, logout = events
+    assert failure.email == "test@example.com" and failure.user_id is None
+    assert success.user_id == test_user.id and success.session_id is not None
+    assert forbidden.detail == "GET /admin/ping: Missing permissions: rbac.manage"
+    assert (logout.user_id, logout.session_id) == (test_user.id, success.session_id)
@@ -1,9 +1,26 @@
 """Auth endpoint tests"""
 
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.rbac_engine import rbac_engine
+from sgp_plus.core.session_cache import session_cache
 from sgp_plus.db.models.user import User
+from sgp_plus.features.auth.router import _me_etag, _principal_json
+from sgp_plus.features.auth.schemas import (
+    MeResponse,
+    PermissionResponse,
+    RoleResponse,
+    UserResponse,
+)
+from sgp_plus.shared.utils import etag_matches
 
 
 def test_login_invalid_credentials(client: TestClient):
@@ -78,3 +95,94 @@ def test_logout(client: TestClient, test_user: User):
     # Try to access /auth/me after logout
     me_response = client.get("/auth/me")
     assert me_response.status_code == 401
+
+
+def test_me_cache_miss_is_single_query(
+    client: TestClient, test_user: User, capture_statements
+):
+    """Sem cache, sessão + usuário + roles saem de uma única query"""
+    login_response = client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    )
+    assert login_response.status_code == 200
+    session_cache.clear()
+
+    with capture_statements() as statements:
+        response = client.get("/auth/me")
+
+    assert response.status_code == 200
+    assert [r["code"] for r in response.json()["roles"]] == ["test_role"]
+    assert [p["code"] for p in response.json()["permissions"]] == ["test.read"]
+    assert len(statements) == 1
+
+
+def test_me_conditional_get(client: TestClient, test_user: User, capture_statements):
+    """If-None-Match com o ETag atual → 304 sem corpo e sem tocar no banco"""
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+
+    response = client.get("/auth/me")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    with capture_statements() as statements:
+        response = client.get("/auth/me", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert statements == []
+
+    response = client.get("/auth/me", headers={"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200
+    assert response.json()["user"]["email"] == "test@example.com"
+
+
+def test_me_etag_tracks_principal_and_rbac_version(test_user: User):
+    """ETag muda com is_active, roles ou versão do catálogo RBAC"""
+    principal = Principal.from_user(test_user)
+    etag = _me_etag(principal, 7)
+
+    assert _me_etag(principal, 7) == etag
+    assert _me_etag(replace(principal, is_active=False), 7) != etag
+    assert _me_etag(replace(principal, role_ids=()), 7) != etag
+    assert _me_etag(principal, 8) != etag
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"x", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"x"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.parametrize(
+    "created_at", [datetime(2024, 5, 1, 12, 30), datetime(2024, 5, 1, 12, 30, 0, 123456)]
+)
+def test_principal_json_matches_response_model(created_at: datetime):
+    """Corpo montado à mão é byte a byte o que o response_model produziria"""
+    rbac_engine.load(
+        roles=[("admin", "admin", "Administrador"), ("leitor", "leitor", 'Leitor "RO"')],
+        permissions=[("p.read", "p.read", "Ler ç"), ("p.write", "p.write", "Escrever")],
+        grants=[("admin", "p.read"), ("admin", "p.write"), ("leitor", "p.read")],
+    )
+    principal = Principal(
+        id=uuid4(),
+        email="fast@example.com",
+        is_active=True,
+        created_at=created_at,
+        role_ids=("admin", "leitor"),
+    )
+    _, roles, permissions = rbac_engine.catalog.resolve(principal.role_ids)
+    expected = TypeAdapter(MeResponse).dump_json(
+        MeResponse(
+            user=UserResponse.model_validate(principal),
+            roles=[RoleResponse.model_validate(r) for r in roles],
+            permissions=[PermissionResponse.model_validate(p) for p in permissions],
+        )
+    )
+
+    try:
+        assert asyncio.run(_principal_json(principal, None)) == expected
+    finally:
+        rbac_engine.reset()
@@ -0,0 +1,72 @@
+"""Async DB stack tests (DB_MODE=async)"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sgp_plus.db.models.user import User
+from sgp_plus.features.auth.repository import AsyncAuthRepository
+from sgp_plus.features.auth.service import AuthService
+from sgp_plus.shared.errors import AuthenticationError
+from sgp_plus.tests.conftest import TEST_DATABASE_URL
+
+
+def _run_async(coro_fn):
+    """Run coro_fn(db) with a fresh AsyncSession on the test database"""
+
+    async def runner():
+        async_engine = create_async_engine(TEST_DATABASE_URL)
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+                return await coro_fn(db)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(runner())
+
+
+def test_async_session_lifecycle(test_user: User):
+    """AsyncAuthRepository: cria, valida e revoga sessão sem lazy load"""
+
+    async def scenario(db):
+        repository = AsyncAuthRepository()
+        user = await repository.get_user_by_email(db, "test@example.com")
+        assert [r.code for r in user.roles] == ["test_role"]
+
+        session = await repository.create_session(db, user.id, user_agent="pytest", ip="127.0.0.1")
+        assert await repository.get_valid_session(db, session.id) is not None
+
+        await repository.revoke_session(db, session.id)
+        assert await repository.get_valid_session(db, session.id) is None
+
+    _run_async(scenario)
+
+
+def test_async_service_authenticate(test_user: User):
+    """AuthService com AsyncSession usa o repositório async"""
+
+    async def scenario(db):
+        service = AuthService(db)
+        user = await service.authenticate("test@example.com", "password123")
+        assert user.email == "test@example.com"
+        with pytest.raises(AuthenticationError):
+            await service.authenticate("test@example.com", "wrong")
+
+    _run_async(scenario)
+
+
+def test_async_session_activity_flush(test_user: User):
+    """Flush de atividade também funciona com AsyncSession"""
+    from sgp_plus.core.session_activity import SessionActivity
+
+    async def scenario(db):
+        repository = AsyncAuthRepository()
+        session = await repository.create_session(db, test_user.id)
+        activity = SessionActivity()
+        activity.touch(session.id)
+        assert await activity.flush_async(db) == 1
+        await db.refresh(session)
+        return session.last_seen_at
+
+    assert _run_async(scenario) is not None
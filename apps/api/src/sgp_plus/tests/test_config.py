@@ -15,3 +15,43 @@ def test_cors_origins_wildcard_rejected():
     msg = str(exc_info.value).lower()
     assert "cors_origins" in msg or "*" in str(exc_info.value)
     assert "allow_credentials" in msg or "cookie" in msg or "cannot" in msg
+
+
+def test_db_mode_validated():
+    """DB_MODE aceita apenas sync|async."""
+    from sgp_plus.core.config import Settings
+
+    assert Settings(db_mode="ASYNC").db_mode == "async"
+    with pytest.raises((ValueError, ValidationError)):
+        Settings(db_mode="threads")
+
+
+def test_signed_session_token_requires_secret():
+    """SESSION_TOKEN_MODE=signed exige SESSION_TOKEN_SECRET com 32+ caracteres."""
+    from sgp_plus.core.config import Settings
+
+    config = Settings(session_token_mode="signed", session_token_secret="s" * 32)
+    assert config.session_token_mode == "signed"
+    with pytest.raises((ValueError, ValidationError)):
+        Settings(session_token_mode="signed", session_token_secret="short")
+
+
+def test_db_pool_settings_validated():
+    """DB_POOL_SIZE >= 1 e DB_STATEMENT_TIMEOUT_MS >= 0."""
+    from sgp_plus.core.config import Settings
+
+    with pytest.raises((ValueError, ValidationError)):
+        Settings(db_pool_size=0)
+    with pytest.raises((ValueError, ValidationError)):
+        Settings(db_statement_timeout_ms=-1)
+
+
+def test_password_hashing_settings_validated():
+    """PASSWORD_SCHEMES aceita bcrypt/argon2 (normalizado) e custos dentro dos limites."""
+    from sgp_plus.core.config import Settings
+
+    assert Settings(password_schemes=" Argon2, bcrypt,argon2").password_schemes == "argon2,bcrypt"
+    with pytest.raises((ValueError, ValidationError)):
+        Settings(password_schemes="md5_crypt")
+    with pytest.raises((ValueError, ValidationError)):
+        Settings(password_bcrypt_rounds=3)
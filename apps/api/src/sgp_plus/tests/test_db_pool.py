@@ -0,0 +1,75 @@
+"""Connection pool configuration + instrumentation tests"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+
+from sgp_plus.core.config import Settings
+from sgp_plus.db import session as db_session
+from sgp_plus.db.models.user import User
+from sgp_plus.db.pool import PoolMetrics, engine_options
+from sgp_plus.db.session import Database
+from sgp_plus.tests.conftest import TEST_DATABASE_URL
+
+
+def _engine(metrics: PoolMetrics, **overrides):
+    config = Settings(db_pool_size=1, db_max_overflow=0, db_pool_timeout=0.1, **overrides)
+    engine = create_engine(TEST_DATABASE_URL, **engine_options(config, metrics))
+    metrics.attach(engine)
+    return engine
+
+
+def test_pool_metrics_track_checkouts_timeouts_and_invalidations():
+    """Checkout, espera esgotada e invalidação aparecem nas estatísticas"""
+    metrics = PoolMetrics()
+    engine = _engine(metrics)
+    try:
+        with engine.connect() as conn:
+            stats = metrics.stats(engine.pool)
+            assert stats["in_use"] == 1 and stats["size"] == 1
+            with pytest.raises(sa_exc.TimeoutError):
+                engine.connect()
+            conn.invalidate()
+
+        stats = metrics.stats(engine.pool)
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["wait_ms_max"] >= 100
+        assert stats["invalidations"] == 1
+        assert stats["in_use"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_statement_timeout_applied_per_connection():
+    """DB_STATEMENT_TIMEOUT_MS vira statement_timeout de cada conexão"""
+    engine = _engine(PoolMetrics(), db_statement_timeout_ms=250)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "250ms"
+            with pytest.raises(sa_exc.OperationalError):
+                conn.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        engine.dispose()
+
+
+def test_pool_stats_does_not_create_engines():
+    """Só engines já criados aparecem; o outro modo não nasce por causa do /admin/db-pool"""
+    database = Database(Settings(database_url=TEST_DATABASE_URL))
+    assert database.pool_stats() == {}
+
+    database.engine
+    assert database.pool_stats().keys() == {"sync"}
+
+
+def test_admin_db_pool_endpoint(client: TestClient, admin_user: User, test_user: User):
+    """GET /admin/db-pool exige rbac.manage"""
+    db_session.database.engine
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+    assert client.get("/admin/db-pool").status_code == 403
+
+    client.post("/auth/login", json={"email": "admin@test.local", "password": "safe-pass"})
+    resp = client.get("/admin/db-pool")
+    assert resp.status_code == 200
+    assert {"checkouts", "wait_ms_avg", "in_use", "overflow"} <= resp.json()["sync"].keys()
@@ -0,0 +1,146 @@
+"""Cross-worker invalidation (LISTEN/NOTIFY) tests"""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, select, text, update
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.invalidation import CHANNEL, InvalidationBatch, InvalidationListener
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.rbac_engine import rbac_engine
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.core.session_tokens import revocation_filter
+from sgp_plus.db.models.associations import user_roles
+from sgp_plus.db.models.user import User
+from sgp_plus.features.auth.repository import AuthRepository
+from sgp_plus.tests.conftest import TEST_DATABASE_URL, engine
+
+
+def _principal(user_id=None, session_id=None) -> Principal:
+    return Principal(
+        id=user_id or uuid4(),
+        email="cache@example.com",
+        is_active=True,
+        created_at=datetime(2024, 1, 1),
+        role_ids=(),
+        session_id=session_id or uuid4(),
+        session_expires_at=datetime.utcnow() + timedelta(hours=1),
+    )
+
+
+def _notify(*payloads: str) -> None:
+    with engine.begin() as conn:
+        for payload in payloads:
+            conn.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+async def _until(predicate, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timeout"
+        await asyncio.sleep(0.01)
+
+
+def test_batch_coalesces_and_applies():
+    """Um lote: sessões revogadas, principals de usuários e RBAC; lixo é ignorado"""
+    session_cache.clear()
+    revocation_filter.clear()
+    kept, by_user, by_session = _principal(), _principal(), _principal()
+    second = _principal(user_id=by_user.id)
+    for principal in (kept, by_user, second, by_session):
+        session_cache.put(principal)
+
+    batch = InvalidationBatch()
+    for payload in (
+        f"s:{by_session.session_id}",
+        f"u:{by_user.id},{uuid4()}",
+        "r",
+        "r",
+        "s:not-a-uuid",
+        "x:1",
+    ):
+        batch.add(payload)
+    assert batch.rbac and len(batch.users) == 2 and len(batch.sessions) == 1
+
+    rbac_engine.load([], [], [])
+    assert not rbac_engine._needs_check()
+    batch.apply()
+
+    assert session_cache.get(kept.session_id) == kept
+    assert session_cache.get(by_user.session_id) is None
+    assert session_cache.get(second.session_id) is None
+    assert session_cache.is_negative(by_session.session_id)
+    assert revocation_filter.is_revoked(by_session.session_id)
+    assert rbac_engine._needs_check()
+    session_cache.clear()
+    revocation_filter.clear()
+    rbac_engine.reset()
+
+
+def test_user_message_reaches_signed_tokens(
+    monkeypatch, client: TestClient, db, admin_user: User
+):
+    """Modo assinado: "u:" derruba roles/is_active do token sem esperar a sync"""
+    monkeypatch.setattr(settings, "session_token_mode", "signed")
+    monkeypatch.setattr(settings, "session_token_secret", "x" * 32)
+    client.post("/auth/login", json={"email": "admin@test.local", "password": "safe-pass"})
+    assert client.get("/admin/ping").status_code == 200
+
+    # Sem triggers (create_all) access_changed_at fica NULL: só o NOTIFY avisa
+    db.execute(delete(user_roles).where(user_roles.c.user_id == admin_user.id))
+    db.commit()
+    InvalidationBatch(users={admin_user.id}).apply()
+    assert client.get("/admin/ping").status_code == 403
+
+    db.execute(update(User).where(User.id == admin_user.id).values(is_active=False))
+    db.commit()
+    InvalidationBatch(users={admin_user.id}).apply()
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_listener_receives_revocations_and_reconnects(db, test_user: User):
+    """Revogação em outra conexão chega pelo canal; conexão derrubada volta sozinha"""
+    session_cache.clear()
+    user_id = test_user.id
+    session_id = AuthRepository.create_session(db, user_id).id
+    cached = _principal(user_id=user_id)
+
+    async def scenario():
+        listener = InvalidationListener(TEST_DATABASE_URL, coalesce_seconds=0.02)
+        task = asyncio.create_task(listener.run_forever())
+        try:
+            await _until(lambda: listener.connected)
+            # Cache montado depois do "*" da conexão
+            session_cache.put(cached)
+
+            await asyncio.to_thread(AuthRepository.revoke_user_sessions, db, user_id)
+            await _until(lambda: listener.messages >= 1)
+
+            _notify(f"u:{user_id}")
+            await _until(lambda: session_cache.get(cached.session_id) is None)
+
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                        "WHERE query = :listen"
+                    ),
+                    {"listen": f"LISTEN {CHANNEL}"},
+                )
+            await _until(lambda: listener.reconnects == 1 and listener.connected)
+            _notify("r")
+            await _until(lambda: listener.batches >= 5)  # "*", s, u, "*" (reconexão), r
+            return listener.stats()
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    stats = asyncio.run(scenario())
+    assert stats["connected"] and stats["reconnects"] == 1
+    assert revocation_filter.is_revoked(session_id)
+    session_cache.clear()
+    revocation_filter.clear()
+    rbac_engine.reset()
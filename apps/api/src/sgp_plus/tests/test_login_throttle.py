@@ -0,0 +1,71 @@
+"""Login throttle tests"""
+
+from fastapi.testclient import TestClient
+
+from sgp_plus.core.login_throttle import LoginThrottle, SlidingWindowCounter, login_throttle
+from sgp_plus.db.models.user import User
+
+
+def test_sliding_window_weights_previous_window():
+    """Janela anterior pesa proporcionalmente ao que ainda cabe na janela"""
+    counter = SlidingWindowCounter(limit=4, window_seconds=10, max_keys=10)
+    for t in (0, 1, 2, 3):
+        assert counter.hit("k", t) == 0
+    assert counter.hit("k", 4) > 0  # 4 na janela atual
+
+    # t=15: metade da janela anterior ainda conta (4 * 0.5 = 2) → cabem mais 2
+    assert counter.hit("k", 15) == 0
+    assert counter.hit("k", 15) == 0
+    assert counter.hit("k", 15) > 0
+    # t=25: anterior (10..20) tinha 2 → pesa 1, sobra espaço
+    assert counter.hit("k", 25) == 0
+    # Depois de uma janela inteira sem tentativas, nada do passado conta
+    for _ in range(4):
+        assert counter.hit("k", 50) == 0
+
+
+def test_counter_memory_bounded_by_lru():
+    """Acima de max_keys a chave menos recente sai"""
+    counter = SlidingWindowCounter(limit=1, window_seconds=60, max_keys=2)
+    counter.hit("a", 0)
+    counter.hit("b", 0)
+    counter.hit("c", 0)
+    assert len(counter) == 2
+    assert counter.evictions == 1
+    assert counter.hit("a", 1) == 0  # esquecida: conta de novo
+
+
+def test_email_normalized_and_reset_on_success():
+    """Email é normalizado; login bem-sucedido zera o contador do email"""
+    throttle = LoginThrottle(ip_limit=100, email_limit=2)
+    throttle.check("10.0.0.1", "User@Example.com")
+    throttle.check("10.0.0.2", " user@example.com ")
+    try:
+        throttle.check("10.0.0.3", "USER@example.com")
+        raise AssertionError("expected 429")
+    except Exception as exc:
+        assert exc.status_code == 429
+        assert int(exc.headers["Retry-After"]) >= 1
+
+    throttle.succeeded("user@example.com")
+    throttle.check("10.0.0.4", "user@example.com")
+
+
+def test_login_rejected_before_db_and_bcrypt(
+    client: TestClient, test_user: User, capture_statements, monkeypatch
+):
+    """Acima do limite por IP → 429 sem nenhuma query"""
+    monkeypatch.setattr(login_throttle._ip, "limit", 2)
+    for _ in range(2):
+        response = client.post(
+            "/auth/login", json={"email": "test@example.com", "password": "wrong"}
+        )
+        assert response.status_code == 401
+
+    with capture_statements() as statements:
+        response = client.post(
+            "/auth/login", json={"email": "test@example.com", "password": "password123"}
+        )
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    assert statements == []
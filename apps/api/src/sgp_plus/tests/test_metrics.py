@@ -0,0 +1,109 @@
+"""Metrics registry + /metrics endpoint tests"""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sgp_plus.core.config import Settings, settings
+from sgp_plus.core.metrics import Counter, Histogram, Registry
+from sgp_plus.db import session as db_session
+from sgp_plus.db.models.user import User
+from sgp_plus.db.session import get_db
+from sgp_plus.main import create_app
+from sgp_plus.tests.conftest import TEST_DATABASE_URL
+
+
+def _value(text: str, series: str) -> float:
+    """Value of one exposition line (0 when the series is absent)"""
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_shards_from_many_threads_are_merged():
+    """Cada thread grava no próprio shard; o scrape soma tudo"""
+    registry = Registry()
+    hits = Counter(registry, "hits_total", "Hits", ("kind",))
+    latency = Histogram(registry, "latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            hits.inc("a")
+            latency.observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latency.observe(0.05)
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text
+    assert _value(text, 'hits_total{kind="a"}') == 4000
+    assert _value(text, 'latency_seconds_bucket{le="0.1"}') == 1
+    assert _value(text, 'latency_seconds_bucket{le="1"}') == 4001
+    assert _value(text, 'latency_seconds_bucket{le="+Inf"}') == 4001
+    assert _value(text, "latency_seconds_count") == 4001
+
+
+@pytest.fixture
+def metrics_client(client: TestClient, db):
+    """Client of an app with METRICS_ENABLED (off by default: no auth on /metrics)"""
+    app = create_app(
+        Settings(
+            database_url=TEST_DATABASE_URL,
+            metrics_enabled=True,
+            startup_warmup=False,
+            session_reaper_enabled=False,
+            invalidation_enabled=False,
+        )
+    )
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        yield TestClient(app)
+    finally:
+        db_session.configure(settings)
+
+
+def test_metrics_disabled_by_default(client: TestClient):
+    """Sem METRICS_ENABLED a rota nem existe"""
+    assert not settings.metrics_enabled
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_endpoint_reports_routes_sql_and_sessions(
+    metrics_client: TestClient, test_user: User
+):
+    """/metrics expõe latência/status por rota, SQL por requisição, bcrypt e sessões"""
+    client = metrics_client
+    before = client.get("/metrics").text
+
+    assert client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    ).status_code == 200
+    assert client.get("/auth/me").status_code == 200
+    cookie = client.cookies.get(settings.cookie_name)
+    assert client.post("/auth/logout").status_code == 200
+    assert client.get("/auth/me").status_code == 401
+    # Logout repetido com o cookie antigo não revoga nada: não conta
+    client.cookies.set(settings.cookie_name, cookie)
+    assert client.post("/auth/logout").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    after = response.text
+
+    def delta(series: str) -> float:
+        return _value(after, series) - _value(before, series)
+
+    assert delta('sgp_http_requests_total{method="GET",route="/auth/me",status="200"}') == 1
+    assert delta('sgp_http_requests_total{method="GET",route="/auth/me",status="401"}') == 1
+    assert delta('sgp_http_request_duration_seconds_count{method="POST",route="/auth/login"}') == 1
+    assert delta('sgp_http_request_db_statements_sum{route="/auth/login"}') >= 2
+    assert delta('sgp_password_hash_seconds_count{operation="verify_and_update_password"}') == 1
+    assert delta("sgp_sessions_created_total") == 1
+    assert delta("sgp_sessions_revoked_total") == 1
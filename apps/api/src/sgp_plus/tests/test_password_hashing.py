@@ -0,0 +1,74 @@
+"""Password hashing policy tests (multi-scheme context, rehash on login, calibration)"""
+
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.password_calibration import (
+    BCRYPT_MIN_ROUNDS,
+    recommend_bcrypt_rounds,
+    update_env_file,
+)
+from sgp_plus.core.security import build_password_context
+from sgp_plus.db.models.user import User
+
+
+def test_context_flags_any_other_cost_as_outdated():
+    """Custo diferente do configurado, para cima ou para baixo → needs_update"""
+    low = build_password_context(settings.model_copy(update={"password_bcrypt_rounds": 4}))
+    high = build_password_context(settings.model_copy(update={"password_bcrypt_rounds": 5}))
+
+    low_hash = low.hash("password123")
+    assert not low.needs_update(low_hash)
+    assert high.needs_update(low_hash)
+    assert low.needs_update(high.hash("password123"))
+    assert high.verify("password123", low_hash)
+
+
+def test_login_rehashes_outdated_hash(client: TestClient, db: Session, test_user: User):
+    """Login com hash de custo antigo regrava com o custo atual; senha errada não mexe"""
+    old_hash = bcrypt.using(rounds=4).hash("password123")
+    test_user.password_hash = old_hash
+    db.commit()
+
+    response = client.post("/auth/login", json={"email": "test@example.com", "password": "wrong"})
+    assert response.status_code == 401
+    db.refresh(test_user)
+    assert test_user.password_hash == old_hash
+
+    response = client.post(
+        "/auth/login", json={"email": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+    db.refresh(test_user)
+    assert test_user.password_hash != old_hash
+    assert test_user.password_hash.startswith(f"$2b${settings.password_bcrypt_rounds:02d}$")
+
+    # Já atualizado: próximo login não regrava
+    current = test_user.password_hash
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+    db.refresh(test_user)
+    assert test_user.password_hash == current
+
+
+def test_recommend_bcrypt_rounds():
+    """Cada round dobra o custo; nunca abaixo do piso"""
+    assert recommend_bcrypt_rounds(0.05, 10, 0.25) == 12  # 50ms → 100 → 200 (400 passa)
+    assert recommend_bcrypt_rounds(0.05, 10, 0.2) == 12
+    assert recommend_bcrypt_rounds(0.5, 10, 0.1) == BCRYPT_MIN_ROUNDS
+
+
+def test_update_env_file(tmp_path):
+    """Substitui chaves existentes, preserva o resto e acrescenta as que faltam"""
+    env = tmp_path / ".env"
+    env.write_text("# PASSWORD_BCRYPT_ROUNDS=8\nPASSWORD_BCRYPT_ROUNDS=12\nOTHER=1\n")
+
+    update_env_file(env, {"PASSWORD_BCRYPT_ROUNDS": "13", "PASSWORD_SCHEMES": "bcrypt"})
+
+    assert env.read_text().splitlines() == [
+        "# PASSWORD_BCRYPT_ROUNDS=8",
+        "PASSWORD_BCRYPT_ROUNDS=13",
+        "OTHER=1",
+        "PASSWORD_SCHEMES=bcrypt",
+    ]
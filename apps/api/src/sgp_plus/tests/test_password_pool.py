@@ -0,0 +1,62 @@
+"""Password pool tests (admission control + stats)"""
+
+import asyncio
+import threading
+
+import pytest
+
+from sgp_plus.core.password_pool import PasswordPool
+from sgp_plus.core.security import hash_password
+from sgp_plus.shared.errors import ServiceUnavailableError
+
+
+def test_pool_hash_and_verify():
+    """hash/verify rodam no pool e registram estatísticas"""
+    pool = PasswordPool(kind="thread", workers=2, max_queue=2)
+
+    async def scenario():
+        hashed = await pool.hash("password123")
+        assert await pool.verify("password123", hashed)
+        assert not await pool.verify("wrong", hashed)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["completed"] == 3
+    assert stats["rejected"] == 0
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+def test_pool_rejects_when_saturated():
+    """Acima de workers + max_queue pendentes → 503 imediato"""
+    pool = PasswordPool(kind="thread", workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = [
+            asyncio.ensure_future(pool._submit(release.wait)),
+            asyncio.ensure_future(pool._submit(release.wait)),
+        ]
+        await asyncio.sleep(0.05)
+        assert pool.stats()["in_flight"] == 1
+        assert pool.stats()["queued"] == 1
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await pool.verify("password123", hash_password("password123"))
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+
+        release.set()
+        await asyncio.gather(*blocked)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["completed"] == 2
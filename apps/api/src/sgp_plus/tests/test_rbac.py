@@ -1,37 +1,15 @@
 """RBAC endpoint tests — prova server-side com /admin/ping"""
 
-import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from sgp_plus.db.models.associations import role_inheritance
 from sgp_plus.db.models.user import User
 from sgp_plus.db.models.role import Role
 from sgp_plus.db.models.permission import Permission
-from sgp_plus.core.security import hash_password
-
-
-@pytest.fixture
-def admin_user(db: Session):
-    """Usuário com permissão rbac.manage (admin)."""
-    perm = Permission(id="rbac.manage", code="rbac.manage", name="Manage RBAC")
-    db.add(perm)
-    db.flush()
-
-    role = Role(id="admin", code="admin", name="Administrator")
-    role.permissions = [perm]
-    db.add(role)
-    db.flush()
-
-    user = User(
-        email="admin@test.local",
-        password_hash=hash_password("safe-pass"),
-        is_active=True,
-    )
-    user.roles = [role]
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+from sgp_plus.db.models.rbac_state import RbacState
+from sgp_plus.core.rbac import RbacEngine
+from sgp_plus.core.session_cache import session_cache
 
 
 def test_admin_ping_without_permission(client: TestClient, test_user: User):
@@ -48,7 +26,9 @@ def test_admin_ping_without_permission(client: TestClient, test_user: User):
     assert "Missing permissions" in resp.json().get("detail", "")
 
 
-def test_admin_ping_with_permission(client: TestClient, admin_user: User):
+def test_admin_ping_with_permission(
+    client: TestClient, admin_user: User, capture_statements
+):
     """Admin com rbac.manage → GET /admin/ping retorna 200."""
     login = client.post(
         "/auth/login",
@@ -60,8 +40,143 @@ def test_admin_ping_with_permission(client: TestClient, admin_user: User):
     assert resp.status_code == 200
     assert resp.json() == {"ok": True}
 
+    # Cache frio: uma query por requisição autenticada
+    session_cache.clear()
+    with capture_statements() as statements:
+        assert client.get("/admin/ping").status_code == 200
+    assert len(statements) == 1
+
 
 def test_admin_ping_unauthenticated(client: TestClient):
     """Sem cookie → GET /admin/ping retorna 401."""
     resp = client.get("/admin/ping")
     assert resp.status_code == 401
+
+
+def test_engine_masks_survive_recompilation():
+    """Bits são append-only: máscara exigida na declaração continua válida"""
+    engine = RbacEngine()
+    required = engine.required_mask("users.read", "users.write")
+
+    engine.load(
+        roles=[("reader", "reader", "Reader")],
+        permissions=[("users.read", "users.read", "Read Users")],
+        grants=[("reader", "users.read")],
+    )
+    mask, roles, permissions = engine.catalog.resolve(("reader",))
+    assert mask & required != required
+    assert engine.codes_for_mask(required & ~mask) == ["users.write"]
+    assert [r.code for r in roles] == ["reader"]
+    assert [p.code for p in permissions] == ["users.read"]
+
+    engine.load(
+        roles=[("reader", "reader", "Reader")],
+        permissions=[
+            ("users.read", "users.read", "Read Users"),
+            ("users.write", "users.write", "Write Users"),
+        ],
+        grants=[("reader", "users.read"), ("reader", "users.write")],
+    )
+    mask, _, _ = engine.catalog.resolve(("reader",))
+    assert mask & required == required
+    assert engine.version == 2
+
+
+def test_engine_reloads_when_rbac_version_changes(db: Session, admin_user: User):
+    """Mudança em role_permissions + versão nova → recompila sem restart"""
+    engine = RbacEngine(check_seconds=0)
+    required = engine.required_mask("users.read")
+    db.add(RbacState(id=1, version=1))
+    db.commit()
+
+    engine.refresh(db)
+    assert engine.catalog.resolve(("admin",))[0] & required == 0
+
+    admin_role = db.get(Role, "admin")
+    admin_role.permissions.append(Permission(id="users.read", code="users.read", name="Read"))
+    db.get(RbacState, 1).version = 2
+    db.commit()
+
+    engine.refresh(db)
+    assert engine.catalog.resolve(("admin",))[0] & required == required
+    assert engine.catalog.source_version == 2
+
+
+def test_engine_flattens_inheritance_and_compiles_wildcards():
+    """Herança transitiva e curingas resolvidos na compilação; checagem é um AND"""
+    engine = RbacEngine()
+    approve = engine.required_mask("processos.aprovar")
+    read = engine.required_mask("processos.docs.ler")
+    users = engine.required_mask("users.read")
+
+    engine.load(
+        roles=[("leitor", "leitor", "Leitor"), ("gestor", "gestor", "Gestor"),
+               ("diretor", "diretor", "Diretor"), ("root", "root", "Root")],
+        permissions=[
+            ("users.read", "users.read", "Read Users"),
+            ("processos.*", "processos.*", "Processos"),
+            ("*", "*", "Tudo"),
+        ],
+        grants=[("leitor", "users.read"), ("gestor", "processos.*"), ("root", "*")],
+        inherits=[("gestor", "leitor"), ("diretor", "gestor")],
+    )
+    catalog = engine.catalog
+    assert catalog.resolve(("leitor",))[0] & (approve | read) == 0
+    for role_id in ("gestor", "diretor"):
+        mask = catalog.resolve((role_id,))[0]
+        assert mask & (approve | read | users) == approve | read | users
+    # Papel atribuído continua só o do usuário; permissões são as efetivas
+    _, roles, permissions = catalog.resolve(("diretor",))
+    assert [r.code for r in roles] == ["diretor"]
+    assert {p.code for p in permissions} == {"users.read", "processos.*"}
+    assert catalog.resolve(("root",))[0] & (approve | read | users) == approve | read | users
+
+    # Código exigido depois da compilação também é coberto pelo curinga
+    late = engine.required_mask("processos.arquivar")
+    assert engine.catalog.resolve(("diretor",))[0] & late == late
+    assert engine.catalog.resolve(("leitor",))[0] & late == 0
+
+
+def test_engine_inheritance_cycle_shares_permissions():
+    engine = RbacEngine()
+    engine.load(
+        roles=[("a", "a", "A"), ("b", "b", "B")],
+        permissions=[("x.1", "x.1", "1"), ("x.2", "x.2", "2")],
+        grants=[("a", "x.1"), ("b", "x.2")],
+        inherits=[("a", "b"), ("b", "a")],
+    )
+    both = engine.required_mask("x.1", "x.2")
+    assert engine.catalog.resolve(("a",))[0] == engine.catalog.resolve(("b",))[0] == both
+
+
+def test_engine_refresh_loads_role_inheritance(db: Session, admin_user: User):
+    engine = RbacEngine(check_seconds=0)
+    required = engine.required_mask("rbac.manage")
+    db.add(Role(id="super", code="super", name="Super"))
+    db.commit()
+    db.execute(role_inheritance.insert().values(role_id="super", included_role_id="admin"))
+    db.commit()
+
+    engine.refresh(db)
+    assert engine.catalog.resolve(("super",))[0] & required == required
+
+
+def test_engine_unknown_role_does_not_reload_every_request(
+    db: Session, admin_user: User, capture_statements
+):
+    """Role apagada com sessão em cache: confere uma vez e não recarrega a cada requisição"""
+    engine = RbacEngine(check_seconds=60)
+    engine.refresh(db, ("admin", "deleted"))
+    assert not engine._needs_check(("admin", "deleted"))
+
+    with capture_statements() as statements:
+        for _ in range(5):
+            if engine._needs_check(("admin", "deleted")):
+                engine.refresh(db, ("admin", "deleted"))
+    assert statements == []
+
+    # Na checagem periódica, versão igual e role ainda ausente: sem recompilar
+    builds = engine.version
+    engine.refresh(db, ("admin", "deleted"))
+    assert engine.version == builds
+    assert engine.catalog.resolve(("admin", "deleted"))[1] == (engine.catalog.roles["admin"],)
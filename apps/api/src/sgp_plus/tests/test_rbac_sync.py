@@ -0,0 +1,133 @@
+"""Declarative RBAC catalog sync tests"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sgp_plus.db.models.associations import role_inheritance, role_permissions
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.rbac_state import RbacState
+from sgp_plus.db.models.role import Role
+from sgp_plus.db.rbac_sync import CatalogSpec, load_catalog, sync_catalog
+
+
+def _spec(permissions: int, roles: dict[str, set[int]]) -> CatalogSpec:
+    return CatalogSpec(
+        permissions={f"mod.p{i}": f"Permissão {i}" for i in range(permissions)},
+        roles={
+            code: (code.title(), frozenset(f"mod.p{i}" for i in granted))
+            for code, granted in roles.items()
+        },
+    )
+
+
+def _grants(db: Session) -> set[tuple[str, str]]:
+    return set(db.execute(select(role_permissions.c.role_id, role_permissions.c.permission_id)))
+
+
+def test_load_catalog_rejects_undeclared_permission(tmp_path):
+    path = tmp_path / "catalog.toml"
+    path.write_text('[permissions]\n"a.read" = "A"\n\n[roles.x]\npermissions = ["a.write"]\n')
+    with pytest.raises(ValueError, match="a.write"):
+        load_catalog(path)
+
+
+def test_load_catalog_rejects_inheritance_cycle(tmp_path):
+    path = tmp_path / "catalog.toml"
+    path.write_text(
+        "[roles.a]\nincludes = [\"b\"]\n\n[roles.b]\nincludes = [\"c\"]\n\n"
+        "[roles.c]\nincludes = [\"a\"]\n"
+    )
+    with pytest.raises(ValueError, match="a → b → c → a"):
+        load_catalog(path)
+
+
+def test_load_catalog_accepts_wildcards_only_at_the_end(tmp_path):
+    path = tmp_path / "catalog.toml"
+    path.write_text(
+        '[permissions]\n"proc.*" = "Processos"\n\n[roles.x]\npermissions = ["proc.*"]\n'
+    )
+    assert load_catalog(path).roles["x"][1] == {"proc.*"}
+
+    path.write_text('[permissions]\n"proc.*.read" = "?"\n')
+    with pytest.raises(ValueError, match="curinga"):
+        load_catalog(path)
+
+
+def test_default_catalog_loads():
+    spec = load_catalog()
+    assert "rbac.manage" in spec.roles["admin"][1]
+
+
+def test_sync_is_set_based_and_idempotent(db: Session, capture_statements):
+    """Centenas de permissões em poucos statements; segundo sync só lê"""
+    spec = _spec(300, {"admin": set(range(300)), "leitor": set(range(0, 300, 2))})
+
+    dry = sync_catalog(db, spec, dry_run=True)
+    assert len(dry.permissions_added) == 300
+    assert db.scalar(select(Permission.id).limit(1)) is None
+
+    with capture_statements() as statements:
+        applied = sync_catalog(db, spec)
+    assert len(applied.grants_added) == 450
+    # lock + 4 leituras + permissões + roles + grants + versão (+ commit)
+    assert len(statements) <= 10
+    assert len(_grants(db)) == 450
+    assert db.get(RbacState, 1).version == 1
+
+    with capture_statements() as statements:
+        again = sync_catalog(db, spec)
+    assert again.is_empty()
+    assert len(statements) == 5  # lock + 4 leituras
+    db.expire_all()
+    assert db.get(RbacState, 1).version == 1
+
+
+def test_sync_applies_changes_and_leaves_unmanaged_alone(db: Session):
+    """Renomeia, ajusta grants das roles do catálogo; --prune remove o resto"""
+    sync_catalog(db, _spec(3, {"admin": {0, 1, 2}, "leitor": {0}}))
+    db.add(Role(id="legado", code="legado", name="Legado"))
+    db.commit()
+    db.execute(role_permissions.insert().values(role_id="legado", permission_id="mod.p2"))
+    db.commit()
+
+    spec = _spec(3, {"admin": {0, 1}, "leitor": {0, 1}})
+    spec.permissions["mod.p1"] = "Nome novo"
+    result = sync_catalog(db, spec)
+
+    assert result.permissions_renamed == {"mod.p1": ("Permissão 1", "Nome novo")}
+    assert result.grants_removed == {("admin", "mod.p2")}
+    assert result.grants_added == {("leitor", "mod.p1")}
+    assert result.roles_unmanaged == {"legado"}
+    db.expire_all()
+    assert db.get(Permission, "mod.p1").name == "Nome novo"
+    assert ("legado", "mod.p2") in _grants(db)
+    assert db.get(RbacState, 1).version == 2
+
+    sync_catalog(db, spec, prune=True)
+    db.expire_all()
+    assert db.get(Role, "legado") is None
+    assert all(role != "legado" for role, _ in _grants(db))
+
+
+def test_sync_manages_role_inheritance(db: Session):
+    """includes viram linhas de role_inheritance; roles fora do catálogo ficam"""
+    spec = _spec(2, {"leitor": {0}, "editor": {1}, "gestor": set()})
+    spec.includes.update(gestor=frozenset({"editor"}), editor=frozenset({"leitor"}))
+    result = sync_catalog(db, spec)
+    assert result.inherits_added == {("gestor", "editor"), ("editor", "leitor")}
+
+    spec.includes.pop("editor")
+    spec.includes["gestor"] = frozenset({"editor", "leitor"})
+    result = sync_catalog(db, spec)
+    assert result.inherits_added == {("gestor", "leitor")}
+    assert result.inherits_removed == {("editor", "leitor")}
+    assert set(db.execute(select(role_inheritance))) == {
+        ("gestor", "editor"),
+        ("gestor", "leitor"),
+    }
+
+    del spec.roles["editor"]
+    spec.includes["gestor"] = frozenset({"leitor"})
+    sync_catalog(db, spec, prune=True)
+    assert set(db.execute(select(role_inheritance))) == {("gestor", "leitor")}
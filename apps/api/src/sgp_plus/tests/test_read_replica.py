@@ -0,0 +1,147 @@
+"""Read-replica routing tests
+
+A réplica atrasada é simulada por uma Session REPEATABLE READ cujo snapshot foi
+tirado antes das escritas: ela enxerga o banco como estava naquele instante.
+"""
+
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import Settings
+from sgp_plus.core.read_routing import ReadRouting, read_routing
+from sgp_plus.core.security import hash_password
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.role import Role
+from sgp_plus.db.models.user import User
+from sgp_plus.db.session import Database, get_read_db
+from sgp_plus.features.auth.repository import AuthRepository
+from sgp_plus.main import app
+from sgp_plus.tests.conftest import TEST_DATABASE_URL, TestingSessionLocal
+
+
+@contextmanager
+def lagging_replica():
+    """Replica frozen at this point in time, routed for get_read_db"""
+    replica = TestingSessionLocal()
+    replica.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    replica.execute(text("SELECT 1"))  # tira o snapshot agora
+
+    def override_get_read_db():
+        yield replica
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    read_routing.enabled = True
+    read_routing.clear()
+    try:
+        yield replica
+    finally:
+        read_routing.enabled = False
+        read_routing.clear()
+        app.dependency_overrides.pop(get_read_db, None)
+        replica.close()
+
+
+def _login(client: TestClient) -> None:
+    response = client.post(
+        "/auth/login", json={"email": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+
+
+def test_replica_settings_and_engine_fallback():
+    """Sem DATABASE_REPLICA_URL as leituras usam o engine primário"""
+    assert Settings(database_replica_url=" ").database_replica_url is None
+    with pytest.raises(ValueError):
+        Settings(replica_stick_seconds=-1)
+
+    primary_only = Database(Settings(database_url=TEST_DATABASE_URL))
+    assert not primary_only.has_replica
+    assert primary_only.replica_engine is primary_only.engine
+    assert "replica" not in primary_only.pool_stats()
+
+    database = Database(
+        Settings(database_url=TEST_DATABASE_URL, database_replica_url=TEST_DATABASE_URL)
+    )
+    assert database.replica_engine is not database.engine
+    assert database.pool_stats().keys() == {"sync", "replica"}
+
+
+def test_routing_sticky_windows():
+    """Sessão grudada no primário até a janela expirar; stick_all vale para todas"""
+    routing = ReadRouting(stick_seconds=0.05)
+    stuck, other = uuid4(), uuid4()
+    routing.stick((stuck,))
+    assert not routing.use_replica(stuck)
+    assert routing.use_replica(other)
+    time.sleep(0.06)
+    assert routing.use_replica(stuck)
+
+    routing.stick_all()
+    assert not routing.use_replica(other)
+    assert routing.stats()["primary_reads"] == 2
+    assert routing.stats()["replica_reads"] == 2
+
+    disabled = ReadRouting(enabled=False)
+    disabled.stick((stuck,))
+    assert not disabled.use_replica(other)
+    assert disabled.stats()["sticky_sessions"] == 0
+
+
+def test_fresh_login_falls_back_to_primary(client: TestClient, test_user: User):
+    """Réplica sem a sessão recém-criada: /auth/me confirma no primário"""
+    with lagging_replica():
+        _login(client)
+        # Outro worker: sem cache e sem a janela do create_session
+        session_cache.clear()
+        read_routing.clear()
+        fallbacks = read_routing.fallbacks
+
+        assert client.get("/auth/me").status_code == 200
+        assert read_routing.fallbacks == fallbacks + 1
+
+
+def test_new_session_and_revocation_stay_on_primary(
+    client: TestClient, db: Session, test_user: User
+):
+    """Logo após create/revoke a leitura vai ao primário, não à réplica atrasada"""
+    _login(client)
+    (session,) = AuthRepository.list_active_sessions(db, test_user.id)
+    session_id = session.id
+
+    with lagging_replica() as replica:
+        AuthRepository.revoke_session(db, session_id)
+        session_cache.clear()
+        replica_reads = read_routing.replica_reads
+        # A réplica ainda vê a sessão válida...
+        assert AuthRepository.get_principal(replica, session_id) is not None
+        # ...mas a revogação grudou a sessão no primário
+        assert client.get("/auth/me").status_code == 401
+        assert read_routing.replica_reads == replica_reads
+
+
+def test_user_listing_reads_from_replica(client: TestClient, db: Session):
+    """GET /users lê da réplica (usuário criado depois do snapshot não aparece)"""
+    role = Role(id="leitor", code="leitor", name="Leitor")
+    role.permissions = [Permission(id="users.read", code="users.read", name="Read Users")]
+    reader = User(email="reader@test.local", password_hash=hash_password("safe-pass"))
+    reader.roles = [role]
+    db.add(reader)
+    db.commit()
+    client.post("/auth/login", json={"email": "reader@test.local", "password": "safe-pass"})
+
+    with lagging_replica():
+        db.add(User(email="late@test.local", password_hash="x"))
+        db.commit()
+        emails = {item["email"] for item in client.get("/users").json()["items"]}
+
+    assert "late@test.local" not in emails
+    assert {item["email"] for item in client.get("/users").json()["items"]} >= {
+        "late@test.local"
+    }
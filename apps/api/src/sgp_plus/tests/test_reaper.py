@@ -0,0 +1,54 @@
+"""Session reaper tests"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.models.user import User
+from sgp_plus.db.reaper import reap_sessions
+
+
+def _session(user: User, *, expires_in: timedelta, revoked_ago: timedelta | None = None):
+    now = datetime.utcnow()
+    return SessionModel(
+        user_id=user.id,
+        expires_at=now + expires_in,
+        revoked_at=now - revoked_ago if revoked_ago is not None else None,
+    )
+
+
+def test_reaper_deletes_only_past_retention_in_batches(db, test_user: User):
+    """Expiradas/revogadas além da retenção saem em lotes; o resto fica"""
+    old_expired = [_session(test_user, expires_in=timedelta(hours=-48)) for _ in range(3)]
+    old_revoked = _session(
+        test_user, expires_in=timedelta(hours=1), revoked_ago=timedelta(hours=30)
+    )
+    recent_expired = _session(test_user, expires_in=timedelta(hours=-1))
+    recent_revoked = _session(
+        test_user, expires_in=timedelta(hours=1), revoked_ago=timedelta(hours=1)
+    )
+    active = _session(test_user, expires_in=timedelta(hours=1))
+    db.add_all([*old_expired, old_revoked, recent_expired, recent_revoked, active])
+    db.commit()
+    kept = {recent_expired.id, recent_revoked.id, active.id}
+
+    result = reap_sessions(db, retention_hours=24, batch_size=2)
+
+    assert result.deleted == 4
+    assert result.batches == 2
+    assert set(db.scalars(select(SessionModel.id))) == kept
+    assert reap_sessions(db, retention_hours=24, batch_size=2).deleted == 0
+
+
+def test_reaper_keeps_revoked_rows_until_expiry_in_signed_mode(db, test_user: User, monkeypatch):
+    """Modo signed: linha revogada só sai depois de expirar (filtro de revogação)"""
+    from sgp_plus.core.config import settings
+
+    monkeypatch.setattr(settings, "session_token_mode", "signed")
+    revoked = _session(test_user, expires_in=timedelta(hours=1), revoked_ago=timedelta(hours=30))
+    db.add(revoked)
+    db.commit()
+
+    assert reap_sessions(db, retention_hours=24).deleted == 0
+    assert db.get(SessionModel, revoked.id) is not None
@@ -0,0 +1,81 @@
+"""Write-behind session activity tests (last_seen_at + sliding expiry)"""
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.session_activity import SessionActivity, session_activity
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.models.user import User
+
+
+def test_flush_coalesces_into_one_update(db: Session, test_user: User, capture_statements):
+    """Vários acessos viram uma linha por sessão num único UPDATE ... FROM (VALUES)"""
+    now = datetime.utcnow()
+    active = SessionModel(user_id=test_user.id, expires_at=now + timedelta(minutes=5))
+    other = SessionModel(user_id=test_user.id, expires_at=now + timedelta(minutes=5))
+    revoked = SessionModel(
+        user_id=test_user.id, expires_at=now + timedelta(minutes=5), revoked_at=now
+    )
+    db.add_all([active, other, revoked])
+    db.commit()
+
+    activity = SessionActivity()
+    for _ in range(5):
+        activity.touch(active.id)
+    activity.touch(other.id)
+    last_seen = datetime.utcnow()
+    activity.touch(active.id, last_seen)
+    activity.touch(revoked.id)
+
+    with capture_statements() as statements:
+        assert activity.flush(db) == 3
+    assert len(statements) == 1
+    assert "FROM (VALUES" in statements[0]
+
+    db.expire_all()
+    assert db.get(SessionModel, active.id).last_seen_at == last_seen
+    assert db.get(SessionModel, active.id).expires_at > now + timedelta(hours=1)
+    assert db.get(SessionModel, other.id).last_seen_at is not None
+    assert db.get(SessionModel, revoked.id).last_seen_at is None
+    assert activity.stats() == {"pending": 0, "flushed": 3}
+    assert activity.flush(db) == 0
+
+
+def test_authenticated_requests_do_not_write(
+    client: TestClient, test_user: User, capture_statements
+):
+    """GET /auth/me só marca atividade em memória"""
+    assert client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    ).status_code == 200
+
+    with capture_statements() as statements:
+        for _ in range(3):
+            assert client.get("/auth/me").status_code == 200
+    assert statements == []
+    assert session_activity.stats()["pending"] == 1
+
+
+def test_cookie_refreshed_past_half_ttl(client: TestClient, test_user: User):
+    """Sessão perto de expirar recebe cookie novo (e expiração nova no cache)"""
+    assert client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    ).status_code == 200
+    assert "set-cookie" not in client.get("/auth/me").headers
+
+    session_id = UUID(client.cookies["sgp_plus_session"])
+    principal = session_cache.get(session_id)
+    session_cache.put(
+        replace(principal, session_expires_at=datetime.utcnow() + timedelta(minutes=1))
+    )
+    response = client.get("/auth/me")
+    assert response.status_code == 200
+    assert "sgp_plus_session=" in response.headers["set-cookie"]
+    assert session_cache.get(session_id).session_expires_at > datetime.utcnow() + timedelta(hours=1)
@@ -0,0 +1,89 @@
+"""Session principal cache tests"""
+
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.session_cache import SessionCache, session_cache
+from sgp_plus.db.models.user import User
+
+
+def _principal(expires_in: timedelta = timedelta(hours=1)) -> Principal:
+    return Principal(
+        id=uuid4(),
+        email="cache@example.com",
+        is_active=True,
+        created_at=datetime.utcnow(),
+        role_ids=("r",),
+        session_id=uuid4(),
+        session_expires_at=datetime.utcnow() + expires_in,
+    )
+
+
+def test_cache_hit_miss_and_lru_eviction():
+    """LRU limitado com contadores de hit/miss/eviction"""
+    cache = SessionCache(max_entries=2)
+    a, b, c = _principal(), _principal(), _principal()
+    cache.put(a)
+    cache.put(b)
+    assert cache.get(a.session_id) is a  # a passa a ser o mais recente
+    cache.put(c)  # evicta b
+
+    assert cache.get(b.session_id) is None
+    assert cache.get(c.session_id) is c
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_cache_ttl_capped_by_session_expiry():
+    """TTL nunca ultrapassa expires_at da sessão"""
+    cache = SessionCache(ttl_seconds=60)
+    principal = _principal(expires_in=timedelta(milliseconds=50))
+    cache.put(principal)
+    assert cache.get(principal.session_id) is principal
+    time.sleep(0.1)
+    assert cache.get(principal.session_id) is None
+
+    expired = _principal(expires_in=timedelta(seconds=-1))
+    cache.put(expired)
+    assert cache.get(expired.session_id) is None
+
+
+def test_invalidate_is_immediate_and_blocks_stale_put():
+    """Revogação remove na hora e impede re-cache por uma query em voo"""
+    cache = SessionCache()
+    principal = _principal()
+    cache.put(principal)
+    cache.invalidate(principal.session_id)
+
+    assert cache.get(principal.session_id) is None
+    assert cache.is_negative(principal.session_id)
+    cache.put(principal)
+    assert cache.get(principal.session_id) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_me_warm_cache_runs_no_queries(
+    client: TestClient, test_user: User, capture_statements
+):
+    """Depois do login, /auth/me e cookies inválidos repetidos não vão ao banco"""
+    assert client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    ).status_code == 200
+
+    bogus = str(uuid4())
+    assert client.get("/auth/me", cookies={"sgp_plus_session": bogus}).status_code == 401
+
+    with capture_statements() as statements:
+        for _ in range(3):
+            assert client.get("/auth/me").status_code == 200
+            assert client.get("/auth/me", cookies={"sgp_plus_session": bogus}).status_code == 401
+
+    assert statements == []
+    assert session_cache.stats()["negative_hits"] >= 3
@@ -0,0 +1,104 @@
+"""Session listing and bulk revocation tests"""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.core.session_tokens import revocation_filter
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.models.user import User
+from sgp_plus.features.auth.repository import AuthRepository
+from sgp_plus.main import app
+
+
+def _login(client: TestClient, email: str = "test@example.com", password: str = "password123"):
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+
+
+def _sql(statements: list[str]) -> list[str]:
+    return [s.split()[0].upper() for s in statements]
+
+
+def test_logout_is_a_single_update(client: TestClient, test_user: User, capture_statements):
+    _login(client)
+    with capture_statements() as statements:
+        assert client.post("/auth/logout").status_code == 200
+    assert _sql(statements) == ["UPDATE"]
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_revoke_user_sessions_in_one_statement(
+    db: Session, test_user: User, capture_statements
+):
+    """Só sessões válidas do usuário, filtradas; caches do worker invalidados"""
+    repository = AuthRepository()
+    sessions = [repository.create_session(db, test_user.id) for _ in range(4)]
+    expired = sessions[3]
+    expired.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    sessions[2].created_at = datetime.utcnow() - timedelta(days=2)
+    db.commit()
+    user_id, keep = test_user.id, sessions[0].id
+
+    with capture_statements() as statements:
+        revoked = repository.revoke_user_sessions(
+            db,
+            user_id,
+            exclude_session_id=keep,
+            created_before=datetime.utcnow() - timedelta(days=1),
+        )
+    assert _sql(statements) == ["UPDATE"]
+    assert revoked == [sessions[2].id]
+    assert revocation_filter.is_revoked(sessions[2].id)
+    assert session_cache.is_negative(sessions[2].id)
+
+    revoked = repository.revoke_user_sessions(db, test_user.id)
+    assert set(revoked) == {sessions[0].id, sessions[1].id}
+    assert repository.list_active_sessions(db, test_user.id) == []
+    assert db.get(SessionModel, expired.id).revoked_at is None
+
+
+def test_revoke_my_other_sessions(client: TestClient, test_user: User):
+    """Outro dispositivo cai na hora (cache), o atual continua logado"""
+    _login(client)
+    other = TestClient(app)
+    _login(other)
+    assert other.get("/auth/me").status_code == 200
+
+    sessions = client.get("/auth/sessions").json()
+    assert len(sessions) == 2
+    assert sum(s["current"] for s in sessions) == 1
+
+    response = client.post("/auth/sessions/revoke", json={})
+    assert response.status_code == 200
+    assert len(response.json()["revoked"]) == 1
+    assert other.get("/auth/me").status_code == 401
+    assert client.get("/auth/me").status_code == 200
+
+    response = client.post("/auth/sessions/revoke", json={"include_current": True})
+    assert len(response.json()["revoked"]) == 1
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_admin_revokes_user_sessions(
+    client: TestClient, db: Session, test_user: User, admin_user: User
+):
+    """users.read lista, users.write revoga (todas, com corpo vazio)"""
+    for code in ("users.read", "users.write"):
+        admin_user.roles[0].permissions.append(Permission(id=code, code=code, name=code))
+    db.commit()
+
+    other = TestClient(app)
+    _login(other)
+    assert other.get(f"/users/{test_user.id}/sessions").status_code == 403
+    _login(client, "admin@test.local", "safe-pass")
+
+    sessions = client.get(f"/users/{test_user.id}/sessions").json()
+    assert [s["current"] for s in sessions] == [False]
+    response = client.post(f"/users/{test_user.id}/sessions/revoke", json={})
+    assert response.json()["revoked"] == [sessions[0]["id"]]
+    assert other.get("/auth/me").status_code == 401
+    assert client.get(f"/users/{test_user.id}/sessions").json() == []
@@ -0,0 +1,198 @@
+"""Signed session token + revocation filter tests"""
+
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.principal import Principal
+from sgp_plus.core.session_cache import session_cache
+from sgp_plus.core.session_tokens import (
+    RevocationFilter,
+    _b64encode,
+    _signature,
+    revocation_filter,
+    sign_session_token,
+    verify_session_token,
+)
+from sgp_plus.db.models.associations import user_roles
+from sgp_plus.db.models.session import Session as SessionModel
+from sgp_plus.db.models.user import User
+
+SECRET = "x" * 32
+
+
+@pytest.fixture
+def signed_mode(monkeypatch):
+    monkeypatch.setattr(settings, "session_token_mode", "signed")
+    monkeypatch.setattr(settings, "session_token_secret", SECRET)
+
+
+def _principal(expires_in: timedelta = timedelta(hours=1)) -> Principal:
+    return Principal(
+        id=uuid4(),
+        email="token@example.com",
+        is_active=True,
+        created_at=datetime(2026, 1, 2, 3, 4, 5),
+        role_ids=("a", "b"),
+        session_id=uuid4(),
+        session_expires_at=datetime.utcnow() + expires_in,
+    )
+
+
+def test_token_roundtrip_and_tampering(signed_mode):
+    """Assinatura válida devolve os claims; qualquer alteração invalida"""
+    principal = _principal()
+    token = sign_session_token(principal, rbac_version=7)
+
+    claims = verify_session_token(token)
+    assert claims.session_id == principal.session_id
+    assert claims.rbac_version == 7
+    assert replace(claims.to_principal(), session_expires_at=None) == replace(
+        principal, session_expires_at=None
+    )
+
+    prefix, payload, signature = token.split(".")
+    forged = sign_session_token(replace(principal, role_ids=("admin",)), rbac_version=7)
+    assert verify_session_token(f"{prefix}.{forged.split('.')[1]}.{signature}") is None
+    assert verify_session_token(token[:-2]) is None
+    assert verify_session_token(str(principal.session_id)) is None
+
+
+def test_non_ascii_token_is_rejected(signed_mode, client: TestClient):
+    """Cookie com bytes não-ASCII vira 401, não 500"""
+    assert verify_session_token("v1.é.abc") is None
+    assert verify_session_token(f"v1.abc.{'é' * 43}") is None
+
+    cookie = "sgp_plus_session=v1.é.abc".encode("latin-1")
+    assert client.get("/auth/me", headers={"Cookie": cookie}).status_code == 401
+
+
+def test_expired_token_rejected(signed_mode):
+    """Token expirado só é aceito com check_expiry=False (logout)"""
+    principal = _principal(expires_in=timedelta(seconds=-5))
+    token = sign_session_token(principal, rbac_version=1)
+    assert verify_session_token(token) is None
+    assert verify_session_token(token, check_expiry=False).session_id == principal.session_id
+
+
+def test_revocation_filter_syncs_incrementally(db, test_user: User):
+    """Filtro carrega revogadas não expiradas e depois só o que mudou"""
+    now = datetime.utcnow()
+    revoked = SessionModel(
+        user_id=test_user.id, expires_at=now + timedelta(hours=1), revoked_at=now
+    )
+    stale = SessionModel(user_id=test_user.id, expires_at=now - timedelta(hours=1), revoked_at=now)
+    active = SessionModel(user_id=test_user.id, expires_at=now + timedelta(hours=1))
+    db.add_all([revoked, stale, active])
+    db.commit()
+
+    revocations = RevocationFilter(sync_seconds=0)
+    revocations.sync(db)
+    assert revocations.is_revoked(revoked.id)
+    assert not revocations.is_revoked(stale.id)
+    assert not revocations.is_revoked(active.id)
+
+    active.revoked_at = datetime.utcnow()
+    db.commit()
+    revocations.sync(db)
+    assert revocations.is_revoked(active.id)
+    assert len(revocations) == 2
+
+
+def test_signed_me_skips_database_until_logout(
+    signed_mode, client: TestClient, test_user: User, capture_statements
+):
+    """Modo signed: /auth/me sem cache nem banco; logout revoga na hora"""
+    response = client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    assert response.cookies["sgp_plus_session"].startswith("v1.")
+
+    assert client.get("/auth/me").status_code == 200  # primeira sync do filtro
+    session_cache.clear()
+    with capture_statements() as statements:
+        for _ in range(3):
+            me = client.get("/auth/me")
+            assert me.status_code == 200
+            assert me.json()["user"]["email"] == "test@example.com"
+    assert statements == []
+
+    token = client.cookies["sgp_plus_session"]
+    assert client.post("/auth/logout").status_code == 200
+    response = client.get("/auth/me", cookies={"sgp_plus_session": token})
+    assert response.status_code == 401
+
+
+def _legacy_token(principal: Principal) -> str:
+    """v1 token as issued before issued_at was added (7 fields)"""
+    payload = _b64encode(json.dumps([
+        principal.session_id.hex,
+        principal.id.hex,
+        int((principal.session_expires_at - datetime(1970, 1, 1)).total_seconds()),
+        1,
+        list(principal.role_ids),
+        principal.email,
+        principal.created_at.isoformat(),
+    ]).encode())
+    return f"v1.{payload}.{_signature(payload)}"
+
+
+def test_user_change_makes_older_tokens_stale(signed_mode, db, test_user: User):
+    """access_changed_at (trigger da 0009) vem na sync: token anterior fica velho"""
+    principal = replace(_principal(), id=test_user.id)
+    before = verify_session_token(sign_session_token(principal, rbac_version=1))
+    legacy = verify_session_token(_legacy_token(principal))
+    assert legacy.session_id == principal.session_id
+    filter_ = RevocationFilter()
+    filter_.sync(db)
+    assert not filter_.is_stale(before) and not filter_.is_stale(legacy)
+
+    db.execute(
+        update(User)
+        .where(User.id == test_user.id)
+        .values(access_changed_at=datetime.utcnow() + timedelta(seconds=1))
+    )
+    db.commit()
+    filter_.sync(db)
+    assert filter_.is_stale(before) and filter_.is_stale(legacy)
+    assert not filter_.is_stale(replace(before, issued_at=datetime.utcnow() + timedelta(seconds=2)))
+
+
+def _touch_user(db, user: User) -> None:
+    """What the 0009 triggers do (tests build the schema with create_all, no triggers)"""
+    db.execute(
+        update(User).where(User.id == user.id).values(access_changed_at=datetime.utcnow())
+    )
+    db.commit()
+    revocation_filter.expire()  # sem esperar REVOCATION_SYNC_SECONDS
+
+
+def test_signed_token_loses_removed_role_and_deactivated_user(
+    signed_mode, client: TestClient, db, admin_user: User
+):
+    """Role removida e usuário desativado valem antes do token expirar"""
+    client.post("/auth/login", json={"email": "admin@test.local", "password": "safe-pass"})
+    assert client.get("/admin/ping").status_code == 200
+    old_token = client.cookies["sgp_plus_session"]
+
+    db.execute(delete(user_roles).where(user_roles.c.user_id == admin_user.id))
+    _touch_user(db, admin_user)
+    assert client.get("/admin/ping").status_code == 403
+    me = client.get("/auth/me")
+    assert me.status_code == 200 and me.json()["roles"] == []
+    # Token reemitido com as roles atuais; o antigo continua sem valer como admin
+    assert client.cookies["sgp_plus_session"] != old_token
+    response = client.get("/admin/ping", cookies={"sgp_plus_session": old_token})
+    assert response.status_code == 403
+
+    db.execute(update(User).where(User.id == admin_user.id).values(is_active=False))
+    _touch_user(db, admin_user)
+    assert client.get("/auth/me").status_code == 401
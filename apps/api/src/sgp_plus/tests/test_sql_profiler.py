@@ -0,0 +1,65 @@
+"""SQL profiler + query budget tests"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sgp_plus.core import sql_profiler
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.role import Role
+from sgp_plus.db.models.user import User
+
+
+def test_statement_shape_collapses_in_lists():
+    """Mesmo SQL com listas IN de tamanhos diferentes tem o mesmo formato"""
+    a = sql_profiler.statement_shape("SELECT * FROM roles WHERE id IN (%(a)s, %(b)s)")
+    b = sql_profiler.statement_shape("SELECT *\n  FROM roles WHERE id IN (%(a)s)")
+    assert a == b == "SELECT * FROM roles WHERE id IN (...)"
+
+
+def test_capture_flags_lazy_loading_as_n_plus_one(db: Session):
+    """Percorrer role.permissions sem eager load vira N+1 com call site"""
+    for i in range(3):
+        role = Role(id=f"r{i}", code=f"r{i}", name=f"Role {i}")
+        role.permissions = [Permission(id=f"p{i}", code=f"p{i}", name=f"Perm {i}")]
+        db.add(role)
+    db.commit()
+    db.expire_all()
+
+    with sql_profiler.capture(n_plus_one_threshold=3) as profile:
+        for role in db.scalars(select(Role)).all():
+            assert len(role.permissions) == 1
+
+    [(shape, count, site)] = profile.repeated()
+    assert count == 3
+    assert "role_permissions" in shape
+    assert site.startswith("tests/test_sql_profiler.py:")
+    assert "n_plus_one=1" in profile.summary()
+
+
+def test_profile_header_only_for_admins(client: TestClient, admin_user: User, test_user: User):
+    """X-SQL-Profile: 1 devolve o resumo só para quem tem rbac.manage"""
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+    response = client.get("/auth/me", headers={"X-SQL-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-sql-profile" not in response.headers
+
+    client.post("/auth/login", json={"email": "admin@test.local", "password": "safe-pass"})
+    response = client.get("/admin/ping", headers={"X-SQL-Profile": "1"})
+    assert response.status_code == 200
+    assert response.headers["x-sql-profile"].startswith("statements=")
+    assert client.get("/admin/ping").headers.get("x-sql-profile") is None
+
+
+def test_login_me_logout_within_query_budget(client: TestClient, test_user: User, query_budget):
+    """Orçamento de queries do fluxo de autenticação (sem N+1), catálogo RBAC já carregado"""
+    credentials = {"email": "test@example.com", "password": "password123"}
+    assert client.post("/auth/login", json=credentials).status_code == 200
+
+    # usuário + roles (selectin), INSERT da sessão + refresh
+    with query_budget(4):
+        assert client.post("/auth/login", json=credentials).status_code == 200
+    with query_budget(0):
+        assert client.get("/auth/me").status_code == 200
+    with query_budget(2):
+        assert client.post("/auth/logout").status_code == 200
@@ -0,0 +1,150 @@
+"""Bulk user import tests"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.security import verify_password
+from sgp_plus.db.models.associations import user_roles
+from sgp_plus.db.models.user import User
+from sgp_plus.features.users.importer import (
+    RowError,
+    Utf8Check,
+    import_users,
+    parse_csv,
+    parse_ndjson,
+)
+
+
+def test_parsers_report_bad_rows_with_line_numbers():
+    """Cabeçalho, JSON, email e is_active inválidos viram RowError com a linha"""
+    assert list(parse_csv(["nome,senha\n", "a,b\n"])) == [
+        RowError(1, None, "cabeçalho precisa das colunas email e password")
+    ]
+
+    rows = list(parse_csv([
+        "email,password,roles,is_active\n",
+        " Ana@Example.com ,pw,admin|leitor|admin,não\n",
+        "sem-arroba,pw,,\n",
+        "b@example.com,pw,,talvez\n",
+    ]))
+    assert rows[0].line == 2
+    assert (rows[0].email, rows[0].roles, rows[0].is_active) == (
+        "ana@example.com", ("admin", "leitor"), False,
+    )
+    assert isinstance(rows[1], RowError) and rows[1].line == 3
+    assert isinstance(rows[2], RowError) and "is_active" in rows[2].error
+
+    rows = list(parse_ndjson([
+        '{"email": "c@example.com", "password": "pw", "roles": ["leitor"]}\n',
+        "\n",
+        "{quebrado\n",
+        "[1, 2]\n",
+    ]))
+    assert rows[0].roles == ("leitor",) and rows[0].is_active
+    assert [(r.line, type(r).__name__) for r in rows[1:]] == [(3, "RowError"), (4, "RowError")]
+
+    # Senha que não é texto e email maior que a coluna: erro só daquela linha
+    rows = list(parse_ndjson([
+        '{"email": "d@example.com", "password": 12345678}\n',
+        json.dumps({"email": "e" * 250 + "@example.com", "password": "pw"}) + "\n",
+        '{"email": "f@example.com", "password": "pw"}\n',
+    ]))
+    assert [type(r).__name__ for r in rows] == ["RowError", "RowError", "ImportRow"]
+    assert "password" in rows[0].error and "255" in rows[1].error
+
+
+def test_utf8_check_names_the_bad_line():
+    check = Utf8Check()
+    check.feed("email,password\nação@x.gov,pw\n".encode()[:20])  # corta um caractere ao meio
+    check.feed("email,password\nação@x.gov,pw\n".encode()[20:])
+    with pytest.raises(ValueError, match="linha 3"):
+        check.feed("não@x.gov,pw\n".encode("latin-1"), final=True)
+
+
+def test_import_users_chunks_and_row_errors(db: Session, test_user: User):
+    """Linhas boas entram em lotes; erros por linha não abortam o arquivo"""
+    errors: list[RowError] = []
+    csv_lines = [
+        "email,password,roles,is_active\n",
+        "novo1@example.com,senha-1,test_role,\n",
+        "novo2@example.com,senha-2,,false\n",
+        "NOVO1@example.com,outra,,\n",  # repetido no arquivo
+        "test@example.com,senha-3,,\n",  # já cadastrado
+        "novo3@example.com,senha-4,nao_existe,\n",
+        "novo4@example.com,,,\n",  # senha vazia
+        "novo5@example.com," + "x" * 73 + ",,\n",  # > 72 bytes (bcrypt)
+    ]
+
+    result = import_users(db, parse_csv(csv_lines), chunk_size=2, on_error=errors.append)
+
+    assert result.created == 2
+    assert result.failed == 5
+    assert {(e.line, e.email) for e in errors} == {
+        (4, "novo1@example.com"),
+        (5, "test@example.com"),
+        (6, "novo3@example.com"),
+        (7, "novo4@example.com"),
+        (8, "novo5@example.com"),
+    }
+
+    created = {u.email: u for u in db.scalars(select(User).where(User.email.like("novo%")))}
+    assert set(created) == {"novo1@example.com", "novo2@example.com"}
+    assert not created["novo2@example.com"].is_active
+    assert verify_password("senha-1", created["novo1@example.com"].password_hash)
+    grants = db.execute(select(user_roles.c.user_id, user_roles.c.role_id)).all()
+    assert (created["novo1@example.com"].id, "test_role") in grants
+
+
+def test_import_endpoint_requires_rbac_manage(client: TestClient, test_user: User):
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+    response = client.post("/users/import", content=b"email,password\n")
+    assert response.status_code == 403
+
+
+def test_import_endpoint_ndjson(client: TestClient, db: Session, admin_user: User, monkeypatch):
+    """Admin importa NDJSON pelo endpoint; resumo com erros por linha"""
+    monkeypatch.setattr(settings, "user_import_hash_kind", "thread")
+    client.post("/auth/login", json={"email": "admin@test.local", "password": "safe-pass"})
+
+    body = "\n".join([
+        json.dumps({"email": "n1@agencia.gov", "password": "pw-1", "roles": ["admin"]}),
+        json.dumps({"email": "admin@test.local", "password": "pw-2"}),
+        "nada",
+        json.dumps({"email": "n2@agencia.gov", "password": 12345678}),
+    ])
+    response = client.post(
+        "/users/import",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["failed"], data["errors_truncated"]) == (1, 3, False)
+    assert [e["line"] for e in data["errors"]] == [2, 3, 4]
+    assert db.scalar(select(User.is_active).where(User.email == "n1@agencia.gov"))
+
+    monkeypatch.setattr(settings, "user_import_max_bytes", 10)
+    response = client.post("/users/import?format=csv", content=b"email,password\na@b.c,pw\n")
+    assert response.status_code == 413
+
+
+def test_import_endpoint_rejects_non_utf8_before_importing(
+    client: TestClient, db: Session, admin_user: User, monkeypatch
+):
+    """CSV em latin-1 volta 400 sem gravar nenhum lote"""
+    monkeypatch.setattr(settings, "user_import_hash_kind", "thread")
+    monkeypatch.setattr(settings, "user_import_chunk_size", 1)
+    client.post("/auth/login", json={"email": "admin@test.local", "password": "safe-pass"})
+
+    body = "email,password\nok@agencia.gov,pw\njoão@agencia.gov,pw\n".encode("latin-1")
+    response = client.post("/users/import?format=csv", content=body)
+
+    assert response.status_code == 400
+    assert "linha 3" in response.json()["detail"]
+    assert db.scalar(select(User.id).where(User.email == "ok@agencia.gov")) is None
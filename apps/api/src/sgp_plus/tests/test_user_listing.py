@@ -0,0 +1,142 @@
+"""User listing (keyset) and export tests"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from sgp_plus.core.config import settings
+from sgp_plus.core.security import hash_password
+from sgp_plus.db.models.associations import user_roles
+from sgp_plus.db.models.permission import Permission
+from sgp_plus.db.models.role import Role
+from sgp_plus.db.models.user import User
+from sgp_plus.features.users.repository import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def reader(db: Session) -> User:
+    """Usuário com users.read (role leitor)"""
+    role = Role(id="leitor", code="leitor", name="Leitor")
+    role.permissions = [Permission(id="users.read", code="users.read", name="Read Users")]
+    user = User(
+        email="reader@test.local",
+        password_hash=hash_password("safe-pass"),
+        created_at=datetime(2020, 1, 1),
+    )
+    user.roles = [role]
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def population(db: Session, reader: User) -> list[UUID]:
+    """25 usuários, pares com o mesmo created_at (desempate pelo id)"""
+    base = datetime(2024, 1, 1)
+    rows = [
+        {
+            "id": uuid4(),
+            "email": f"{'ana' if i % 3 == 0 else 'bia'}{i:02d}@example.com",
+            "password_hash": "x",
+            "is_active": i % 5 != 0,
+            "created_at": base + timedelta(minutes=i // 2),
+        }
+        for i in range(25)
+    ]
+    db.execute(insert(User), rows)
+    db.execute(
+        insert(user_roles),
+        [{"user_id": row["id"], "role_id": "leitor"} for row in rows[::4]],
+    )
+    db.commit()
+    ordered = sorted(rows, key=lambda row: (row["created_at"], row["id"]))
+    return [reader.id, *(row["id"] for row in ordered)]
+
+
+def _login(client: TestClient) -> None:
+    client.post("/auth/login", json={"email": "reader@test.local", "password": "safe-pass"})
+
+
+def _walk(client: TestClient, **params) -> list[dict]:
+    items, cursor = [], None
+    while True:
+        response = client.get("/users", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        data = response.json()
+        items += data["items"]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    created_at, user_id = datetime(2024, 5, 6, 7, 8, 9, 123), uuid4()
+    assert decode_cursor(encode_cursor(created_at, user_id)) == (created_at, user_id)
+    for bad in ("", "nada", encode_cursor(created_at, user_id)[:-4]):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_list_requires_users_read(client: TestClient, test_user: User):
+    client.post("/auth/login", json={"email": "test@example.com", "password": "password123"})
+    assert client.get("/users").status_code == 403
+    assert client.get("/users/export").status_code == 403
+
+
+def test_keyset_pages_cover_everything_once(client: TestClient, population: list[UUID]):
+    """Páginas encadeadas pelo cursor: ordem (created_at, id), sem repetir nem pular"""
+    _login(client)
+    items = _walk(client, limit=4)
+    assert [UUID(item["id"]) for item in items] == population
+    reader = items[0]
+    assert (reader["email"], reader["roles"]) == ("reader@test.local", ["leitor"])
+
+    assert client.get("/users", params={"cursor": "nada"}).status_code == 400
+
+
+def test_filters_and_limit_cap(client: TestClient, population: list[UUID], monkeypatch):
+    _login(client)
+    inactive = _walk(client, is_active=False, limit=2)
+    assert len(inactive) == 5 and not any(item["is_active"] for item in inactive)
+
+    ana = _walk(client, email_prefix="ANA", limit=3)
+    assert len(ana) == 9 and all(item["email"].startswith("ana") for item in ana)
+    # Curingas do LIKE são literais no prefixo
+    assert _walk(client, email_prefix="an_") == []
+
+    readers = _walk(client, role="leitor", is_active=True)
+    assert all("leitor" in item["roles"] and item["is_active"] for item in readers)
+    assert len(readers) == 1 + 5  # reader + rows[::4] ativos (0, 20 inativos)
+
+    monkeypatch.setattr(settings, "user_list_max_limit", 10)
+    data = client.get("/users", params={"limit": 1000}).json()
+    assert len(data["items"]) == 10 and data["next_cursor"]
+
+
+def test_export_streams_ndjson_and_csv(
+    client: TestClient, population: list[UUID], monkeypatch
+):
+    """Exportação em lotes do cursor no servidor, mesmos filtros da listagem"""
+    monkeypatch.setattr(settings, "user_export_batch_size", 3)
+    _login(client)
+
+    response = client.get("/users/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [UUID(line["id"]) for line in lines] == population
+    assert lines[0]["roles"] == ["leitor"]
+
+    response = client.get("/users/export", params={"format": "csv", "is_active": "false"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="users.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5 and {row["is_active"] for row in rows} == {"false"}
+    assert rows[0]["roles"] == "leitor"  # rows[0] tem a role (índice 0 de rows[::4])